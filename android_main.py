@@ -3,28 +3,81 @@
 """
 Android versie van de Kinder Typecursus
 Gebruikt Kivy voor mobiele compatibiliteit
+
+Gebruikers en lessen komen uit dezelfde UserManager en LessonManager als
+de desktopversie, opgeslagen in de gegevensmap van de app. De managers
+laden op de achtergrond terwijl het loginscherm al zichtbaar is, en elk
+scherm wordt pas bij het eerste bezoek gebouwd. De koude start wordt
+altijd gemeten; met TYPECURSUS_STARTUP_PROFILE=1 volgt de hele tijdlijn.
 """
 
+# Als eerste: legt het starttijdstip vast voor de opstartmeting
+from src.utils.startup import Deferred, StartupProfiler, resolve
+
 from kivy.app import App
+from kivy.clock import Clock, mainthread
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
+from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
+from kivy.uix.scrollview import ScrollView
 from kivy.uix.textinput import TextInput
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.core.window import Window
 from kivy.core.text import LabelBase
+from kivy.metrics import sp
 from kivy.resources import resource_add_path
+from kivy.utils import platform
 import json
 import os
+from typing import Callable, Dict, Optional, Tuple
+
+from src.data.user_manager import UserManager
+from src.data.lesson_manager import LessonManager
+from src.mobile.typing_target import TEXTURE_CACHE, TypingTarget
+from src.utils.config import Config
+from src.utils.keylog import KeystrokeRecorder, keylog_path
+from src.utils.persistence import get_scheduler
+from src.utils.scoring import ScoringEngine
 
 # Voeg lettertypen toe
 resource_add_path('assets/fonts')
 
+# Eén klein bestand per leerling met een journaal: een app die Android
+# op de achtergrond afsluit verliest hooguit de laatste journaalregel
+MOBILE_USERS_BACKEND = "shards"
+
+GREEN = (0.3, 0.8, 0.3, 1)
+BLUE = (0.2, 0.6, 0.9, 1)
+RED = (0.9, 0.3, 0.3, 1)
+GREY = (0.6, 0.6, 0.6, 1)
+
+class LazyScreenManager(ScreenManager):
+    """Schermmanager die elk scherm pas bij het eerste bezoek bouwt"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.factories: Dict[str, Callable[[], Screen]] = {}
+        
+    def register(self, name: str, factory: Callable[[], Screen]):
+        """Meld een scherm aan zonder het te bouwen"""
+        self.factories[name] = factory
+        
+    def show(self, name: str, *args) -> Screen:
+        """Toon een scherm: de eerste keer bouwen, daarna alleen verversen met args"""
+        if not self.has_screen(name):
+            self.add_widget(self.factories[name]())
+        screen = self.get_screen(name)
+        screen.refresh(*args)
+        self.current = name
+        return screen
+
 class LoginScreen(Screen):
     """Loginscherm voor Android"""
     
-    def __init__(self, **kwargs):
+    def __init__(self, app, **kwargs):
         super().__init__(**kwargs)
+        self.app = app
         self.setup_ui()
         
     def setup_ui(self):
@@ -56,6 +109,7 @@ class LoginScreen(Screen):
             size_hint_y=None,
             height=50
         )
+        self.username_input.bind(on_text_validate=self.start_typing)
         layout.add_widget(self.username_input)
         
         # Leeftijd input
@@ -68,38 +122,71 @@ class LoginScreen(Screen):
         )
         layout.add_widget(self.age_input)
         
+        # Meldingen (in plaats van een pop-up)
+        self.message_label = Label(
+            text="",
+            font_size='16sp',
+            size_hint_y=None,
+            height=40,
+            color=RED
+        )
+        layout.add_widget(self.message_label)
+        
         # Start knop
         start_button = Button(
             text="Start Typen! 🚀",
             size_hint_y=None,
             height=80,
-            background_color=(0.3, 0.8, 0.3, 1)
+            background_color=GREEN
         )
         start_button.bind(on_press=self.start_typing)
         layout.add_widget(start_button)
         
         self.add_widget(layout)
         
+    def refresh(self):
+        """Maak de velden leeg voor de volgende leerling"""
+        self.username_input.text = ""
+        self.age_input.text = ""
+        self.message_label.text = ""
+        
     def start_typing(self, instance):
-        """Start de typecursus"""
+        """Log in of maak een nieuwe gebruiker aan en start de typecursus"""
         username = self.username_input.text.strip()
         try:
             age = int(self.age_input.text) if self.age_input.text else 10
         except ValueError:
             age = 10
             
-        if username:
-            # Ga naar het dashboard
-            self.manager.current = 'dashboard'
-        else:
-            # Toon foutmelding
-            pass
+        if not username:
+            self.message_label.text = "Vul je naam in!"
+            return
+            
+        if len(username) < 2:
+            self.message_label.text = "Je naam moet minstens 2 letters hebben!"
+            return
+            
+        user_manager = self.app.user_manager
+        user = user_manager.get_user(username)
+        if user is None:
+            try:
+                user = user_manager.create_user(username, age)
+            except Exception as e:
+                self.message_label.text = f"Kon geen gebruiker aanmaken: {e}"
+                return
+                
+        self.app.login(user)
 
 class DashboardScreen(Screen):
     """Dashboard voor Android"""
     
-    def __init__(self, **kwargs):
+    def __init__(self, app, **kwargs):
         super().__init__(**kwargs)
+        self.app = app
+        # Knoppen worden één keer gebouwd; bij terugkeer wijzigen alleen tekst en kleur
+        self.tiles: Dict[str, Button] = {}
+        self.tile_states: Dict[str, Tuple] = {}
+        self.tiles_revision: Optional[int] = None
         self.setup_ui()
         
     def setup_ui(self):
@@ -107,63 +194,129 @@ class DashboardScreen(Screen):
         layout = BoxLayout(orientation='vertical', padding=20, spacing=20)
         
         # Titel
-        title = Label(
+        self.title_label = Label(
             text="Dashboard 📊",
             font_size='28sp',
             size_hint_y=None,
             height=80
         )
-        layout.add_widget(title)
+        layout.add_widget(self.title_label)
         
         # Voortgang
-        progress = Label(
-            text="Niveau: 1 ⭐\nLessen voltooid: 0 📚",
+        self.progress_label = Label(
+            text="",
             font_size='16sp',
             size_hint_y=None,
             height=100
         )
-        layout.add_widget(progress)
+        layout.add_widget(self.progress_label)
         
-        # Les knoppen
-        lesson1_btn = Button(
-            text="Les 1: De Letter A",
+        # Resultaat van de laatste les en meldingen over opslaan
+        self.message_label = Label(
+            text="",
+            font_size='16sp',
             size_hint_y=None,
-            height=60,
-            background_color=(0.2, 0.6, 0.9, 1)
+            height=40
         )
-        lesson1_btn.bind(on_press=lambda x: self.start_lesson('L1'))
-        layout.add_widget(lesson1_btn)
+        layout.add_widget(self.message_label)
         
-        lesson2_btn = Button(
-            text="Les 2: De Letter E",
-            size_hint_y=None,
-            height=60,
-            background_color=(0.2, 0.6, 0.9, 1)
-        )
-        lesson2_btn.bind(on_press=lambda x: self.start_lesson('L2'))
-        layout.add_widget(lesson2_btn)
+        # Lesknoppen in een scrollbare lijst
+        scroll = ScrollView()
+        self.tile_list = GridLayout(cols=1, spacing=10, size_hint_y=None)
+        self.tile_list.bind(minimum_height=self.tile_list.setter('height'))
+        scroll.add_widget(self.tile_list)
+        layout.add_widget(scroll)
         
         # Terug knop
         back_btn = Button(
             text="← Terug naar Login",
             size_hint_y=None,
             height=50,
-            background_color=(0.9, 0.3, 0.3, 1)
+            background_color=RED
         )
-        back_btn.bind(on_press=lambda x: self.manager.current('login'))
+        back_btn.bind(on_press=lambda x: self.app.logout())
         layout.add_widget(back_btn)
         
         self.add_widget(layout)
         
+    def build_tiles(self):
+        """Bouw de lesknoppen opnieuw op (alleen als de lessenlijst gewijzigd is)"""
+        lesson_manager = self.app.lesson_manager
+        self.tile_list.clear_widgets()
+        self.tiles = {}
+        self.tile_states = {}
+        for level in lesson_manager.get_levels():
+            for lesson in lesson_manager.get_lessons_in_order(level):
+                lesson_id = lesson.lesson_id
+                tile = Button(
+                    size_hint_y=None,
+                    height=60
+                )
+                tile.bind(on_press=lambda x, lesson_id=lesson_id: self.start_lesson(lesson_id))
+                self.tile_list.add_widget(tile)
+                self.tiles[lesson_id] = tile
+        self.tiles_revision = lesson_manager.revision
+        
+    def refresh(self, message: str = ""):
+        """Werk het dashboard bij voor de huidige leerling"""
+        lesson_manager = self.app.lesson_manager
+        user = self.app.user_manager.get_current_user()
+        if self.tiles_revision != lesson_manager.revision:
+            self.build_tiles()
+            
+        if user:
+            self.title_label.text = f"Hallo {user.name}! 📊"
+            self.progress_label.text = (
+                f"Niveau: {user.current_level} ⭐\n"
+                f"Lessen voltooid: {user.lessons_completed} 📚\n"
+                f"Punten: {user.total_points}"
+            )
+        self.message_label.text = message
+        
+        # Alleen knoppen waarvan de toestand veranderd is opnieuw instellen
+        for lesson_id, tile in self.tiles.items():
+            lesson = lesson_manager.get_lesson(lesson_id)
+            result = user.lesson_results.get(lesson_id) if user else None
+            unlocked = user is not None and lesson.level <= user.current_level
+            state = (unlocked, result["score"] if result else None)
+            if self.tile_states.get(lesson_id) == state:
+                continue
+            self.tile_states[lesson_id] = state
+            if result:
+                tile.text = f"{lesson.title}  ✓ {result['score']} punten"
+                tile.background_color = GREEN
+            elif unlocked:
+                tile.text = lesson.title
+                tile.background_color = BLUE
+            else:
+                tile.text = f"{lesson.title}  🔒"
+                tile.background_color = GREY
+            tile.disabled = not unlocked
+            
+    def show_message(self, message: str):
+        """Toon een melding zonder de rest bij te werken"""
+        self.message_label.text = message
+        
     def start_lesson(self, lesson_id):
         """Start een les"""
-        self.manager.current = 'lesson'
+        self.app.show_lesson(lesson_id)
 
 class LessonScreen(Screen):
     """Lesscherm voor Android"""
     
-    def __init__(self, **kwargs):
+    def __init__(self, app, **kwargs):
         super().__init__(**kwargs)
+        self.app = app
+        self.lesson = None
+        self.items = []
+        self.item_index = 0
+        self.target = ""
+        self.engine = ScoringEngine()
+        self.previous_text = ""
+        # Ingeplande overgang naar het volgende item (na een volledig getypt item)
+        self.advance_event = None
+        # Aanslagen vastleggen voor reactietijd- en foutanalyse per toets
+        self.recorder = KeystrokeRecorder()
         self.setup_ui()
         
     def setup_ui(self):
@@ -171,24 +324,39 @@ class LessonScreen(Screen):
         layout = BoxLayout(orientation='vertical', padding=20, spacing=20)
         
         # Titel
-        title = Label(
-            text="Les: De Letter A",
+        self.title_label = Label(
+            text="",
             font_size='24sp',
             size_hint_y=None,
             height=80
         )
-        layout.add_widget(title)
+        layout.add_widget(self.title_label)
         
-        # Te typen tekst
-        self.target_text = Label(
-            text="Type deze letter: A",
-            font_size='32sp',
+        self.instructions_label = Label(
+            text="",
+            font_size='16sp',
             size_hint_y=None,
-            height=100,
-            color=(0.2, 0.6, 0.9, 1)
+            height=50
+        )
+        layout.add_widget(self.instructions_label)
+        
+        # Te typen tekst: één keer gerenderd, per aanslag verandert alleen de markering
+        self.target_text = TypingTarget(
+            font_size=sp(32),
+            size_hint_y=None,
+            height=100
         )
         layout.add_widget(self.target_text)
         
+        # Voortgang en terugmelding
+        self.stats_label = Label(
+            text="",
+            font_size='16sp',
+            size_hint_y=None,
+            height=40
+        )
+        layout.add_widget(self.stats_label)
+        
         # Input veld
         self.typing_input = TextInput(
             hint_text="Type hier...",
@@ -197,6 +365,8 @@ class LessonScreen(Screen):
             height=60
         )
         self.typing_input.bind(on_text_validate=self.check_answer)
+        # Elke aanslag gaat direct naar de score-engine
+        self.typing_input.bind(text=self.on_text)
         layout.add_widget(self.typing_input)
         
         # Controleer knop
@@ -204,7 +374,7 @@ class LessonScreen(Screen):
             text="Controleer",
             size_hint_y=None,
             height=60,
-            background_color=(0.3, 0.8, 0.3, 1)
+            background_color=GREEN
         )
         check_btn.bind(on_press=lambda x: self.check_answer())
         layout.add_widget(check_btn)
@@ -214,42 +384,275 @@ class LessonScreen(Screen):
             text="← Terug naar Dashboard",
             size_hint_y=None,
             height=50,
-            background_color=(0.9, 0.3, 0.3, 1)
+            background_color=RED
         )
-        back_btn.bind(on_press=lambda x: self.manager.current('dashboard'))
+        back_btn.bind(on_press=lambda x: self.app.show_dashboard())
         layout.add_widget(back_btn)
         
         self.add_widget(layout)
         
-    def check_answer(self):
-        """Controleer het antwoord"""
-        answer = self.typing_input.text.strip()
-        if answer.upper() == "A":
-            # Correct antwoord
-            self.target_text.text = "Gefeliciteerd! 🎉"
-            self.target_text.color = (0.3, 0.8, 0.3, 1)
+    def refresh(self, lesson=None):
+        """Begin (opnieuw) aan een les zonder de widgets opnieuw te bouwen"""
+        if lesson is not None:
+            self.lesson = lesson
+        # Lege items kunnen nooit af; die slaan we over
+        self.items = [text for text in self.lesson.texts if text]
+        self.item_index = 0
+        self.engine = ScoringEngine(
+            reward_points=self.app.course_config.get("game_settings.reward_points", 10)
+        )
+        
+        # Aanslagen van een afgebroken les eerst wegschrijven naar het oude logboek
+        self.recorder.flush()
+        current_user = self.app.user_manager.get_current_user()
+        self.recorder.path = keylog_path(current_user.name, self.app.keylog_dir) if current_user else None
+        # Elk blok aanslagen werkt ook de toetsstatistieken van de leerling bij
+        self.recorder.on_flush = current_user.key_stats.add_chunk if current_user else None
+        
+        self.title_label.text = f"Les: {self.lesson.title}"
+        self.instructions_label.text = self.lesson.instructions
+        self.show_item()
+        if not self.items:
+            # Een les zonder items kan niet worden afgerond: terug naar het dashboard
+            Clock.schedule_once(lambda dt: self.app.show_dashboard(), 0)
+        
+    def on_leave(self, *args):
+        """Bewaar de aanslagen als de leerling de les verlaat"""
+        self.cancel_advance()
+        self.recorder.flush()
+        
+    def cancel_advance(self):
+        """Vergeet een nog niet uitgevoerde overgang naar het volgende item"""
+        if self.advance_event is not None:
+            self.advance_event.cancel()
+            self.advance_event = None
+            
+    def show_item(self):
+        """Toon het huidige item"""
+        self.target = self.items[self.item_index] if self.items else ""
+        self.engine.start_item(self.target)
+        self.recorder.pause()
+        self.cancel_advance()
+        
+        self.target_text.set_text(self.target)
+        self.stats_label.text = f"Item {self.item_index + 1} van {len(self.items)}"
+        self.previous_text = ""
+        self.typing_input.text = ""
+        self.typing_input.focus = True
+        
+    def on_text(self, instance, value):
+        """Geef alleen het verschil met de vorige tekst door aan de engine"""
+        previous = self.previous_text
+        if value == previous:
+            return
+        self.previous_text = value
+        if len(value) == len(previous) + 1 and value.startswith(previous):
+            position = self.engine.position
+            if position >= len(self.target):
+                return
+            correct = self.engine.key(value[-1])
+            self.recorder.record(self.target[position], correct)
+            self.target_text.mark(position, correct)
+        elif len(value) == len(previous) - 1 and previous.startswith(value):
+            if self.engine.backspace():
+                self.recorder.record("", False, backspace=True)
+                self.target_text.unmark(self.engine.position)
         else:
-            # Fout antwoord
-            self.target_text.text = "Probeer opnieuw!"
-            self.target_text.color = (0.9, 0.3, 0.3, 1)
+            # Plakken of wissen van meerdere tekens: begin het item opnieuw
+            self.engine.start_item(self.target)
+            self.target_text.clear_marks()
+            for position, char in enumerate(value[:len(self.target)]):
+                self.target_text.mark(position, self.engine.key(char))
+        self.target_text.set_cursor(self.engine.position)
         
+        self.stats_label.text = (
+            f"Snelheid: {self.engine.speed:.0f} WPM   "
+            f"Nauwkeurigheid: {self.engine.accuracy:.0f}%"
+        )
+        # Niet binnen de tekstcallback het invoerveld leegmaken
+        if self.engine.item_complete and self.advance_event is None:
+            self.advance_event = Clock.schedule_once(lambda dt: self.next_item(), 0)
+            
+    def check_answer(self, *args):
+        """Controleer het antwoord"""
+        if self.engine.item_complete:
+            self.next_item()
+            return
+            
+        # Fout antwoord: het item opnieuw typen
+        self.stats_label.text = "Probeer opnieuw!"
+        self.target_text.clear_marks()
+        self.target_text.set_cursor(0)
+        self.engine.start_item(self.target)
+        self.previous_text = ""
         self.typing_input.text = ""
+        
+    def next_item(self):
+        """Ga naar het volgende item of rond de les af"""
+        self.cancel_advance()
+        self.engine.finish_item()
+        self.item_index += 1
+        if self.item_index < len(self.items):
+            self.show_item()
+        else:
+            self.recorder.flush()
+            result = self.engine.result()
+            self.app.lesson_completed(
+                self.lesson.lesson_id,
+                result["score"],
+                result["accuracy"],
+                result["speed"]
+            )
 
 class KinderTypecursusApp(App):
     """Hoofdapplicatie voor Android"""
     
+    def __init__(self, profiler: Optional[StartupProfiler] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.profiler = profiler or StartupProfiler()
+        self.profiler.mark("modules geïmporteerd")
+        # Niet self.config: die naam gebruikt Kivy zelf
+        self.course_config: Optional[Config] = None
+        self._user_manager = None
+        self._lesson_manager = None
+        self.keylog_dir = "keylogs"
+        self.screens: Optional[LazyScreenManager] = None
+        self.first_frame_ms = 0.0
+        
+    @property
+    def user_manager(self) -> UserManager:
+        """Gebruikersmanager (wacht zo nodig tot hij op de achtergrond geladen is)"""
+        return resolve(self._user_manager)
+        
+    @property
+    def lesson_manager(self) -> LessonManager:
+        """Lesmanager (wacht zo nodig tot hij op de achtergrond geladen is)"""
+        return resolve(self._lesson_manager)
+        
     def build(self):
-        """Bouw de applicatie"""
-        # Stel schermgrootte in voor mobiel
-        Window.size = (400, 600)
+        """Bouw de applicatie; alleen het loginscherm wordt direct gemaakt"""
+        # Stel schermgrootte in voor mobiel (alleen bij testen op de desktop)
+        if platform not in ('android', 'ios'):
+            Window.size = (400, 600)
+            
+        # Alles wat de app schrijft staat in de eigen gegevensmap van de app
+        data_dir = self.user_data_dir
+        os.makedirs(data_dir, exist_ok=True)
+        self.keylog_dir = os.path.join(data_dir, "keylogs")
+        with self.profiler.phase("configuratie"):
+            self.course_config = Config(os.path.join(data_dir, "config.json"))
+            
+        # Managers laden op de achtergrond; het loginscherm wacht er niet op
+        self._user_manager = Deferred(
+            lambda: UserManager(os.path.join(data_dir, "users.json"), backend=MOBILE_USERS_BACKEND),
+            "gebruikers", self.profiler
+        )
+        self._lesson_manager = Deferred(
+            lambda: LessonManager(os.path.join(data_dir, "lessons.json"), config=self.course_config),
+            "lessen", self.profiler
+        )
+        
+        # Maak schermmanager; de overige schermen pas bij het eerste bezoek
+        self.screens = LazyScreenManager()
+        self.screens.register('login', lambda: LoginScreen(self, name='login'))
+        self.screens.register('dashboard', lambda: DashboardScreen(self, name='dashboard'))
+        self.screens.register('lesson', lambda: LessonScreen(self, name='lesson'))
+        with self.profiler.phase("loginscherm"):
+            self.screens.show('login')
+            
+        return self.screens
+        
+    def on_start(self):
+        """Het venster bestaat; het eerste frame volgt bij de volgende klok-tik"""
+        Clock.schedule_once(self.on_first_frame, 0)
+        
+    def on_first_frame(self, dt):
+        """Het loginscherm staat op het scherm"""
+        self.profiler.mark("eerste frame")
+        self.first_frame_ms = self.profiler.elapsed_ms()
+        self.report_when_ready()
+        
+    def report_when_ready(self, dt=None):
+        """Meld de koude start zodra al het achtergrondwerk klaar is"""
+        if not (self._user_manager.ready and self._lesson_manager.ready):
+            Clock.schedule_once(self.report_when_ready, 0.05)
+            return
+        self.profiler.mark("achtergrond klaar")
+        print(f"Koude start: eerste frame na {self.first_frame_ms:.0f} ms, "
+              f"klaar na {self.profiler.elapsed_ms():.0f} ms")
+        if self.profiler.enabled:
+            self.profiler.print_report()
+            
+    def login(self, user):
+        """Callback voor succesvolle login"""
+        self.user_manager.set_current_user(user)
+        self.show_dashboard()
         
-        # Maak schermmanager
-        sm = ScreenManager()
-        sm.add_widget(LoginScreen(name='login'))
-        sm.add_widget(DashboardScreen(name='dashboard'))
-        sm.add_widget(LessonScreen(name='lesson'))
+    def logout(self):
+        """Callback voor uitloggen"""
+        self.user_manager.set_current_user(None)
+        self.screens.show('login')
         
-        return sm
+    def show_dashboard(self, message: str = ""):
+        """Toon het dashboard"""
+        self.screens.show('dashboard', message)
+        
+    def show_lesson(self, lesson_id: str):
+        """Toon het lesscherm"""
+        lesson = self.lesson_manager.get_lesson(lesson_id)
+        if lesson:
+            self.screens.show('lesson', lesson)
+        else:
+            self.show_dashboard("Les niet gevonden!")
+            
+    def lesson_completed(self, lesson_id: str, score: int, accuracy: float, speed: float):
+        """Callback voor voltooide les; de voortgang wordt direct op de achtergrond bewaard"""
+        current_user = self.user_manager.get_current_user()
+        if current_user:
+            current_user.complete_lesson(lesson_id, score, accuracy, speed)
+            self.user_manager.save_user(current_user, on_saved=self.on_saved, delay=0)
+        self.show_dashboard(
+            f"Gefeliciteerd! 🎉 {score} punten, {accuracy:.0f}% goed, {speed:.0f} WPM"
+        )
+        
+    @mainthread
+    def on_saved(self, ok: bool):
+        """Uitkomst van het opslaan (vanaf de opslagthread naar de Kivy-thread)"""
+        if not ok and self.screens.has_screen('dashboard'):
+            self.screens.get_screen('dashboard').show_message("Opslaan van je voortgang is mislukt")
+            
+    def on_resume(self):
+        """Android kan de GL-context weggooien tijdens een pauze: texturen opnieuw renderen"""
+        TEXTURE_CACHE.clear()
+        if self.screens.has_screen('lesson'):
+            self.screens.get_screen('lesson').target_text.refresh_texture()
+            
+    def on_pause(self):
+        """Android kan een gepauzeerde app zonder waarschuwing afsluiten: nu alles wegschrijven"""
+        try:
+            if self.screens.has_screen('lesson'):
+                self.screens.get_screen('lesson').recorder.flush()
+            if self._user_manager is not None and self._user_manager.ready:
+                self.user_manager.save_current_user()
+            self.course_config.flush()
+            get_scheduler().flush(timeout=2.0)
+        except Exception as e:
+            print(f"Fout bij opslaan voor pauze: {e}")
+        return True
+        
+    def on_stop(self):
+        """Handel het afsluiten van de applicatie af"""
+        try:
+            if self.screens.has_screen('lesson'):
+                self.screens.get_screen('lesson').recorder.flush()
+            self.user_manager.save_current_user()
+            self.course_config.flush()
+            # Wacht tot de opslagthread alles veilig heeft weggeschreven
+            get_scheduler().shutdown()
+        except Exception as e:
+            print(f"Fout bij afsluiten: {e}")
 
 if __name__ == '__main__':
-    KinderTypecursusApp().run()
\ No newline at end of file
+    KinderTypecursusApp(
+        StartupProfiler(enabled=os.environ.get("TYPECURSUS_STARTUP_PROFILE") == "1")
+    ).run()
\ No newline at end of file
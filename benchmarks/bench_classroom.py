@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Belastingstest voor de klaslokaalserver
+
+Start een server via main.py --classroom-server op loopback en laat
+daar veel gelijktijdige clients tegelijk lessen voltooien: gebruiker
+laden, les afronden, opslaan, en een gebundeld verzoek (gebruiker en
+lesinhoud in één bericht). Elke opslag wordt naar alle andere clients
+doorgestuurd. Per opdracht worden p50/p95/p99 in milliseconden gemeten;
+de uitkomst is JSON.
+
+Gebruik: python benchmarks/bench_classroom.py [--clients 120] [--rounds 20]
+                                              [--output resultaten.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.classroom.protocol import LINE_LIMIT, decode, encode
+from src.data.user_manager import User
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50, p95, p99 en maximum in milliseconden"""
+    samples = sorted(samples)
+    pick = lambda fraction: samples[min(len(samples) - 1, int(len(samples) * fraction))]
+    return {
+        "count": len(samples),
+        "p50_ms": round(pick(0.50) * 1000, 3),
+        "p95_ms": round(pick(0.95) * 1000, 3),
+        "p99_ms": round(pick(0.99) * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3)
+    }
+
+class BenchClient:
+    """Minimale asyncio-client: één verbinding, antwoorden op id, wijzigingen tellen"""
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count(1)
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.events = 0
+        self.task = asyncio.ensure_future(self.read_loop())
+        
+    async def read_loop(self):
+        """Koppel antwoorden aan wachtende verzoeken"""
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                return
+            # Wijzigingen alleen tellen: een echte client ontvangt er maar een paar per seconde,
+            # hier komen ze van alle andere clients tegelijk binnen
+            if line.startswith(b'{"event"'):
+                self.events += 1
+                continue
+            message = decode(line)
+            for reply in message if isinstance(message, list) else [message]:
+                self.pending.pop(reply["id"]).set_result(reply)
+                    
+    async def call_many(self, calls) -> List:
+        """Stuur een of meer opdrachten als één bericht en wacht op alle antwoorden"""
+        loop = asyncio.get_running_loop()
+        requests = []
+        futures = []
+        for operation, args in calls:
+            request_id = next(self.ids)
+            futures.append(self.pending.setdefault(request_id, loop.create_future()))
+            requests.append({"id": request_id, "op": operation, "args": args})
+        self.writer.write(encode(requests if len(requests) > 1 else requests[0]))
+        replies = await asyncio.gather(*futures)
+        for reply in replies:
+            if "error" in reply:
+                raise RuntimeError(reply["error"])
+        return [reply["result"] for reply in replies]
+        
+    async def close(self):
+        self.writer.close()
+        self.task.cancel()
+
+async def connect(port: int, number: int) -> BenchClient:
+    """Open de verbinding van één leerling en maak de leerling aan"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=LINE_LIMIT)
+    client = BenchClient(reader, writer)
+    user = User(f"Leerling {number:04d}", 8 + number % 5)
+    await client.call_many([("save_user", {"data": user.to_dict()})])
+    return client
+
+async def pupil(client: BenchClient, number: int, rounds: int, think: float,
+                lesson_ids: List[str], timings: Dict[str, List[float]]):
+    """Eén leerling die een aantal lessen achter elkaar voltooit"""
+    rng = random.Random(number)
+    name = f"Leerling {number:04d}"
+    for _ in range(rounds):
+        lesson_id = rng.choice(lesson_ids)
+        begin = time.perf_counter()
+        data, _ = await client.call_many([("load_user", {"name": name}),
+                                          ("lesson_content", {"lesson_id": lesson_id})])
+        timings["batch_load_user_and_content"].append(time.perf_counter() - begin)
+        
+        user = User.from_dict(data)
+        user.complete_lesson(lesson_id, rng.randint(40, 100), rng.uniform(70, 100), rng.uniform(5, 40))
+        begin = time.perf_counter()
+        await client.call_many([("save_user", {"data": user.to_dict()})])
+        timings["save_user"].append(time.perf_counter() - begin)
+        
+        begin = time.perf_counter()
+        await client.call_many([("ping", {})])
+        timings["ping"].append(time.perf_counter() - begin)
+        if think:
+            await asyncio.sleep(rng.uniform(0, 2 * think))
+
+async def run_clients(port: int, clients: int, rounds: int, think: float) -> Dict:
+    """Verbind alle clients, laat ze tegelijk beginnen en verzamel de metingen"""
+    setup = await connect(port, clients)
+    lesson_ids = [header["lesson_id"] for header in (await setup.call_many([("lesson_headers", {})]))[0]]
+    await setup.close()
+    
+    connections = await asyncio.gather(*(connect(port, number) for number in range(clients)))
+    # Wijzigingen van het aanmelden tellen niet mee
+    await asyncio.sleep(0.2)
+    for client in connections:
+        client.events = 0
+        
+    timings: Dict[str, List[float]] = {"batch_load_user_and_content": [], "save_user": [], "ping": []}
+    begin = time.perf_counter()
+    await asyncio.gather(*(pupil(client, number, rounds, think, lesson_ids, timings)
+                           for number, client in enumerate(connections)))
+    elapsed = time.perf_counter() - begin
+    
+    # Laat de laatste doorgestuurde wijzigingen nog binnenkomen
+    await asyncio.sleep(0.2)
+    events = sum(client.events for client in connections)
+    for client in connections:
+        await client.close()
+        
+    requests = sum(len(samples) for samples in timings.values()) + clients * rounds
+    return {
+        "clients": clients,
+        "rounds": rounds,
+        "think_ms": think * 1000,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(requests / elapsed, 1),
+        "events_received": events,
+        "events_expected": clients * rounds * (clients - 1),
+        "latency": {operation: percentiles(samples) for operation, samples in timings.items()}
+    }
+
+def main():
+    """Start de server, voer de belastingstest uit en schrijf de resultaten als JSON"""
+    parser = argparse.ArgumentParser(description="Belastingstest van de klaslokaalserver")
+    parser.add_argument("--clients", type=int, default=120, help="aantal gelijktijdige clients")
+    parser.add_argument("--rounds", type=int, default=20, help="lessen per client")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="gemiddelde pauze tussen lessen in milliseconden")
+    parser.add_argument("--output", help="schrijf JSON naar dit bestand in plaats van stdout")
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp(prefix="typecursus_klaslokaal_")
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "main.py"), "--classroom-server", "127.0.0.1:0"],
+        cwd=directory, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+        result = asyncio.run(run_clients(port, args.clients, args.rounds, args.think / 1000))
+    finally:
+        server.send_signal(signal.SIGINT)
+        server.wait(30)
+        shutil.rmtree(directory, ignore_errors=True)
+        
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform()
+        },
+        "classroom": result
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
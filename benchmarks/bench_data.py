@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prestatiebenchmark voor de gegevenslaag
+
+Genereert synthetische klassenlijsten (standaard 1k, 10k en 100k
+leerlingen met realistische lesresultaten) en een lesbibliotheek, en
+meet daarop UserManager, LessonManager en Config. De uitkomst is JSON,
+zodat versies met elkaar vergeleken kunnen worden.
+
+Gebruik: python benchmarks/bench_data.py [--sizes 1000,10000] [--lessons 500]
+                                         [--output resultaten.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.user_manager import User, UserManager
+from src.data.user_store import SQLiteUserStore, ShardedUserStore
+from src.data.lesson_manager import Lesson, LessonManager
+from src.data.lesson_pack import LessonPack
+from src.data.word_corpus import WordCorpus, build_corpus
+from src.data.word_index import WordIndex
+from src.utils.config import Config
+from src.utils.persistence import PersistenceScheduler
+
+WORDS = ["kat", "hond", "huis", "boom", "zon", "paard", "koe", "kip", "varken", "schaap",
+         "fiets", "school", "appel", "bloem", "water", "vogel", "tafel", "stoel", "raam", "deur"]
+SENTENCES = ["De kat zit op de mat.", "Ik fiets naar school.", "De zon schijnt vandaag.",
+             "Wij eten een appel.", "De vogel zingt een lied."]
+LESSON_TYPES = ("letters", "words", "sentences")
+LEVELS = 10
+
+def timed(function: Callable[[], object]) -> float:
+    """Tijd van één aanroep in seconden"""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def per_call(function: Callable[[int], object], calls: int, rounds: int = 5) -> Dict[str, float]:
+    """Tijd per aanroep in microseconden: mediaan en beste van een aantal rondes"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for i in range(calls):
+            function(i)
+        samples.append((time.perf_counter() - start) / calls * 1e6)
+    samples.sort()
+    return {
+        "calls": calls,
+        "median_us": round(samples[len(samples) // 2], 3),
+        "best_us": round(samples[0], 3)
+    }
+
+def build_lessons(count: int, items: int, rng: random.Random) -> List[Lesson]:
+    """Bouw een lesbibliotheek verdeeld over niveaus en lestypen"""
+    lessons = []
+    for i in range(count):
+        level = i * LEVELS // count + 1
+        lesson_type = LESSON_TYPES[i % len(LESSON_TYPES)]
+        lesson = Lesson(f"L{i + 1}", f"Les {i + 1}", level, lesson_type)
+        lesson.set_instructions("Typ wat je ziet!")
+        lesson.set_targets(10 + level, 80 + level)
+        for _ in range(items):
+            if lesson_type == "letters":
+                text = chr(ord("a") + rng.randrange(26))
+            elif lesson_type == "words":
+                text = rng.choice(WORDS)
+            else:
+                text = rng.choice(SENTENCES)
+            lesson.add_content(text, rng.randint(1, 3))
+        lessons.append(lesson)
+    return lessons
+
+def build_user(index: int, lesson_ids: List[str], rng: random.Random) -> User:
+    """Bouw een leerling met voortgang zoals na een paar weken lessen"""
+    user = User(f"leerling{index}", rng.randint(6, 12))
+    completed = rng.randint(0, min(40, len(lesson_ids)))
+    for lesson_id in lesson_ids[:completed]:
+        user.complete_lesson(lesson_id, rng.randint(20, 120),
+                             rng.uniform(70, 100), rng.uniform(5, 40))
+    user.current_level = 1 + completed * LEVELS // max(len(lesson_ids), 1)
+    user.add_stars(rng.randint(0, 30))
+    return user
+
+def bench_users(directory: str, size: int, lesson_ids: List[str], seed: int,
+                backend: str = "sqlite") -> Dict:
+    """Meet laden, opslaan en opvragen van een klassenlijst van size leerlingen"""
+    rng = random.Random(seed)
+    users_file = os.path.join(directory, f"users_{backend}_{size}.json")
+    base = os.path.splitext(users_file)[0]
+    
+    if backend == "shards":
+        store = ShardedUserStore(base, legacy_file=None)
+    else:
+        store = SQLiteUserStore(base + ".db", legacy_file=None)
+    store.save_users(build_user(i, lesson_ids, rng).to_dict() for i in range(size))
+    store.close()
+    
+    scheduler = PersistenceScheduler()
+    results: Dict[str, object] = {"users": size, "backend": backend}
+    
+    manager = None
+    
+    def load():
+        nonlocal manager
+        manager = UserManager(users_file, scheduler=scheduler, backend=backend)
+    results["load_index_s"] = round(timed(load), 6)
+    
+    names = manager.get_user_names()
+    sample = [rng.choice(names) for _ in range(min(1000, size))]
+    
+    # Eerste opvraging laadt uit de database, daarna uit het geheugen
+    results["get_user_cold"] = per_call(lambda i: manager._hydrate(sample[i]), len(sample), rounds=3)
+    results["get_user_warm"] = per_call(lambda i: manager.get_user(sample[i]), len(sample))
+    results["get_user_stats"] = per_call(
+        lambda i: manager.get_user_stats(manager.get_user(sample[i])), len(sample)
+    )
+    
+    user = manager.get_user(sample[0])
+    results["complete_lesson"] = per_call(
+        lambda i: user.complete_lesson(lesson_ids[i % len(lesson_ids)], 50, 92.5, 18.0), 1000
+    )
+    
+    def save_one():
+        manager.save_user(user)
+        scheduler.flush()
+    results["save_user_s"] = round(timed(save_one), 6)
+    
+    results["load_all_s"] = round(timed(manager.get_all_users), 6)
+    
+    def save_all():
+        manager.save_all_users()
+        scheduler.flush()
+    results["save_all_s"] = round(timed(save_all), 6)
+    
+    scheduler.shutdown()
+    manager.store.close()
+    return results
+
+def bench_lessons(directory: str, count: int, items: int, seed: int) -> Dict:
+    """Meet laden, opslaan en opvragen van een lesbibliotheek"""
+    rng = random.Random(seed)
+    lessons_file = os.path.join(directory, "lessons.json")
+    pack = LessonPack(lessons_file)
+    pack.write(build_lessons(count, items, rng))
+    if os.path.exists(pack.index_file):
+        os.remove(pack.index_file)
+    
+    scheduler = PersistenceScheduler()
+    config = Config(os.path.join(directory, "config.json"), scheduler=scheduler)
+    results: Dict[str, object] = {"lessons": count, "items_per_lesson": items}
+    
+    manager = None
+    
+    def load():
+        nonlocal manager
+        manager = LessonManager(lessons_file, config=config, scheduler=scheduler)
+    # Eerste keer zonder, tweede keer met de index naast het lesbestand
+    results["load_cold_s"] = round(timed(load), 6)
+    results["load_s"] = round(timed(load), 6)
+    
+    per_level = max(count // LEVELS, 1)
+    results["get_next_lesson"] = per_call(
+        lambda i: manager.get_next_lesson(i % LEVELS + 1, i % per_level), 10000
+    )
+    
+    results["get_random_content_first_s"] = round(
+        timed(lambda: manager.get_random_content("words", 2)), 6
+    )
+    results["get_random_content"] = per_call(
+        lambda i: manager.get_random_content(LESSON_TYPES[i % 3], 2), 10000
+    )
+    results["generate_session"] = per_call(
+        lambda i: manager.generate_session(LESSON_TYPES[i % 3], 2, rng=rng), 10000
+    )
+    
+    def save():
+        manager.save_lessons()
+        scheduler.flush()
+    # Ongeopende lessen worden ongewijzigd gekopieerd; daarna alles geladen
+    results["save_s"] = round(timed(save), 6)
+    for lesson in manager.lessons.values():
+        lesson.load_content()
+    results["save_loaded_s"] = round(timed(save), 6)
+    
+    scheduler.shutdown()
+    return results
+
+def build_words(count: int, rng: random.Random) -> List[str]:
+    """Synthetische Nederlands-achtige woordenlijst uit lettergrepen"""
+    onsets = ["", "b", "d", "k", "m", "n", "p", "r", "s", "t", "v", "z", "sch", "st", "kr", "gr", "bl"]
+    vowels = ["a", "e", "i", "o", "u", "aa", "ee", "oo", "ie", "oe", "ij", "ui", "eu"]
+    codas = ["", "", "k", "l", "m", "n", "p", "r", "s", "t", "ng", "cht"]
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(onsets) + rng.choice(vowels) + rng.choice(codas)
+                          for _ in range(rng.randint(1, 3))))
+    return list(words)
+
+def bench_words(directory: str, count: int, seed: int) -> Dict:
+    """Meet de woordindex en het corpus: opbouwen, openen en woorden met alleen bepaalde letters zoeken"""
+    rng = random.Random(seed)
+    words = build_words(count, rng)
+    results: Dict[str, object] = {"words": count}
+    
+    index = None
+    
+    def build():
+        nonlocal index
+        index = WordIndex(words)
+    results["build_s"] = round(timed(build), 6)
+    
+    # Eerste niveaus (weinig letters) tot bijna het hele alfabet
+    for name, letters in (("few_letters", "aeikst"), ("half_alphabet", "aeioukstnrlmpd"),
+                          ("most_letters", "abcdefghijklmnoprstuvwz")):
+        results[f"count_{name}"] = index.count(letters, 3, 6)
+        results[f"query_{name}"] = per_call(lambda i: index.ranges(letters, 3, 6), 20)
+        results[f"sample_{name}"] = per_call(lambda i: index.sample(letters, 10, 3, 6, rng), 20)
+        
+    # Hetzelfde op het voorbewerkte corpus (mmap, woorden pas bij trekken gedecodeerd)
+    corpus_file = os.path.join(directory, "words.corpus")
+    results["corpus_build_s"] = round(timed(lambda: build_corpus(words, corpus_file)), 6)
+    results["corpus_bytes"] = os.path.getsize(corpus_file)
+    corpus = None
+    
+    def open_corpus():
+        nonlocal corpus
+        corpus = WordCorpus(corpus_file)
+    results["corpus_open_s"] = round(timed(open_corpus), 6)
+    for name, letters in (("few_letters", "aeikst"), ("half_alphabet", "aeioukstnrlmpd")):
+        results[f"corpus_sample_{name}"] = per_call(lambda i: corpus.sample(letters, 10, 3, 6, rng), 20)
+    corpus.close()
+    
+    # Ter vergelijking: elk woord apart controleren
+    allowed = set("aeioukstnrlmpd")
+    results["linear_scan_half_alphabet"] = per_call(
+        lambda i: [word for word in words if 3 <= len(word) <= 6 and set(word) <= allowed], 1, rounds=3
+    )
+    return results
+
+def bench_config(directory: str) -> Dict:
+    """Meet opvragen en wijzigen van de configuratie"""
+    scheduler = PersistenceScheduler()
+    config_file = os.path.join(directory, "config.json")
+    results: Dict[str, object] = {}
+    
+    config = None
+    
+    def load():
+        nonlocal config
+        config = Config(config_file, scheduler=scheduler)
+    results["load_s"] = round(timed(load), 6)
+    
+    keys = ["colors.primary", "fonts.title", "game_settings.reward_points",
+            "lessons.words_per_lesson", "sound_enabled"]
+    results["get"] = per_call(lambda i: config.get(keys[i % len(keys)]), 100000)
+    results["set"] = per_call(lambda i: config.set("game_settings.max_errors", i), 10000)
+    results["save_s"] = round(timed(config.flush), 6)
+    
+    scheduler.shutdown()
+    return results
+
+def main():
+    """Voer alle benchmarks uit en schrijf de resultaten als JSON"""
+    parser = argparse.ArgumentParser(description="Benchmark van de gegevenslaag")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="klassengroottes, gescheiden door komma's")
+    parser.add_argument("--backends", default="sqlite,shards",
+                        help="gebruikersopslag om te meten, gescheiden door komma's")
+    parser.add_argument("--lessons", type=int, default=500, help="aantal lessen")
+    parser.add_argument("--items", type=int, default=50, help="items per les")
+    parser.add_argument("--words", type=int, default=500000, help="woorden in de woordindex")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="schrijf JSON naar dit bestand in plaats van stdout")
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    backends = [backend for backend in args.backends.split(",") if backend]
+    directory = tempfile.mkdtemp(prefix="typecursus_bench_")
+    try:
+        lesson_ids = [f"L{i + 1}" for i in range(args.lessons)]
+        report = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "seed": args.seed
+            },
+            "users": [bench_users(directory, size, lesson_ids, args.seed, backend)
+                      for backend in backends for size in sizes],
+            "lessons": bench_lessons(directory, args.lessons, args.items, args.seed),
+            "words": bench_words(directory, args.words, args.seed),
+            "config": bench_config(directory)
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
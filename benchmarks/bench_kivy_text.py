@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Frametijdmeting voor de te typen tekst op het Kivy-lesscherm
+
+Typt lange zinnen letter voor letter, met af en toe een fout die met
+backspace wordt hersteld, en meet per aanslag de tijd tot het frame
+getekend is. Twee manieren worden vergeleken:
+
+- label: een gewoon Label met per letter [color]-markup; elke aanslag
+  rastert de hele zin opnieuw naar een nieuwe textuur;
+- cached: TypingTarget; elk item wordt één keer gerenderd en per aanslag
+  verandert alleen de markering. Een tweede ronde over dezelfde items
+  komt volledig uit de texturecache.
+
+Vsync en de fps-limiet staan uit, zodat de tijden het werk per frame
+meten. De uitkomst is JSON.
+
+Gebruik: python benchmarks/bench_kivy_text.py [--items 30] [--length 120]
+                                              [--output resultaten.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kivy.config import Config as KivyConfig
+KivyConfig.set("graphics", "vsync", "0")
+KivyConfig.set("graphics", "maxfps", "0")
+
+from kivy.base import EventLoop
+from kivy.metrics import sp
+from kivy.uix.label import Label
+from kivy.utils import escape_markup
+
+from src.data.lesson_manager import LessonManager
+from src.mobile.typing_target import TextureCache, TypingTarget
+from src.utils.persistence import get_scheduler
+
+# (positie, correct) voor een aanslag; correct None is een backspace
+Event = Tuple[int, object]
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50, p95, p99 en maximum in milliseconden"""
+    samples = sorted(samples)
+    pick = lambda fraction: samples[min(len(samples) - 1, int(len(samples) * fraction))]
+    return {
+        "count": len(samples),
+        "p50_ms": round(pick(0.50) * 1000, 3),
+        "p95_ms": round(pick(0.95) * 1000, 3),
+        "p99_ms": round(pick(0.99) * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3)
+    }
+
+def build_items(count: int, length: int, seed: int) -> List[str]:
+    """Lange zinnen uit de standaardlessen, aan elkaar geregen tot ongeveer length tekens"""
+    directory = tempfile.mkdtemp(prefix="typecursus_kivy_")
+    try:
+        sentences = [text for lesson in LessonManager(os.path.join(directory, "lessons.json"))
+                     .get_lessons_by_type("sentences") for text in lesson.texts]
+        # De standaardlessen worden op de achtergrond weggeschreven
+        get_scheduler().flush()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    rng = random.Random(seed)
+    items = []
+    for _ in range(count):
+        item = rng.choice(sentences)
+        while len(item) < length:
+            item += " " + rng.choice(sentences)
+        items.append(item[:length].rstrip())
+    return items
+
+def build_script(item: str, rng: random.Random, error_rate: float) -> List[Event]:
+    """Aanslagen voor één item: af en toe fout, dan backspace en opnieuw goed"""
+    events: List[Event] = []
+    for position in range(len(item)):
+        if rng.random() < error_rate:
+            events.append((position, False))
+            events.append((position, None))
+        events.append((position, True))
+    return events
+
+def frame() -> float:
+    """Teken één frame en geef de duur in seconden"""
+    start = time.perf_counter()
+    EventLoop.idle()
+    return time.perf_counter() - start
+
+def markup(item: str, states: List, cursor: int) -> str:
+    """Markup met een kleur per getypte letter en een onderstreepte cursor, zoals een Label het nodig heeft"""
+    parts = []
+    for position, char in enumerate(item):
+        text = escape_markup(char)
+        if position == cursor:
+            text = f"[u]{text}[/u]"
+        state = states[position]
+        if state is True:
+            text = f"[color=4CAF50]{text}[/color]"
+        elif state is False:
+            text = f"[color=F44336]{text}[/color]"
+        parts.append(text)
+    return "".join(parts)
+
+def run_label(window, items: List[str], scripts: List[List[Event]]) -> Dict:
+    """Per aanslag de hele zin opnieuw als markup in een Label zetten"""
+    label = Label(markup=True, font_size=sp(32), size=window.size)
+    window.add_widget(label)
+    keystrokes, switches = [], []
+    try:
+        for item, script in zip(items, scripts):
+            states = [None] * len(item)
+            label.text = markup(item, states, 0)
+            switches.append(frame())
+            for position, correct in script:
+                if correct is None:
+                    states[position] = None
+                    cursor = position
+                else:
+                    states[position] = correct
+                    cursor = position + 1
+                label.text = markup(item, states, cursor)
+                keystrokes.append(frame())
+    finally:
+        window.remove_widget(label)
+    return {"keystroke": percentiles(keystrokes), "item_switch": percentiles(switches)}
+
+def run_cached(window, items: List[str], scripts: List[List[Event]], cache: TextureCache) -> Dict:
+    """Per aanslag alleen de markering en de cursor van TypingTarget bijwerken"""
+    target = TypingTarget(font_size=sp(32), cache=cache, size=window.size)
+    window.add_widget(target)
+    keystrokes, switches = [], []
+    try:
+        for item, script in zip(items, scripts):
+            target.set_text(item)
+            switches.append(frame())
+            for position, correct in script:
+                if correct is None:
+                    target.unmark(position)
+                    target.set_cursor(position)
+                else:
+                    target.mark(position, correct)
+                    target.set_cursor(position + 1)
+                keystrokes.append(frame())
+    finally:
+        window.remove_widget(target)
+    return {
+        "keystroke": percentiles(keystrokes),
+        "item_switch": percentiles(switches),
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses
+    }
+
+def main():
+    """Meet beide manieren en schrijf de resultaten als JSON"""
+    parser = argparse.ArgumentParser(description="Frametijden van de te typen tekst in Kivy")
+    parser.add_argument("--items", type=int, default=30, help="aantal zinnen")
+    parser.add_argument("--length", type=int, default=120, help="tekens per zin")
+    parser.add_argument("--errors", type=float, default=0.05, help="kans op een fout per letter")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="schrijf JSON naar dit bestand in plaats van stdout")
+    args = parser.parse_args()
+    
+    items = build_items(args.items, args.length, args.seed)
+    rng = random.Random(args.seed)
+    scripts = [build_script(item, rng, args.errors) for item in items]
+    
+    EventLoop.ensure_window()
+    window = EventLoop.window
+    try:
+        # Eén opwarmframe zodat het openen van het venster niet meetelt
+        frame()
+        label = run_label(window, items, scripts)
+        cache = TextureCache()
+        cached_first = run_cached(window, items, scripts, cache)
+        cached_again = run_cached(window, items, scripts, cache)
+    finally:
+        window.close()
+        
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "window": list(window.size),
+            "items": args.items,
+            "length": args.length,
+            "seed": args.seed
+        },
+        "label": label,
+        "cached": cached_first,
+        "cached_warm": cached_again
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
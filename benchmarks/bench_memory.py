@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geheugenbenchmark voor User en Lesson
+
+Meet het aantal bytes per gebruiker en per lesitem voor de oude
+representatie (objecten met __dict__, inhoud als lijst van dicts) en de
+huidige compacte representatie (__slots__, geïnterneerde strings,
+inhoud in een lijst plus byte-array).
+
+Gebruik: python benchmarks/bench_memory.py [aantal_gebruikers] [aantal_items]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.user_manager import User
+from src.data.lesson_manager import Lesson
+
+WORDS = ["kat", "hond", "huis", "boom", "zon", "paard", "koe", "kip", "varken", "schaap"]
+
+class LegacyUser:
+    """Oude gebruikersrepresentatie met een __dict__ per instantie"""
+    
+    def __init__(self, name: str, age: int = 10):
+        self.name = name
+        self.age = age
+        self.created_date = "2024-01-01T00:00:00"
+        self.last_login = "2024-01-01T00:00:00"
+        self.current_level = 1
+        self.current_lesson = 1
+        self.total_points = 0
+        self.lessons_completed = 0
+        self.typing_speed = 0
+        self.accuracy = 0
+        self.total_words_typed = 0
+        self.total_errors = 0
+        self.stars_earned = 0
+        self.badges = []
+        self.games_unlocked = []
+        self.lesson_results = {}
+
+class LegacyLesson:
+    """Oude lesrepresentatie met inhoud als lijst van dicts"""
+    
+    def __init__(self, lesson_id: str, title: str, level: int, lesson_type: str):
+        self.lesson_id = lesson_id
+        self.title = title
+        self.level = level
+        self.lesson_type = lesson_type
+        self.content = []
+        self.instructions = ""
+        self.target_speed = 0
+        self.target_accuracy = 0
+        
+    def add_content(self, text: str, difficulty: int = 1):
+        self.content.append({"text": text, "difficulty": difficulty})
+
+def measure(build) -> int:
+    """Meet de netto toegewezen bytes van wat build() teruggeeft"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+def build_users(cls, count: int) -> list:
+    """Bouw een klassenlijst met een paar lesresultaten per gebruiker"""
+    users = []
+    for i in range(count):
+        # Namen en les-ID's komen (zoals na json.load) als nieuwe strings binnen
+        user = cls("".join(["leerling", str(i)]), 10)
+        if cls is User:
+            user.created_date = user.last_login = "2024-01-01T00:00:00"
+        for j in range(5):
+            lesson_id = "".join(["L", str(j + 1)])
+            if cls is User:
+                lesson_id = sys.intern(lesson_id)
+            user.lesson_results[lesson_id] = {
+                "completed_date": "2024-01-01T00:00:00",
+                "score": 10, "accuracy": 90.0, "speed": 12.0
+            }
+        users.append(user)
+    return users
+
+def build_lessons(cls, items: int, per_lesson: int = 50) -> list:
+    """Bouw een lesbibliotheek met items woorden verdeeld over lessen"""
+    lessons = []
+    for i in range(0, items, per_lesson):
+        lesson = cls(f"W{i}", "Woorden", 2, "words")
+        for j in range(per_lesson):
+            # Simuleer tekst uit een JSON-bestand: elke keer een nieuw str-object
+            lesson.add_content("".join([WORDS[(i + j) % len(WORDS)]]), 1)
+        lessons.append(lesson)
+    return lessons
+
+def main():
+    """Voer de benchmark uit en toon bytes per gebruiker en per lesitem"""
+    user_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    item_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    
+    rows = [
+        ("bytes per gebruiker",
+         measure(lambda: build_users(LegacyUser, user_count)) / user_count,
+         measure(lambda: build_users(User, user_count)) / user_count),
+        ("bytes per lesitem",
+         measure(lambda: build_lessons(LegacyLesson, item_count)) / item_count,
+         measure(lambda: build_lessons(Lesson, item_count)) / item_count),
+    ]
+    
+    print(f"{'':<22}{'voor':>10}{'na':>10}{'besparing':>12}")
+    for label, before, after in rows:
+        saving = 100 * (before - after) / before if before else 0
+        print(f"{label:<22}{before:>10.0f}{after:>10.0f}{saving:>11.0f}%")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Latentiemeting voor de geluidseffecten
+
+Laadt alle effecten zoals de applicatie dat doet en meet per effect de
+tijd van SoundManager.play() plus de vertraging van de mixerbuffer. De
+uitkomst is JSON.
+
+Gebruik: python benchmarks/bench_sound.py [herhalingen]
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.sound_manager import SoundManager
+
+def main():
+    """Meet de latentie van alle effecten en toon het resultaat als JSON"""
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    
+    sound = SoundManager()
+    start = time.perf_counter()
+    sound.load()
+    load_ms = (time.perf_counter() - start) * 1000
+    if not sound.ready:
+        sys.exit(1)
+        
+    report = {
+        "load_ms": round(load_ms, 2),
+        "effects": [sound.measure_latency(name, repeats) for name in SoundManager.EFFECTS]
+    }
+    sound.quit()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
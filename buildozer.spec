@@ -3,7 +3,7 @@ title = Kinder Typecursus
 package.name = kindertypecursus
 package.domain = org.kindertypecursus
 source.dir = .
-source.include_exts = py,png,jpg,kv,atlas,json
+source.include_exts = py,png,jpg,kv,atlas,json,corpus
 version = 1.0
 
 requirements = python3,kivy==2.2.1,pygame
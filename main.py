@@ -5,53 +5,126 @@ Interactieve Typecursus voor Kinderen (8-12 jaar)
 Ontwikkeld in het Nederlands
 """
 
+# Als eerste: legt het starttijdstip vast voor --startup-profile
+from src.utils.startup import Deferred, StartupProfiler, prefetch_modules, resolve
+
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
 import os
-from typing import Dict, List, Optional
-import pygame
+from typing import Dict, List, Optional, Tuple
 
+from src.classroom.protocol import parse_address
 from src.gui.main_window import MainWindow
 from src.data.user_manager import UserManager
 from src.data.lesson_manager import LessonManager
 from src.utils.config import Config
+from src.utils.persistence import get_scheduler
+from src.utils.sound_manager import SoundManager
 
 class TypingCourseApp:
     """Hoofdklasse voor de typecursus applicatie"""
     
-    def __init__(self):
-        """Initialiseer de typecursus applicatie"""
-        self.root = tk.Tk()
-        self.root.title("Kinder Typecursus - Leer Typen met Plezier!")
-        self.root.geometry("1200x800")
-        self.root.minsize(1000, 700)
+    def __init__(self, profiler: Optional[StartupProfiler] = None,
+                 classroom: Optional[Tuple[str, int]] = None):
+        """Initialiseer de typecursus applicatie (classroom: adres van een klaslokaalserver)"""
+        self.profiler = profiler or StartupProfiler()
+        self.profiler.mark("modules geïmporteerd")
         
-        # Initialiseer pygame voor geluid
-        pygame.mixer.init()
+        with self.profiler.phase("Tk-venster"):
+            self.root = tk.Tk()
+            self.root.title("Kinder Typecursus - Leer Typen met Plezier!")
+            self.root.geometry("1200x800")
+            self.root.minsize(1000, 700)
         
-        # Laad configuratie
-        self.config = Config()
+        # Laad configuratie (nodig voor kleuren en lettertypen van het eerste scherm)
+        with self.profiler.phase("configuratie"):
+            self.config = Config()
         
-        # Initialiseer managers
-        self.user_manager = UserManager()
-        self.lesson_manager = LessonManager()
+        # Geluid en managers laden op de achtergrond; het loginscherm wacht er niet op
+        # (pygame importeren en de mixer starten duurt op sommige laptops seconden)
+        self.sound = SoundManager(self.config)
+        self.sound_loader = Deferred(self.sound.load, "geluid", self.profiler)
+        if classroom is None:
+            self.classroom: Optional[Deferred] = None
+            self._user_manager = Deferred(
+                lambda: UserManager(backend=self.config.get("storage.users_backend", "sqlite")),
+                "gebruikers", self.profiler
+            )
+            self._lesson_manager = Deferred(
+                lambda: LessonManager(config=self.config), "lessen", self.profiler
+            )
+        else:
+            # Klaslokaalmodus: de server beheert gebruikers en lessen voor alle machines
+            from src.classroom.client import ClassroomClient, RemoteLessonManager, remote_user_manager
+            self.classroom = Deferred(lambda: ClassroomClient(*classroom), "klaslokaal", self.profiler)
+            self._user_manager = Deferred(
+                lambda: remote_user_manager(self.classroom.result()), "gebruikers", self.profiler
+            )
+            self._lesson_manager = Deferred(
+                lambda: RemoteLessonManager(self.classroom.result(), self.config), "lessen", self.profiler
+            )
+        self.screen_modules: Optional[Deferred] = None
         
         # Stel het hoofdvenster in
-        self.setup_main_window()
+        with self.profiler.phase("hoofdvenster en loginscherm"):
+            self.setup_main_window()
         
         # Stel de applicatie in voor afsluiten
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.root.after_idle(self.on_first_frame)
+        
+    @property
+    def user_manager(self) -> UserManager:
+        """Gebruikersmanager (wacht zo nodig tot hij geladen is)"""
+        return resolve(self._user_manager)
+        
+    @property
+    def lesson_manager(self) -> LessonManager:
+        """Lesmanager (wacht zo nodig tot hij geladen is)"""
+        return resolve(self._lesson_manager)
         
     def setup_main_window(self):
         """Stel het hoofdvenster in"""
         self.main_window = MainWindow(
             self.root, 
-            self.user_manager, 
-            self.lesson_manager,
-            self.config
+            self._user_manager, 
+            self._lesson_manager,
+            self.config,
+            self.sound
         )
         
+    def on_first_frame(self):
+        """Het loginscherm staat op het scherm; laad nu de overige schermen"""
+        self.root.update_idletasks()
+        self.profiler.mark("eerste frame")
+        self.screen_modules = prefetch_modules(MainWindow.SCREEN_MODULES, self.profiler)
+        if self.classroom is not None:
+            self.root.after(100, self.pump_classroom)
+        if self.profiler.enabled:
+            self.report_when_ready()
+            
+    def report_when_ready(self):
+        """Toon de opstarttijdlijn zodra al het achtergrondwerk klaar is"""
+        background = (self.sound_loader, self._user_manager, self._lesson_manager, self.screen_modules)
+        if all(task.ready for task in background):
+            self.profiler.mark("achtergrond klaar")
+            self.profiler.print_report()
+        else:
+            self.root.after(50, self.report_when_ready)
+        
+    def pump_classroom(self):
+        """Verwerk op de Tk-thread de wijzigingen die andere machines hebben opgeslagen"""
+        # Pas na het laden van de managers; tot dan blijven berichten in de wachtrij
+        if all(task.ready for task in (self.classroom, self._user_manager, self._lesson_manager)):
+            try:
+                self.classroom.result().dispatch_events()
+            except Exception as e:
+                print(f"Fout bij klaslokaalverbinding: {e}")
+                return
+        self.root.after(100, self.pump_classroom)
+        
     def run(self):
         """Start de applicatie"""
         try:
@@ -62,9 +135,15 @@ class TypingCourseApp:
     def on_closing(self):
         """Handel het afsluiten van de applicatie af"""
         try:
-            # Sla alle gebruikersgegevens op
-            self.user_manager.save_all_users()
-            pygame.mixer.quit()
+            # Sla de gegevens van de huidige gebruiker op
+            self.user_manager.save_current_user()
+            self.config.flush()
+            # Wacht tot de opslagthread alles veilig heeft weggeschreven
+            get_scheduler().shutdown()
+            if self.classroom is not None:
+                self.classroom.result().close()
+            self.sound_loader.result()
+            self.sound.quit()
             self.root.destroy()
         except Exception as e:
             print(f"Fout bij afsluiten: {e}")
@@ -72,8 +151,23 @@ class TypingCourseApp:
 
 def main():
     """Hoofdfunctie om de applicatie te starten"""
+    parser = argparse.ArgumentParser(description="Kinder Typecursus")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="toon een tijdlijn van de opstart")
+    parser.add_argument("--classroom", metavar="HOST:POORT",
+                        help="gebruik de gebruikers en lessen van een klaslokaalserver")
+    parser.add_argument("--classroom-server", metavar="HOST:POORT", nargs="?", const="",
+                        help="start een klaslokaalserver in plaats van de applicatie")
+    args, _ = parser.parse_known_args()
+    
+    if args.classroom_server is not None:
+        from src.classroom.server import run_server
+        run_server(*parse_address(args.classroom_server))
+        return
+        
     try:
-        app = TypingCourseApp()
+        classroom = parse_address(args.classroom) if args.classroom else None
+        app = TypingCourseApp(StartupProfiler(enabled=args.startup_profile), classroom)
         app.run()
     except Exception as e:
         print(f"Kritieke fout: {e}")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Client voor de klaslokaalserver
+
+ClassroomClient houdt één verbinding open voor alle verzoeken van de
+applicatie; een leesthread koppelt antwoorden aan de wachtende aanroep en
+zet wijzigingen van andere machines in een wachtrij. RemoteUserStore en
+RemoteLessonManager laten de bestaande managers via die verbinding werken,
+zodat MainWindow en de schermen niets van de server hoeven te weten.
+"""
+
+import itertools
+import queue
+import socket
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .protocol import DEFAULT_HOST, DEFAULT_PORT, RemoteError, decode, encode
+from ..data.lesson_manager import Lesson, LessonManager
+from ..data.user_manager import UserManager
+
+class _Pending:
+    """Antwoord waarop een aanroep wacht"""
+    
+    __slots__ = ("done", "reply")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.reply: Optional[Dict] = None
+
+class ClassroomClient:
+    """Blijvende verbinding met de klaslokaalserver, bruikbaar vanaf meerdere threads"""
+    
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 10.0):
+        """Maak verbinding; mislukt direct als de server niet bereikbaar is"""
+        self.address = (host, port)
+        self.timeout = timeout
+        self.sock = socket.create_connection(self.address, timeout)
+        self.sock.settimeout(None)
+        # Kleine berichten meteen versturen in plaats van ze te bundelen (Nagle)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.send_lock = threading.Lock()
+        self.pending: Dict[int, _Pending] = {}
+        self.pending_lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.events: "queue.SimpleQueue[Dict]" = queue.SimpleQueue()
+        self.listeners: Dict[str, List[Callable[[Dict], None]]] = {}
+        self.connected = True
+        self.reader = threading.Thread(target=self._read_loop, name="klaslokaal", daemon=True)
+        self.reader.start()
+        
+    def _read_loop(self):
+        """Lees berichten van de server tot de verbinding sluit"""
+        try:
+            with self.sock.makefile('rb') as stream:
+                for line in stream:
+                    message = decode(line)
+                    if isinstance(message, list):
+                        for reply in message:
+                            self._resolve(reply)
+                    elif "event" in message:
+                        self.events.put(message)
+                    else:
+                        self._resolve(message)
+        except (OSError, ValueError) as e:
+            if self.connected:
+                print(f"Fout bij klaslokaalverbinding: {e}")
+        finally:
+            self.connected = False
+            # Niemand mag blijven wachten op een antwoord dat nooit komt
+            with self.pending_lock:
+                waiting, self.pending = self.pending, {}
+            for pending in waiting.values():
+                pending.done.set()
+                
+    def _resolve(self, reply: Dict):
+        """Geef een antwoord aan de aanroep die erop wacht"""
+        with self.pending_lock:
+            pending = self.pending.pop(reply.get("id"), None)
+        if pending is not None:
+            pending.reply = reply
+            pending.done.set()
+            
+    def call(self, operation: str, **args) -> Any:
+        """Voer één opdracht uit op de server en wacht op het resultaat"""
+        return self.call_many([(operation, args)])[0]
+        
+    def call_many(self, calls: Iterable[Tuple[str, Dict]]) -> List[Any]:
+        """Stuur meerdere opdrachten als één bericht; de server voert ze in volgorde uit"""
+        requests = []
+        waiting = []
+        with self.pending_lock:
+            for operation, args in calls:
+                request_id = next(self.ids)
+                pending = self.pending[request_id] = _Pending()
+                requests.append({"id": request_id, "op": operation, "args": args})
+                waiting.append(pending)
+        if not requests:
+            return []
+            
+        if not self.connected:
+            raise ConnectionError("Geen verbinding met de klaslokaalserver")
+        with self.send_lock:
+            self.sock.sendall(encode(requests if len(requests) > 1 else requests[0]))
+            
+        results = []
+        for pending in waiting:
+            if not pending.done.wait(self.timeout):
+                raise TimeoutError("De klaslokaalserver antwoordt niet")
+            if pending.reply is None:
+                raise ConnectionError("Verbinding met de klaslokaalserver verbroken")
+            if "error" in pending.reply:
+                raise RemoteError(pending.reply["error"])
+            results.append(pending.reply.get("result"))
+        return results
+        
+    def on(self, event: str, callback: Callable[[Dict], None]):
+        """Registreer een functie voor een wijziging die de server doorstuurt"""
+        self.listeners.setdefault(event, []).append(callback)
+        
+    def dispatch_events(self) -> int:
+        """Verwerk de ontvangen wijzigingen op de aanroepende thread (de Tk-thread)"""
+        count = 0
+        while True:
+            try:
+                message = self.events.get_nowait()
+            except queue.Empty:
+                return count
+            for callback in self.listeners.get(message["event"], ()):
+                try:
+                    callback(message)
+                except Exception as e:
+                    print(f"Fout bij verwerken klaslokaalwijziging: {e}")
+            count += 1
+            
+    def close(self):
+        """Sluit de verbinding"""
+        self.connected = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+class RemoteUserStore:
+    """Gebruikersopslag voor UserManager die alles via de klaslokaalserver doet"""
+    
+    def __init__(self, client: ClassroomClient):
+        self.client = client
+        
+    def load_index(self) -> Dict[str, Dict]:
+        return self.client.call("load_index")
+        
+    def load_user(self, name: str) -> Optional[Dict]:
+        return self.client.call("load_user", name=name)
+        
+    def load_all(self) -> Dict[str, Dict]:
+        return self.client.call("load_all")
+        
+    def save_user(self, user_data: Dict):
+        self.client.call("save_user", data=user_data)
+        
+    def save_users(self, users_data: Iterable[Dict]):
+        self.client.call_many([("save_user", {"data": data}) for data in users_data])
+        
+    def delete_user(self, name: str):
+        self.client.call("delete_user", name=name)
+        
+    def close(self):
+        pass
+
+def remote_user_manager(client: ClassroomClient, scheduler=None) -> UserManager:
+    """UserManager die via de server werkt en wijzigingen van andere machines bijhoudt"""
+    manager = UserManager(store=RemoteUserStore(client), scheduler=scheduler)
+    client.on("user_changed",
+              lambda message: manager.apply_remote_change(message["name"], message.get("summary")))
+    return manager
+
+class RemoteLessonSource:
+    """Leest de inhoud van een les pas bij eerste gebruik van de server"""
+    
+    def __init__(self, client: ClassroomClient):
+        self.client = client
+        
+    def read_content(self, lesson_id: str) -> List[Dict]:
+        return self.client.call("lesson_content", lesson_id=lesson_id)
+
+class RemoteLessonManager(LessonManager):
+    """LessonManager met de lessen van de server; opslaan doet de server"""
+    
+    def __init__(self, client: ClassroomClient, config=None):
+        """Haal de kopgegevens van alle lessen op bij de server"""
+        self.client = client
+        self.source = RemoteLessonSource(client)
+        super().__init__(lessons_file="", config=config)
+        client.on("lesson_added", self.lesson_added)
+        
+    def load_lessons(self):
+        """Laad de kopgegevens van alle lessen; de inhoud volgt bij eerste gebruik"""
+        try:
+            for header in self.client.call("lesson_headers"):
+                self.add_lesson(Lesson.from_header(header, self.source))
+        except Exception as e:
+            print(f"Fout bij laden lessen: {e}")
+            
+    def save_lessons(self):
+        """De server slaat de lessen op; hier is niets te doen"""
+        
+    def create_custom_lesson(self, title: str, level: int, lesson_type: str,
+                             content: List[str], instructions: str = "") -> Lesson:
+        """Maak een aangepaste les aan op de server"""
+        data = self.client.call("create_custom_lesson", title=title, level=level,
+                                lesson_type=lesson_type, content=content,
+                                instructions=instructions)
+        lesson = Lesson.from_dict(data)
+        self.add_lesson(lesson)
+        return lesson
+        
+    def lesson_added(self, message: Dict):
+        """Een andere machine heeft een les toegevoegd"""
+        self.add_lesson(Lesson.from_header(message["lesson"], self.source))
\ No newline at end of file
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Protocol van de klaslokaalserver
+
+Eén JSON-bericht per regel over een blijvende TCP-verbinding (standaard
+alleen loopback). Een regel bevat één verzoek {"id", "op", "args"} of een
+lijst verzoeken die in één keer worden afgehandeld; het antwoord heeft
+dezelfde vorm met "result" of "error". Berichten met "event" in plaats van
+"id" stuurt de server uit zichzelf wanneer een andere machine iets wijzigt.
+"""
+
+import json
+from typing import Any, Tuple
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 48765
+
+# Langste toegestane regel; load_all van een grote klas past er ruim in
+LINE_LIMIT = 64 * 1024 * 1024
+
+class RemoteError(Exception):
+    """Fout die de server meldde bij het afhandelen van een verzoek"""
+
+def encode(message: Any) -> bytes:
+    """Zet een bericht om naar één regel UTF-8"""
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode('utf-8') + b"\n"
+
+def decode(line: bytes) -> Any:
+    """Lees één regel terug als bericht"""
+    return json.loads(line.decode('utf-8'))
+
+def parse_address(text: str) -> Tuple[str, int]:
+    """Zet 'host:poort', 'host' of 'poort' om naar (host, poort)"""
+    host, _, port = text.rpartition(":")
+    if not host and not port.isdigit():
+        return port or DEFAULT_HOST, DEFAULT_PORT
+    return host or DEFAULT_HOST, int(port)
\ No newline at end of file
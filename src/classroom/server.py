@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klaslokaalserver voor de Kinder Typecursus
+
+Eén proces beheert UserManager en LessonManager voor het hele lokaal; de
+machines van de leerlingen praten er via ClassroomClient mee in plaats van
+zelf hetzelfde bestand op een netwerkschijf te overschrijven. Alle
+verzoeken worden op één asyncio-lus afgehandeld en zijn dus vanzelf
+achter elkaar; het wegschrijven gebeurt zoals altijd op de opslagthread.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Set
+
+from .protocol import DEFAULT_HOST, DEFAULT_PORT, LINE_LIMIT, decode, encode
+from ..data.lesson_manager import LessonManager
+from ..data.user_manager import UserManager
+from ..utils.persistence import get_scheduler
+
+class ClassroomServer:
+    """Asyncio-server die als enige de gebruikers en lessen van het lokaal beheert"""
+    
+    # Een client die zoveel bytes aan berichten niet ophaalt, wordt losgekoppeld
+    MAX_BACKLOG = 8 * 1024 * 1024
+    
+    def __init__(self, user_manager: UserManager, lesson_manager: LessonManager,
+                 host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """Initialiseer de server; luisteren begint pas in start()"""
+        self.user_manager = user_manager
+        self.lesson_manager = lesson_manager
+        self.host = host
+        self.port = port
+        self.clients: Set[asyncio.StreamWriter] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+        # Wijzigingen per client, aan het eind van de lusronde in één schrijfactie verstuurd
+        self.outbox: Dict[asyncio.StreamWriter, List[bytes]] = {}
+        
+    async def start(self):
+        """Begin met luisteren (poort 0 kiest een vrije poort)"""
+        self.server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, limit=LINE_LIMIT
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        
+    async def serve_forever(self):
+        """Luister en handel verbindingen af tot de taak geannuleerd wordt"""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+            
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handel alle verzoeken van één blijvende verbinding af"""
+        self.clients.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = decode(line)
+                except ValueError as e:
+                    writer.write(encode({"id": None, "error": f"Ongeldig bericht: {e}"}))
+                    continue
+                # Een lijst verzoeken krijgt één lijst antwoorden in één schrijfactie
+                if isinstance(message, list):
+                    reply = [self.dispatch(writer, request) for request in message]
+                else:
+                    reply = self.dispatch(writer, message)
+                writer.write(encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            print(f"Fout bij klaslokaalverbinding: {e}")
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+            
+    def dispatch(self, client: asyncio.StreamWriter, request: Dict) -> Dict:
+        """Voer één verzoek uit en maak het antwoord"""
+        request_id = request.get("id")
+        operation = request.get("op")
+        handler = getattr(self, f"op_{operation}", None)
+        if handler is None:
+            return {"id": request_id, "error": f"Onbekende opdracht '{operation}'"}
+        try:
+            return {"id": request_id, "result": handler(client, **request.get("args", {}))}
+        except Exception as e:
+            return {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+            
+    def broadcast(self, event: str, data: Dict, exclude: Optional[asyncio.StreamWriter] = None):
+        """Stuur een wijziging naar alle andere clients zonder op ze te wachten"""
+        line = encode({"event": event, **data})
+        if not self.outbox:
+            asyncio.get_running_loop().call_soon(self.flush_outbox)
+        for client in self.clients:
+            if client is not exclude:
+                self.outbox.setdefault(client, []).append(line)
+                
+    def flush_outbox(self):
+        """Verstuur alle wijzigingen van deze lusronde: één schrijfactie per client"""
+        outbox, self.outbox = self.outbox, {}
+        for client, lines in outbox.items():
+            if client.is_closing():
+                continue
+            if client.transport.get_write_buffer_size() > self.MAX_BACKLOG:
+                # Een hangende machine mag de rest van het lokaal niet ophouden
+                print("Fout bij klaslokaalverbinding: client reageert niet, verbinding gesloten")
+                client.close()
+                continue
+            client.write(b"".join(lines))
+            
+    def user_changed(self, name: str, client: asyncio.StreamWriter):
+        """Meld de nieuwe samenvatting van een gebruiker aan de andere clients"""
+        self.broadcast("user_changed",
+                       {"name": name, "summary": self.user_manager.user_index.get(name)},
+                       exclude=client)
+        
+    # Opdrachten; elke op_<naam> is vanaf de client aan te roepen als <naam>
+    
+    def op_ping(self, client) -> bool:
+        return True
+        
+    def op_load_index(self, client) -> Dict[str, Dict]:
+        return self.user_manager.user_index
+        
+    def op_load_user(self, client, name: str) -> Optional[Dict]:
+        user = self.user_manager.get_user(name)
+        return user.to_dict() if user is not None else None
+        
+    def op_load_all(self, client) -> Dict[str, Dict]:
+        return {user.name: user.to_dict() for user in self.user_manager.get_all_users()}
+        
+    def op_save_user(self, client, data: Dict) -> bool:
+        self.user_manager.import_user(data)
+        self.user_changed(data["name"], client)
+        return True
+        
+    def op_delete_user(self, client, name: str) -> bool:
+        deleted = self.user_manager.delete_user(name)
+        if deleted:
+            self.user_changed(name, client)
+        return deleted
+        
+    def op_lesson_headers(self, client) -> List[Dict]:
+        return [lesson.to_header() for lesson in self.lesson_manager.lessons.values()]
+        
+    def op_lesson_content(self, client, lesson_id: str) -> List[Dict]:
+        lesson = self.lesson_manager.get_lesson(lesson_id)
+        if lesson is None:
+            raise KeyError(f"Les '{lesson_id}' bestaat niet")
+        return lesson.content
+        
+    def op_create_custom_lesson(self, client, title: str, level: int, lesson_type: str,
+                                content: List[str], instructions: str = "") -> Dict:
+        # De server kiest het les-ID, zodat twee machines nooit hetzelfde ID uitdelen
+        lesson = self.lesson_manager.create_custom_lesson(title, level, lesson_type,
+                                                          content, instructions)
+        self.broadcast("lesson_added", {"lesson": lesson.to_header()}, exclude=client)
+        return lesson.to_dict()
+
+def run_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+               users_file: str = "users.json", lessons_file: str = "lessons.json"):
+    """Start de klaslokaalserver en blijf draaien tot Ctrl+C"""
+    server = ClassroomServer(UserManager(users_file), LessonManager(lessons_file), host, port)
+    
+    async def serve():
+        await server.start()
+        # Eén regel op stdout, zodat scripts de gekozen poort kunnen uitlezen
+        print(f"Klaslokaalserver luistert op {server.host}:{server.port}", flush=True)
+        await server.serve_forever()
+        
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        get_scheduler().shutdown()
\ No newline at end of file
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Voorberekende oefenpools voor de Kinder Typecursus
+"""
+
+import heapq
+import random
+from itertools import accumulate
+from typing import List, Optional, Sequence
+
+class ContentPool:
+    """Pool van oefenteksten waaruit gewogen zonder teruglegging getrokken wordt"""
+    
+    __slots__ = ("texts", "cum_weights")
+    
+    def __init__(self, texts: Sequence[str], weights: Optional[Sequence[float]] = None):
+        """Maak een pool; zonder gewichten wordt uniform getrokken"""
+        self.texts = list(texts)
+        self.cum_weights: Optional[List[float]] = None
+        if weights is not None and len(set(weights)) > 1:
+            self.cum_weights = list(accumulate(weights))
+            
+    def __len__(self) -> int:
+        return len(self.texts)
+        
+    def sample(self, count: int, rng: random.Random = None) -> List[str]:
+        """Trek count verschillende teksten (gewogen als er gewichten zijn)"""
+        rng = rng or random
+        size = len(self.texts)
+        if count >= size:
+            items = list(self.texts)
+            rng.shuffle(items)
+            return items
+        if count <= 0:
+            return []
+            
+        if self.cum_weights is None:
+            return rng.sample(self.texts, count)
+            
+        # Kleine trekking: trek met teruglegging en sla dubbelen over. Dat geeft
+        # dezelfde verdeling als opeenvolgend trekken zonder teruglegging.
+        if count <= size // 4:
+            chosen = {}
+            indexes = range(size)
+            for _ in range(8):
+                for index in rng.choices(indexes, cum_weights=self.cum_weights, k=count):
+                    if index not in chosen:
+                        chosen[index] = None
+                        if len(chosen) == count:
+                            return [self.texts[i] for i in chosen]
+                            
+        return self._sample_keys(count, rng)
+        
+    def _sample_keys(self, count: int, rng) -> List[str]:
+        """Efraimidis-Spirakis: de count grootste sleutels u ** (1 / gewicht)"""
+        previous = 0.0
+        keys = []
+        for index, cumulative in enumerate(self.cum_weights):
+            weight = cumulative - previous
+            previous = cumulative
+            if weight > 0:
+                keys.append((rng.random() ** (1.0 / weight), index))
+        return [self.texts[index] for _, index in heapq.nlargest(count, keys)]
\ No newline at end of file
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Omgekeerde index voor adaptieve oefeningen in de Kinder Typecursus
+
+Voor elke toets en lettercombinatie staat vooraf vast in welke
+oefenitems van de lesbibliotheek ze voorkomen. Een oefening voor de
+zwakke toetsen van een leerling bekijkt daardoor alleen de items waar
+die toetsen in zitten, zonder de bibliotheek te doorlopen.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class DrillIndex:
+    """Index van toets of lettercombinatie naar de oefenitems waarin ze voorkomen"""
+    
+    def __init__(self, items: Iterable[Tuple[str, str, int]]):
+        """Bouw de index uit (tekst, lestype, moeilijkheidsgraad); dubbele items tellen één keer"""
+        self.texts: List[str] = []
+        self.types: List[str] = []
+        self.difficulties = array('B')
+        self.postings: Dict[str, array] = {}
+        seen = set()
+        for text, lesson_type, difficulty in items:
+            if (text, lesson_type) in seen:
+                continue
+            seen.add((text, lesson_type))
+            item = len(self.texts)
+            self.texts.append(text)
+            self.types.append(lesson_type)
+            self.difficulties.append(difficulty)
+            targets = set(text)
+            targets.update(text[i:i + 2] for i in range(len(text) - 1))
+            for target in targets:
+                postings = self.postings.get(target)
+                if postings is None:
+                    postings = self.postings[target] = array('I')
+                postings.append(item)
+                
+    def __len__(self) -> int:
+        return len(self.texts)
+        
+    def score(self, targets: Iterable[Tuple[str, float]], lesson_type: Optional[str] = None,
+              max_difficulty: Optional[int] = None) -> Dict[int, float]:
+        """Per item de som van de gewichten van de gezochte toetsen die erin voorkomen"""
+        scores: Dict[int, float] = {}
+        for target, weight in targets:
+            for item in self.postings.get(target, ()):
+                scores[item] = scores.get(item, 0.0) + weight
+                
+        if lesson_type is not None or max_difficulty is not None:
+            scores = {
+                item: score for item, score in scores.items()
+                if (lesson_type is None or self.types[item] == lesson_type)
+                and (max_difficulty is None or self.difficulties[item] <= max_difficulty)
+            }
+        return scores
\ No newline at end of file
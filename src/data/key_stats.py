@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Toetsstatistieken per leerling voor de Kinder Typecursus
+
+Lopende tellers per toets en per lettercombinatie (aantal, fouten,
+reactietijd), bijgewerkt met alleen de aanslagen van de laatste les.
+Daaruit volgen de zwakke toetsen waarop adaptieve oefeningen zich richten.
+"""
+
+import sys
+from typing import Dict, List, Tuple
+
+from ..utils.keylog import accumulate
+
+class KeyStats:
+    """Tellers (aantal, fouten, totale reactietijd ms, getimede aanslagen) per toets en lettercombinatie"""
+    
+    __slots__ = ("keys", "bigrams")
+    
+    # Aangenomen voorkennis: een toets die één keer misging is nog niet meteen de zwakste
+    PRIOR_COUNT = 10
+    PRIOR_ERRORS = 0.5
+    
+    def __init__(self):
+        # Regels zijn tuples en worden bij bijwerken vervangen, nooit gewijzigd:
+        # een ondiepe kopie van de dicts is daardoor al een vaste momentopname
+        self.keys: Dict[str, Tuple[int, ...]] = {}
+        self.bigrams: Dict[str, Tuple[int, ...]] = {}
+        
+    def add_chunk(self, data: bytes):
+        """Tel een blok aanslagen uit de KeystrokeRecorder erbij"""
+        keys: Dict[int, list] = {}
+        bigrams: Dict[Tuple[int, int], list] = {}
+        accumulate(data, keys, bigrams)
+        for code, entry in keys.items():
+            if code:
+                self._add(self.keys, chr(code), entry)
+        for (first, second), entry in bigrams.items():
+            self._add(self.bigrams, chr(first) + chr(second), entry)
+            
+    @staticmethod
+    def _add(table: Dict[str, Tuple[int, ...]], key: str, entry: List[int]):
+        """Tel tellers op bij een regel (vervangt de tuple)"""
+        current = table.get(key)
+        if current is None:
+            table[sys.intern(key)] = tuple(entry)
+        else:
+            table[key] = tuple(old + new for old, new in zip(current, entry))
+                
+    def mean_latency(self) -> float:
+        """Gemiddelde reactietijd over alle toetsen"""
+        total = sum(entry[2] for entry in self.keys.values())
+        timed = sum(entry[3] for entry in self.keys.values())
+        return total / timed if timed else 0.0
+        
+    def weakness(self, entry: Tuple[int, ...], mean_latency: float) -> float:
+        """Zwakte van een toets: afgevlakte foutkans, zwaarder als de toets trager is dan gemiddeld"""
+        count, errors, latency_total, latency_count = entry
+        error_rate = (errors + self.PRIOR_ERRORS) / (count + self.PRIOR_COUNT)
+        if latency_count and mean_latency:
+            return error_rate * max(0.5, latency_total / latency_count / mean_latency)
+        return error_rate
+        
+    def weak_targets(self, limit: int = 8, min_count: int = 3) -> List[Tuple[str, float]]:
+        """De zwakste toetsen en lettercombinaties als (tekst, gewicht), zwakste eerst"""
+        mean_latency = self.mean_latency()
+        scored = [
+            (self.weakness(entry, mean_latency), target)
+            for table in (self.keys, self.bigrams)
+            for target, entry in table.items()
+            # Spaties en Enter zitten in bijna elk item en zeggen weinig
+            if entry[0] >= min_count and target.strip() == target and target.strip()
+        ]
+        scored.sort(reverse=True)
+        return [(target, weight) for weight, target in scored[:limit]]
+        
+    def to_dict(self) -> Dict:
+        """Converteer naar dictionary (ondiepe kopie, veilig voor de opslagthread)"""
+        return {"keys": dict(self.keys), "bigrams": dict(self.bigrams)}
+        
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'KeyStats':
+        """Maak tellers aan uit dictionary"""
+        stats = cls()
+        stats.keys = {sys.intern(key): tuple(entry) for key, entry in data.get("keys", {}).items()}
+        stats.bigrams = {sys.intern(key): tuple(entry) for key, entry in data.get("bigrams", {}).items()}
+        return stats
\ No newline at end of file
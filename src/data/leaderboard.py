@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ranglijsten voor de Kinder Typecursus
+
+Elke ranglijst is een geïndexeerde skiplist: invoegen, verwijderen en de
+rang van een leerling opzoeken kosten O(log n), de top N ophalen O(log n + N).
+Er hoeft dus nooit de hele klas gesorteerd te worden.
+"""
+
+import math
+import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+class _Infinity:
+    """Eindmarkering die groter is dan elke sleutel"""
+    
+    __slots__ = ()
+    
+    def __lt__(self, other):
+        return False
+        
+    def __le__(self, other):
+        return other is self
+        
+    def __gt__(self, other):
+        return other is not self
+        
+    def __ge__(self, other):
+        return True
+
+_END = _Infinity()
+
+class _Node:
+    """Knoop van de skiplist met per niveau de volgende knoop en de afstand ernaartoe"""
+    
+    __slots__ = ("key", "next", "width")
+    
+    def __init__(self, key, levels: int):
+        self.key = key
+        self.next: List['_Node'] = [None] * levels
+        self.width: List[int] = [1] * levels
+
+class RankedIndex:
+    """Gesorteerde verzameling sleutels met rang- en positie-opvraging in O(log n)"""
+    
+    MAX_LEVELS = 20
+    
+    def __init__(self, rng: Optional[random.Random] = None):
+        """Maak een lege index"""
+        self.size = 0
+        self.rng = rng or random.Random()
+        self.tail = _Node(_END, 0)
+        self.head = _Node(None, self.MAX_LEVELS)
+        self.head.next = [self.tail] * self.MAX_LEVELS
+        
+    @classmethod
+    def from_sorted(cls, keys: List, rng: Optional[random.Random] = None) -> 'RankedIndex':
+        """Bouw een index in O(n) uit al gesorteerde sleutels"""
+        index = cls(rng)
+        last = [index.head] * cls.MAX_LEVELS
+        last_position = [0] * cls.MAX_LEVELS
+        for position, key in enumerate(keys, 1):
+            # Vaste verdeling: elke 2^k-de knoop krijgt k + 1 niveaus
+            levels = min(cls.MAX_LEVELS, (position & -position).bit_length())
+            node = _Node(key, levels)
+            for level in range(levels):
+                previous = last[level]
+                previous.next[level] = node
+                previous.width[level] = position - last_position[level]
+                last[level] = node
+                last_position[level] = position
+        index.size = len(keys)
+        for level in range(cls.MAX_LEVELS):
+            last[level].next[level] = index.tail
+            last[level].width[level] = index.size + 1 - last_position[level]
+        return index
+        
+    def __len__(self) -> int:
+        return self.size
+        
+    def __iter__(self) -> Iterator:
+        node = self.head.next[0]
+        while node is not self.tail:
+            yield node.key
+            node = node.next[0]
+            
+    def _random_levels(self) -> int:
+        """Aantal niveaus voor een nieuwe knoop (geometrisch verdeeld)"""
+        return min(self.MAX_LEVELS, 1 - int(math.log(1.0 - self.rng.random(), 2.0)))
+        
+    def insert(self, key):
+        """Voeg een sleutel toe"""
+        chain = [None] * self.MAX_LEVELS
+        steps_at_level = [0] * self.MAX_LEVELS
+        node = self.head
+        for level in range(self.MAX_LEVELS - 1, -1, -1):
+            while node.next[level].key <= key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+            
+        levels = self._random_levels()
+        new_node = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            previous = chain[level]
+            new_node.next[level] = previous.next[level]
+            previous.next[level] = new_node
+            new_node.width[level] = previous.width[level] - steps
+            previous.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+        self.size += 1
+        
+    def remove(self, key):
+        """Verwijder een sleutel; KeyError als hij er niet in zit"""
+        chain = [None] * self.MAX_LEVELS
+        node = self.head
+        for level in range(self.MAX_LEVELS - 1, -1, -1):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+            
+        target = chain[0].next[0]
+        if target is self.tail or target.key != key:
+            raise KeyError(key)
+        for level in range(len(target.next)):
+            previous = chain[level]
+            previous.width[level] += target.width[level] - 1
+            previous.next[level] = target.next[level]
+        for level in range(len(target.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self.size -= 1
+        
+    def index(self, key) -> int:
+        """Positie (vanaf 0) van een sleutel; KeyError als hij er niet in zit"""
+        position = 0
+        node = self.head
+        for level in range(self.MAX_LEVELS - 1, -1, -1):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        if node.next[0] is self.tail or node.next[0].key != key:
+            raise KeyError(key)
+        return position
+        
+    def __getitem__(self, position: int):
+        """Sleutel op een positie (vanaf 0)"""
+        if not 0 <= position < self.size:
+            raise IndexError(position)
+        node = self.head
+        remaining = position + 1
+        for level in range(self.MAX_LEVELS - 1, -1, -1):
+            while node.width[level] <= remaining and node.next[level] is not self.tail:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node.key
+
+class Leaderboards:
+    """Ranglijsten per meetwaarde, voor de hele klas en per leeftijd"""
+    
+    METRICS = ("total_points", "typing_speed", "accuracy", "stars_earned")
+    
+    def __init__(self, rng: Optional[random.Random] = None):
+        """Maak lege ranglijsten"""
+        self.rng = rng or random.Random()
+        self.boards: Dict[Tuple[str, Optional[int]], RankedIndex] = {}
+        # Per leerling: (leeftijd, sleutel per meetwaarde) zoals die nu in de lijsten staat
+        self.entries: Dict[str, Tuple[int, Dict[str, Tuple]]] = {}
+        
+    def _board(self, metric: str, age: Optional[int]) -> RankedIndex:
+        """Haal een ranglijst op en maak hem zo nodig aan"""
+        board = self.boards.get((metric, age))
+        if board is None:
+            board = self.boards[(metric, age)] = RankedIndex(self.rng)
+        return board
+        
+    def update(self, name: str, age: int, values: Dict[str, float]):
+        """Werk de positie van één leerling bij (O(log n) per gewijzigde meetwaarde)"""
+        entry = self.entries.get(name)
+        old_age, old_keys = entry if entry else (None, {})
+        keys = {}
+        for metric in self.METRICS:
+            # Hoogste waarde eerst; bij gelijke stand op naam
+            key = (-values.get(metric, 0), name)
+            keys[metric] = key
+            old_key = old_keys.get(metric)
+            if old_key == key and old_age == age:
+                continue
+            if old_key is not None:
+                self.boards[(metric, None)].remove(old_key)
+                self.boards[(metric, old_age)].remove(old_key)
+            self._board(metric, None).insert(key)
+            self._board(metric, age).insert(key)
+        self.entries[name] = (age, keys)
+        
+    def remove(self, name: str):
+        """Haal een leerling uit alle ranglijsten"""
+        entry = self.entries.pop(name, None)
+        if entry is None:
+            return
+        age, keys = entry
+        for metric, key in keys.items():
+            self.boards[(metric, None)].remove(key)
+            self.boards[(metric, age)].remove(key)
+            
+    def load(self, summaries: Dict[str, Dict]):
+        """Bouw alle ranglijsten op uit de samenvattingen van de gebruikersindex"""
+        # Eén keer sorteren per lijst is veel sneller dan n keer invoegen
+        keys: Dict[Tuple[str, Optional[int]], List[Tuple]] = {}
+        entries = {}
+        for name, summary in summaries.items():
+            age = summary.get("age", 10)
+            user_keys = {}
+            for metric in self.METRICS:
+                key = (-summary.get(metric, 0), name)
+                user_keys[metric] = key
+                keys.setdefault((metric, None), []).append(key)
+                keys.setdefault((metric, age), []).append(key)
+            entries[name] = (age, user_keys)
+            
+        self.boards = {
+            board: RankedIndex.from_sorted(sorted(board_keys), self.rng)
+            for board, board_keys in keys.items()
+        }
+        self.entries = entries
+        
+    def top(self, metric: str, count: int = 10, age: Optional[int] = None) -> List[Tuple[str, float]]:
+        """De beste count leerlingen als (naam, waarde)"""
+        if metric not in self.METRICS:
+            raise ValueError(f"Onbekende ranglijst '{metric}'")
+        board = self.boards.get((metric, age))
+        result = []
+        if board is None:
+            return result
+        for negative_value, name in board:
+            if len(result) >= count:
+                break
+            result.append((name, -negative_value))
+        return result
+        
+    def rank(self, metric: str, name: str, age: Optional[int] = None) -> Optional[int]:
+        """Plaats (vanaf 1) van een leerling, of None als hij niet in de lijst staat"""
+        if metric not in self.METRICS:
+            raise ValueError(f"Onbekende ranglijst '{metric}'")
+        entry = self.entries.get(name)
+        if entry is None or (age is not None and entry[0] != age):
+            return None
+        return self.boards[(metric, age)].index(entry[1][metric]) + 1
+        
+    def size(self, metric: str = METRICS[0], age: Optional[int] = None) -> int:
+        """Aantal leerlingen in een ranglijst"""
+        board = self.boards.get((metric, age))
+        return len(board) if board is not None else 0
\ No newline at end of file
@@ -4,30 +4,111 @@
 Lesmanager voor de Kinder Typecursus
 """
 
-import json
 import os
-from typing import Dict, List, Optional, Tuple
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import random
+from bisect import bisect_right, insort
+
+from .content_pool import ContentPool
+from .drill_index import DrillIndex
+from .lesson_pack import LessonPack
+from .word_corpus import WordCorpus, build_corpus
+from .word_index import WordIndex
+from ..utils.persistence import get_scheduler
 
 class Lesson:
     """Klasse voor een typecursus les"""
     
+    # Inhoud wordt compact opgeslagen: teksten in een lijst en
+    # moeilijkheidsgraden in een byte-array in plaats van losse dicts.
+    # Bij lessen uit een lespakket wordt de inhoud pas bij eerste gebruik gelezen.
+    # Alleen texts, difficulties en content (een les openen, bewerken of opslaan)
+    # houden die inhoud daarna vast; iter_content leest een niet-geladen les
+    # zonder haar te bewaren, zodat pools en indexen over de hele bibliotheek
+    # niet alle inhoud in het geheugen trekken.
+    __slots__ = (
+        "lesson_id", "title", "level", "lesson_type", "sequence",
+        "_texts", "_difficulties", "content_source",
+        "instructions", "target_speed", "target_accuracy"
+    )
+    
     def __init__(self, lesson_id: str, title: str, level: int, lesson_type: str):
-        self.lesson_id = lesson_id
+        self.lesson_id = sys.intern(lesson_id)
+        self.sequence = self.parse_sequence(lesson_id)
         self.title = title
         self.level = level
-        self.lesson_type = lesson_type  # 'letters', 'words', 'sentences'
-        self.content = []
+        self.lesson_type = sys.intern(lesson_type)  # 'letters', 'words', 'sentences'
+        self._texts: Optional[List[str]] = []
+        self._difficulties = array('B')
+        self.content_source = None
         self.instructions = ""
         self.target_speed = 0
         self.target_accuracy = 0
         
+    @staticmethod
+    def parse_sequence(lesson_id: str) -> int:
+        """Volgnummer uit een les-ID zoals 'L3' of 'W12' (0 als er geen is)"""
+        digits = lesson_id[1:]
+        return int(digits) if digits.isdigit() else 0
+        
+    @property
+    def content_loaded(self) -> bool:
+        """Of de inhoud van de les al in het geheugen staat"""
+        return self._texts is not None
+        
+    def load_content(self):
+        """Lees de inhoud uit het lespakket (eenmalig)"""
+        items = self.content_source.read_content(self.lesson_id)
+        self.content = items
+        
+    @property
+    def texts(self) -> List[str]:
+        """Teksten van de les"""
+        if self._texts is None:
+            self.load_content()
+        return self._texts
+        
+    @property
+    def difficulties(self) -> array:
+        """Moeilijkheidsgraden van de les, in dezelfde volgorde als texts"""
+        if self._texts is None:
+            self.load_content()
+        return self._difficulties
+        
+    @property
+    def content(self) -> List[Dict]:
+        """Inhoud als lijst van {"text", "difficulty"} dicts"""
+        return [
+            {"text": text, "difficulty": difficulty}
+            for text, difficulty in zip(self.texts, self.difficulties)
+        ]
+        
+    @content.setter
+    def content(self, items: List[Dict]):
+        """Vervang de inhoud door een lijst van {"text", "difficulty"} dicts"""
+        self._texts = []
+        self._difficulties = array('B')
+        for item in items:
+            self.add_content(item["text"], item.get("difficulty", 1))
+            
+    def iter_content(self) -> Iterator[Tuple[str, int]]:
+        """Loop over (tekst, moeilijkheidsgraad) zonder dicts te maken (laadt de les niet)"""
+        if self._texts is None:
+            return ((sys.intern(item["text"]), self.clamp_difficulty(item.get("difficulty", 1)))
+                    for item in self.content_source.read_content(self.lesson_id))
+        return zip(self._texts, self._difficulties)
+        
+    @staticmethod
+    def clamp_difficulty(difficulty) -> int:
+        """Moeilijkheidsgraad als byte (0-255)"""
+        return max(0, min(int(difficulty), 255))
+        
     def add_content(self, text: str, difficulty: int = 1):
         """Voeg inhoud toe aan de les"""
-        self.content.append({
-            "text": text,
-            "difficulty": difficulty
-        })
+        self.texts.append(sys.intern(text))
+        self.difficulties.append(self.clamp_difficulty(difficulty))
         
     def set_instructions(self, instructions: str):
         """Stel instructies in voor de les"""
@@ -38,6 +119,18 @@ class Lesson:
         self.target_speed = speed
         self.target_accuracy = accuracy
         
+    def to_header(self) -> Dict:
+        """Kopgegevens van de les, zonder inhoud"""
+        return {
+            "lesson_id": self.lesson_id,
+            "title": self.title,
+            "level": self.level,
+            "lesson_type": self.lesson_type,
+            "instructions": self.instructions,
+            "target_speed": self.target_speed,
+            "target_accuracy": self.target_accuracy
+        }
+        
     def to_dict(self) -> Dict:
         """Converteer les naar dictionary"""
         return {
@@ -65,14 +158,60 @@ class Lesson:
         lesson.target_speed = data.get("target_speed", 0)
         lesson.target_accuracy = data.get("target_accuracy", 0)
         return lesson
+        
+    @classmethod
+    def from_header(cls, header: Dict, content_source) -> 'Lesson':
+        """Maak les aan uit kopgegevens; de inhoud wordt later uit content_source gelezen"""
+        lesson = cls(
+            header["lesson_id"],
+            header["title"],
+            header["level"],
+            header["lesson_type"]
+        )
+        lesson._texts = None
+        lesson._difficulties = None
+        lesson.content_source = content_source
+        lesson.instructions = header.get("instructions") or ""
+        lesson.target_speed = header.get("target_speed") or 0
+        lesson.target_accuracy = header.get("target_accuracy") or 0
+        return lesson
 
 class LessonManager:
     """Manager voor alle lessen van de typecursus"""
     
-    def __init__(self):
+    # Config-sleutel met de sessiegrootte per lestype
+    SESSION_SIZE_KEYS = {
+        "letters": "lessons.letters_per_lesson",
+        "words": "lessons.words_per_lesson",
+        "sentences": "lessons.sentences_per_lesson"
+    }
+    
+    def __init__(self, lessons_file: str = "lessons.json", config=None, scheduler=None):
         """Initialiseer de lesmanager"""
-        self.lessons_file = "lessons.json"
+        self.lessons_file = lessons_file
+        self.scheduler = scheduler or get_scheduler()
+        self.lesson_pack = LessonPack(lessons_file)
+        self.config = config
         self.lessons: Dict[str, Lesson] = {}
+        
+        # Secundaire indexen, bijgewerkt bij elke toevoeging via add_lesson
+        self.lessons_by_level: Dict[int, List[Lesson]] = {}
+        self.lessons_by_type: Dict[str, List[Lesson]] = {}
+        self.level_sequence: Dict[int, List[Tuple[int, str]]] = {}
+        
+        # Voorberekende oefenpools per (lestype, moeilijkheidsgraad), lui opgebouwd
+        self.content_pools: Dict[Tuple[str, Optional[int]], ContentPool] = {}
+        self.lesson_content_cache: Dict[Tuple[str, int], List[List[str]]] = {}
+        
+        # Woordindex voor oefeningen met alleen bepaalde letters, lui opgebouwd
+        self.word_index: Optional[WordIndex] = None
+        self.word_index_from_lessons = False
+        # Omgekeerde index van toets naar oefenitems voor adaptieve oefeningen, lui opgebouwd
+        self.drill_index: Optional[DrillIndex] = None
+        
+        # Verhoogd bij elke wijziging van de lessenlijst (schermen bouwen dan opnieuw op)
+        self.revision = 0
+        
         self.lesson_categories = {
             "letters": "Losse Letters",
             "words": "Woorden",
@@ -84,25 +223,42 @@ class LessonManager:
             self.create_default_lessons()
             
     def load_lessons(self):
-        """Laad alle lessen uit bestand"""
+        """Laad de kopgegevens van alle lessen; de inhoud volgt bij eerste gebruik"""
         try:
             if os.path.exists(self.lessons_file):
-                with open(self.lessons_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for lesson_data in data.values():
-                        lesson = Lesson.from_dict(lesson_data)
-                        self.lessons[lesson.lesson_id] = lesson
+                for header in self.lesson_pack.read_headers():
+                    self.add_lesson(Lesson.from_header(header, self.lesson_pack))
         except Exception as e:
             print(f"Fout bij laden lessen: {e}")
             
+    def add_lesson(self, lesson: Lesson):
+        """Voeg een les toe en werk de indexen bij"""
+        if lesson.lesson_id in self.lessons:
+            self._unindex_lesson(self.lessons[lesson.lesson_id])
+            
+        self.lessons[lesson.lesson_id] = lesson
+        self.content_pools.clear()
+        self.lesson_content_cache.clear()
+        self.drill_index = None
+        if self.word_index_from_lessons:
+            self.word_index = None
+        self.revision += 1
+        self.lessons_by_level.setdefault(lesson.level, []).append(lesson)
+        self.lessons_by_type.setdefault(lesson.lesson_type, []).append(lesson)
+        insort(self.level_sequence.setdefault(lesson.level, []),
+               (lesson.sequence, lesson.lesson_id))
+        
+    def _unindex_lesson(self, lesson: Lesson):
+        """Haal een les uit de indexen (bij vervangen)"""
+        self.lessons_by_level[lesson.level].remove(lesson)
+        self.lessons_by_type[lesson.lesson_type].remove(lesson)
+        self.level_sequence[lesson.level].remove((lesson.sequence, lesson.lesson_id))
+            
     def save_lessons(self):
-        """Sla alle lessen op in bestand"""
-        try:
-            data = {lid: lesson.to_dict() for lid, lesson in self.lessons.items()}
-            with open(self.lessons_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Fout bij opslaan lessen: {e}")
+        """Sla alle lessen op de achtergrond op in bestand"""
+        lessons = list(self.lessons.values())
+        self.scheduler.mark_dirty(("lessons", self.lessons_file),
+                                  lambda: self.lesson_pack.write(lessons))
             
     def create_default_lessons(self):
         """Maak standaard lessen aan"""
@@ -112,21 +268,21 @@ class LessonManager:
         lesson1.add_content("A", 1)
         lesson1.add_content("a", 1)
         lesson1.set_targets(5, 90)
-        self.lessons["L1"] = lesson1
+        self.add_lesson(lesson1)
         
         lesson2 = Lesson("L2", "De Letter E", 1, "letters")
         lesson2.set_instructions("Type de letter E zo vaak als je kunt!")
         lesson2.add_content("E", 1)
         lesson2.add_content("e", 1)
         lesson2.set_targets(5, 90)
-        self.lessons["L2"] = lesson2
+        self.add_lesson(lesson2)
         
         lesson3 = Lesson("L3", "De Letter I", 1, "letters")
         lesson3.set_instructions("Type de letter I zo vaak als je kunt!")
         lesson3.add_content("I", 1)
         lesson3.add_content("i", 1)
         lesson3.set_targets(5, 90)
-        self.lessons["L3"] = lesson3
+        self.add_lesson(lesson3)
         
         # Niveau 2: Eenvoudige woorden
         lesson4 = Lesson("W1", "Eenvoudige Woorden", 2, "words")
@@ -137,7 +293,7 @@ class LessonManager:
         lesson4.add_content("boom", 1)
         lesson4.add_content("zon", 1)
         lesson4.set_targets(10, 85)
-        self.lessons["W1"] = lesson4
+        self.add_lesson(lesson4)
         
         lesson5 = Lesson("W2", "Dieren Woorden", 2, "words")
         lesson5.set_instructions("Type de namen van deze dieren!")
@@ -147,7 +303,7 @@ class LessonManager:
         lesson5.add_content("varken", 2)
         lesson5.add_content("schaap", 2)
         lesson5.set_targets(12, 85)
-        self.lessons["W2"] = lesson5
+        self.add_lesson(lesson5)
         
         # Niveau 3: Korte zinnen
         lesson6 = Lesson("Z1", "Korte Zinnen", 3, "sentences")
@@ -156,7 +312,7 @@ class LessonManager:
         lesson6.add_content("De kat is zwart.", 2)
         lesson6.add_content("Ik hou van spelen.", 2)
         lesson6.set_targets(15, 80)
-        self.lessons["Z1"] = lesson6
+        self.add_lesson(lesson6)
         
         lesson7 = Lesson("Z2", "Dierenzinnen", 3, "sentences")
         lesson7.set_instructions("Type zinnen over dieren!")
@@ -164,7 +320,7 @@ class LessonManager:
         lesson7.add_content("De koe geeft melk.", 2)
         lesson7.add_content("De vogel zingt mooi.", 3)
         lesson7.set_targets(18, 80)
-        self.lessons["Z2"] = lesson7
+        self.add_lesson(lesson7)
         
         self.save_lessons()
         
@@ -174,25 +330,32 @@ class LessonManager:
         
     def get_lessons_by_level(self, level: int) -> List[Lesson]:
         """Haal alle lessen op voor een bepaald niveau"""
-        return [lesson for lesson in self.lessons.values() if lesson.level == level]
+        return list(self.lessons_by_level.get(level, ()))
+        
+    def get_levels(self) -> List[int]:
+        """Alle niveaus met lessen, oplopend"""
+        return sorted(self.lessons_by_level)
+        
+    def get_lessons_in_order(self, level: int) -> List[Lesson]:
+        """Lessen van een niveau in volgorde van hun volgnummer"""
+        return [self.lessons[lesson_id] for _, lesson_id in self.level_sequence.get(level, ())]
         
     def get_lessons_by_type(self, lesson_type: str) -> List[Lesson]:
         """Haal alle lessen op van een bepaald type"""
-        return [lesson for lesson in self.lessons.values() if lesson.lesson_type == lesson_type]
+        return list(self.lessons_by_type.get(lesson_type, ()))
         
     def get_next_lesson(self, current_level: int, current_lesson: int) -> Optional[Lesson]:
         """Haal de volgende les op"""
-        available_lessons = [l for l in self.lessons.values() 
-                           if l.level == current_level and 
-                           int(l.lesson_id[1:]) > current_lesson]
-        
-        if available_lessons:
-            return min(available_lessons, key=lambda x: int(x.lesson_id[1:]))
+        sequence = self.level_sequence.get(current_level, [])
+        # Eerste les in dit niveau met een hoger volgnummer (binair zoeken)
+        index = bisect_right(sequence, (current_lesson, "\uffff"))
+        if index < len(sequence):
+            return self.lessons[sequence[index][1]]
             
         # Check voor volgende niveau
-        next_level_lessons = [l for l in self.lessons.values() if l.level == current_level + 1]
-        if next_level_lessons:
-            return min(next_level_lessons, key=lambda x: int(x.lesson_id[1:]))
+        next_sequence = self.level_sequence.get(current_level + 1)
+        if next_sequence:
+            return self.lessons[next_sequence[0][1]]
             
         return None
         
@@ -200,9 +363,9 @@ class LessonManager:
         """Haal voortgang van lessen op voor een gebruiker"""
         progress = {
             "current_level": user_level,
-            "lessons_in_level": len(self.get_lessons_by_level(user_level)),
+            "lessons_in_level": len(self.lessons_by_level.get(user_level, ())),
             "next_level": user_level + 1,
-            "lessons_in_next_level": len(self.get_lessons_by_level(user_level + 1))
+            "lessons_in_next_level": len(self.lessons_by_level.get(user_level + 1, ()))
         }
         return progress
         
@@ -218,21 +381,153 @@ class LessonManager:
         lesson.set_instructions(instructions)
         lesson.set_targets(10, 85)
         
-        self.lessons[lesson_id] = lesson
+        self.add_lesson(lesson)
         self.save_lessons()
         
         return lesson
         
     def get_random_content(self, lesson_type: str, difficulty: int = 1) -> List[str]:
         """Haal willekeurige inhoud op van een bepaald type en moeilijkheidsgraad"""
-        available_lessons = [l for l in self.lessons.values() 
-                           if l.lesson_type == lesson_type]
-        
-        if not available_lessons:
+        key = (lesson_type, difficulty)
+        per_lesson = self.lesson_content_cache.get(key)
+        if per_lesson is None:
+            per_lesson = []
+            for lesson in self.lessons_by_type.get(lesson_type, ()):
+                items = list(lesson.iter_content())
+                content = [text for text, item_difficulty in items 
+                          if item_difficulty <= difficulty]
+                per_lesson.append(content if content else [text for text, _ in items])
+            self.lesson_content_cache[key] = per_lesson
+            
+        if not per_lesson:
             return []
             
-        lesson = random.choice(available_lessons)
-        content = [item["text"] for item in lesson.content 
-                  if item["difficulty"] <= difficulty]
+        return list(random.choice(per_lesson))
         
-        return content if content else [item["text"] for item in lesson.content]
\ No newline at end of file
+    def get_content_pool(self, lesson_type: str, difficulty: Optional[int] = 1) -> ContentPool:
+        """Haal de oefenpool op met alle items van dit type tot deze moeilijkheidsgraad (None: alle)"""
+        key = (lesson_type, difficulty)
+        pool = self.content_pools.get(key)
+        if pool is None:
+            texts = []
+            weights = []
+            for lesson in self.lessons_by_type.get(lesson_type, ()):
+                for text, item_difficulty in lesson.iter_content():
+                    if difficulty is None or item_difficulty <= difficulty:
+                        texts.append(text)
+                        # Items op het eigen niveau komen vaker voor dan makkelijkere
+                        weights.append(max(item_difficulty, 1))
+            pool = ContentPool(texts, weights)
+            self.content_pools[key] = pool
+        return pool
+        
+    def get_session_size(self, lesson_type: str) -> int:
+        """Aantal items per oefensessie volgens de configuratie"""
+        defaults = {"letters": 5, "words": 10, "sentences": 3}
+        default = defaults.get(lesson_type, 10)
+        key = self.SESSION_SIZE_KEYS.get(lesson_type)
+        if self.config is None or key is None:
+            return default
+        return self.config.get(key, default)
+        
+    def generate_session(self, lesson_type: str, difficulty: int = 1,
+                         count: Optional[int] = None, rng: random.Random = None) -> List[str]:
+        """Trek een complete oefensessie zonder herhalingen"""
+        if count is None:
+            count = self.get_session_size(lesson_type)
+        return self.get_content_pool(lesson_type, difficulty).sample(count, rng)
+        
+    def generate_sessions(self, lesson_type: str, pupils: int, difficulty: int = 1,
+                          rng: random.Random = None) -> List[List[str]]:
+        """Trek in één keer een oefensessie voor elke leerling van een klas"""
+        pool = self.get_content_pool(lesson_type, difficulty)
+        count = self.get_session_size(lesson_type)
+        return [pool.sample(count, rng) for _ in range(pupils)]
+        
+    def open_word_corpus(self) -> Optional[WordCorpus]:
+        """Open de woordenlijst uit de configuratie als corpus; voorbewerken gebeurt eenmalig"""
+        path = self.config.get("lessons.word_list", "") if self.config is not None else ""
+        if not path:
+            return None
+        # woorden.txt wordt woorden.corpus; een .corpus kan ook direct opgegeven worden
+        corpus_file = os.path.splitext(path)[0] + ".corpus"
+        try:
+            if os.path.exists(path) and (not os.path.exists(corpus_file)
+                                         or os.path.getmtime(corpus_file) < os.path.getmtime(path)):
+                with open(path, 'r', encoding='utf-8') as f:
+                    build_corpus(f, corpus_file)
+            if os.path.exists(corpus_file):
+                return WordCorpus(corpus_file)
+        except Exception as e:
+            print(f"Fout bij laden woordenlijst: {e}")
+        return None
+        
+    def iter_words(self) -> Iterator[str]:
+        """Alle losse woorden uit de woord- en zinslessen"""
+        for lesson_type in ("words", "sentences"):
+            for lesson in self.lessons_by_type.get(lesson_type, ()):
+                for text, _ in lesson.iter_content():
+                    for word in text.split():
+                        yield word.strip(".,!?;:\"'()")
+                        
+    def get_word_index(self) -> WordIndex:
+        """Woordindex op lengte en letters (bij eerste gebruik opgebouwd)"""
+        if self.word_index is None:
+            corpus = self.open_word_corpus()
+            # Alleen een index uit de lessen moet opnieuw als er lessen bijkomen
+            self.word_index_from_lessons = corpus is None
+            self.word_index = corpus or WordIndex(self.iter_words())
+        return self.word_index
+        
+    def get_unlocked_letters(self, level: int) -> Set[str]:
+        """Letters die een leerling op dit niveau al in de letterlessen geoefend heeft"""
+        letters: Set[str] = set()
+        for lesson in self.lessons_by_type.get("letters", ()):
+            if lesson.level <= level:
+                letters |= WordIndex.letters_in(text for text, _ in lesson.iter_content())
+        return letters
+        
+    def generate_word_drill(self, letters: Iterable[str], count: Optional[int] = None,
+                            min_length: int = 3, max_length: int = 6,
+                            rng: random.Random = None) -> List[str]:
+        """Trek woorden die alleen uit deze letters bestaan (bijvoorbeeld get_unlocked_letters)"""
+        if count is None:
+            count = self.get_session_size("words")
+        return self.get_word_index().sample(letters, count, min_length, max_length, rng)
+        
+    def get_drill_index(self) -> DrillIndex:
+        """Index van toets en lettercombinatie naar oefenitems (bij eerste gebruik opgebouwd)"""
+        if self.drill_index is None:
+            self.drill_index = DrillIndex(
+                (text, lesson.lesson_type, difficulty)
+                for lesson in self.lessons.values()
+                for text, difficulty in lesson.iter_content()
+            )
+        return self.drill_index
+        
+    def generate_adaptive_session(self, key_stats, lesson_type: str = "words",
+                                  difficulty: Optional[int] = None, count: Optional[int] = None,
+                                  weak_share: float = 0.7, rng: random.Random = None) -> List[str]:
+        """Oefensessie waarin items met de zwakke toetsen van de leerling vaker voorkomen"""
+        rng = rng or random
+        if count is None:
+            count = self.get_session_size(lesson_type)
+            
+        chosen: List[str] = []
+        targets = key_stats.weak_targets()
+        if targets:
+            index = self.get_drill_index()
+            scores = index.score(targets, lesson_type, difficulty)
+            items = list(scores)
+            pool = ContentPool([index.texts[item] for item in items],
+                               [scores[item] for item in items])
+            chosen = pool.sample(max(1, round(count * weak_share)), rng)
+            
+        # Aanvullen met gewone inhoud voor afwisseling (of alles, zonder statistieken)
+        if len(chosen) < count:
+            taken = set(chosen)
+            # Zonder opgegeven moeilijkheidsgraad: de (gecachete) pool met alle items van dit type
+            regular = self.get_content_pool(lesson_type, difficulty).sample(count, rng)
+            chosen.extend([text for text in regular if text not in taken][:count - len(chosen)])
+            rng.shuffle(chosen)
+        return chosen
\ No newline at end of file
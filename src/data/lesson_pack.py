@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lespakketten voor de Kinder Typecursus
+
+Een lespakket is het gewone lessons.json. Naast het bestand staat een
+kleine index met per les de kopgegevens (id, titel, niveau, type, doelen)
+en de bytepositie van de les in het pakket. Bij het opstarten wordt alleen
+die index gelezen; de inhoud van een les wordt pas gelezen als de les
+voor het eerst geopend wordt.
+"""
+
+import codecs
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..utils.persistence import atomic_write_bytes
+
+HEADER_FIELDS = (
+    "lesson_id", "title", "level", "lesson_type",
+    "instructions", "target_speed", "target_accuracy"
+)
+
+INDEX_VERSION = 1
+
+class _PackScanner:
+    """Leest een lespakket stukje voor stukje en houdt byteposities bij"""
+    
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+    
+    def __init__(self, f, chunk_size: int = 1 << 20):
+        self.file = f
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        # buffer[mark] staat op byte mark_offset; alleen het stuk daarna wordt nog geteld
+        self.mark = 0
+        self.mark_offset = 0
+        self.pos = 0
+        self.eof = False
+        
+    def fill(self, size: int) -> bool:
+        """Lees meer tekst in de buffer; False aan het einde van het bestand"""
+        if self.eof:
+            return False
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            self.buffer += self.decoder.decode(b"", final=True)
+            return False
+        self.buffer += self.decoder.decode(chunk)
+        return True
+        
+    def compact(self):
+        """Gooi het gelezen deel weg zodra dat minstens de helft van de buffer is"""
+        # Niet bij elke les: inkorten kopieert de hele rest van de buffer
+        if self.pos and self.pos * 2 >= len(self.buffer):
+            self.byte_position()
+            self.buffer = self.buffer[self.pos:]
+            self.mark = 0
+            self.pos = 0
+            
+    def byte_position(self) -> int:
+        """Byteoffset van de huidige positie in het bestand"""
+        # Elk teken wordt maar één keer geteld: alleen het stuk sinds de vorige aanroep
+        if self.pos > self.mark:
+            self.mark_offset += len(self.buffer[self.mark:self.pos].encode('utf-8'))
+            self.mark = self.pos
+        return self.mark_offset
+        
+    def peek(self) -> str:
+        """Sla witruimte over en geef het volgende teken ('' aan het einde)"""
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            self.compact()
+            if not self.fill(self.chunk_size):
+                return ""
+                
+    def expect(self, char: str):
+        """Controleer en sla een verwacht scheidingsteken over"""
+        if self.peek() != char:
+            raise ValueError(f"Ongeldig lespakket: '{char}' verwacht bij byte {self.byte_position()}")
+        self.pos += 1
+        
+    def decode_value(self):
+        """Decodeer één JSON-waarde (string of object) vanaf de huidige positie"""
+        if self.peek() not in ('"', '{'):
+            raise ValueError(f"Ongeldig lespakket bij byte {self.byte_position()}")
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.pos)
+                self.pos = end
+                return value
+            except json.JSONDecodeError:
+                # Waarde nog niet volledig in de buffer: lees (steeds grotere) stukken bij
+                if not self.fill(size):
+                    raise
+                size *= 2
+
+def scan_pack(path: str) -> Iterator[Tuple[Dict, int, int]]:
+    """Loop over een lespakket en geef (kopgegevens, offset, lengte) per les"""
+    with open(path, 'rb') as f:
+        scanner = _PackScanner(f)
+        scanner.expect('{')
+        if scanner.peek() == '}':
+            return
+        while True:
+            scanner.decode_value()  # sleutel
+            scanner.expect(':')
+            scanner.peek()
+            start = scanner.byte_position()
+            lesson_data = scanner.decode_value()
+            end = scanner.byte_position()
+            
+            header = {field: lesson_data.get(field) for field in HEADER_FIELDS}
+            # Alleen de kopgegevens bewaren; de inhoud mag meteen weg
+            del lesson_data
+            yield header, start, end - start
+            
+            scanner.compact()
+            if scanner.peek() == ',':
+                scanner.pos += 1
+                continue
+            scanner.expect('}')
+            return
+
+class LessonPack:
+    """Lespakket op schijf met een index van kopgegevens en byteposities"""
+    
+    def __init__(self, path: str):
+        """Koppel aan een lespakket (het bestand hoeft nog niet te bestaan)"""
+        self.path = path
+        self.index_file = os.path.splitext(path)[0] + ".index.json"
+        self.entries: Dict[str, Tuple[int, int]] = {}
+        # Kopgegevens zoals ze nu in het pakket staan
+        self.headers: Dict[str, Dict] = {}
+        # Beschermt entries, headers en het bestand tijdens vervangen door de opslagthread
+        self.lock = threading.RLock()
+        
+    def _file_signature(self) -> List[int]:
+        """Grootte en wijzigingstijd van het pakket, om de index te valideren"""
+        stat = os.stat(self.path)
+        return [stat.st_size, stat.st_mtime_ns]
+        
+    def read_headers(self) -> List[Dict]:
+        """Lees de kopgegevens van alle lessen (uit de index als die klopt)"""
+        headers = self._read_index()
+        if headers is None:
+            headers = []
+            self.entries = {}
+            for header, offset, length in scan_pack(self.path):
+                headers.append(header)
+                self.entries[header["lesson_id"]] = (offset, length)
+            self._write_index(headers)
+        self.headers = {header["lesson_id"]: header for header in headers}
+        return headers
+        
+    def _read_index(self) -> Optional[List[Dict]]:
+        """Lees de index; None als die ontbreekt of niet bij het pakket hoort"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("version") != INDEX_VERSION or index.get("signature") != self._file_signature():
+                return None
+        except (OSError, ValueError):
+            return None
+            
+        headers = []
+        self.entries = {}
+        for row in index["lessons"]:
+            header = dict(zip(HEADER_FIELDS, row[:len(HEADER_FIELDS)]))
+            headers.append(header)
+            self.entries[header["lesson_id"]] = (row[-2], row[-1])
+        return headers
+        
+    def _write_index(self, headers: Iterable[Dict]):
+        """Schrijf de index naast het pakket"""
+        rows = []
+        for header in headers:
+            offset, length = self.entries[header["lesson_id"]]
+            rows.append([header.get(field) for field in HEADER_FIELDS] + [offset, length])
+        index = {
+            "version": INDEX_VERSION,
+            "signature": self._file_signature(),
+            "lessons": rows
+        }
+        try:
+            text = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+            atomic_write_bytes(self.index_file, text.encode('utf-8'))
+        except OSError as e:
+            print(f"Fout bij opslaan lesindex: {e}")
+            
+    def read_raw(self, lesson_id: str) -> bytes:
+        """Lees de ruwe JSON-bytes van één les"""
+        with self.lock:
+            offset, length = self.entries[lesson_id]
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                return f.read(length)
+            
+    def read_content(self, lesson_id: str) -> List[Dict]:
+        """Lees de inhoud van één les"""
+        return json.loads(self.read_raw(lesson_id).decode('utf-8')).get("content", [])
+        
+    def write(self, lessons: Iterable):
+        """Schrijf alle lessen naar het pakket en werk de index bij"""
+        temp_path = self.path + ".tmp"
+        entries: Dict[str, Tuple[int, int]] = {}
+        headers = []
+        with open(temp_path, 'wb') as f:
+            f.write(b"{")
+            for number, lesson in enumerate(lessons):
+                header = lesson.to_header()
+                if lesson.content_loaded or lesson.lesson_id not in self.entries:
+                    data = lesson.to_dict()
+                elif self.headers.get(lesson.lesson_id) == header:
+                    # Niet-geladen en ongewijzigd: de ruwe bytes uit het oude pakket overnemen
+                    data = None
+                else:
+                    # Kopgegevens gewijzigd: opnieuw schrijven, met de inhoud uit het oude pakket
+                    data = dict(header, content=self.read_content(lesson.lesson_id))
+                if data is None:
+                    raw = self.read_raw(lesson.lesson_id)
+                else:
+                    raw = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+                key = json.dumps(lesson.lesson_id, ensure_ascii=False).encode('utf-8')
+                f.write(b"," if number else b"")
+                f.write(b"\n  " + key + b": ")
+                entries[lesson.lesson_id] = (f.tell(), len(raw))
+                f.write(raw)
+                headers.append(header)
+            f.write(b"\n}")
+            f.flush()
+            os.fsync(f.fileno())
+            
+        with self.lock:
+            os.replace(temp_path, self.path)
+            self.entries = entries
+            self.headers = {header["lesson_id"]: header for header in headers}
+            self._write_index(headers)
\ No newline at end of file
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lopende statistieken voor de Kinder Typecursus
+"""
+
+import math
+from typing import Dict
+
+class RunningStats:
+    """Gemiddelde, variantie, EWMA en histogram, bijgewerkt in O(1) per waarde"""
+    
+    __slots__ = ("count", "mean", "m2", "ewma", "alpha", "bin_width", "bin_count", "bins")
+    
+    def __init__(self, bin_width: float = 1.0, bin_count: int = 100, alpha: float = 0.3):
+        """Waarden boven bin_width * bin_count vallen in het laatste vak"""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.ewma = 0.0
+        self.alpha = alpha
+        self.bin_width = bin_width
+        self.bin_count = bin_count
+        # Alleen gevulde vakken: {vaknummer: aantal}, nooit meer dan bin_count sleutels
+        self.bins: Dict[int, int] = {}
+        
+    def add(self, value: float):
+        """Voeg één waarde toe (Welford voor gemiddelde en variantie)"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.ewma = value if self.count == 1 else self.alpha * value + (1 - self.alpha) * self.ewma
+        
+        index = min(int(value / self.bin_width) if value > 0 else 0, self.bin_count - 1)
+        self.bins[index] = self.bins.get(index, 0) + 1
+        
+    @property
+    def variance(self) -> float:
+        """Steekproefvariantie"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        
+    @property
+    def stddev(self) -> float:
+        """Standaardafwijking"""
+        return math.sqrt(self.variance)
+        
+    def percentile(self, p: float) -> float:
+        """Benaderd percentiel (0-100) uit het histogram, lineair binnen een vak"""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for index in sorted(self.bins):
+            count = self.bins[index]
+            if seen + count >= rank:
+                fraction = (rank - seen) / count
+                return (index + fraction) * self.bin_width
+            seen += count
+        return self.bin_count * self.bin_width
+        
+    @property
+    def median(self) -> float:
+        """Benaderde mediaan"""
+        return self.percentile(50)
+        
+    def to_dict(self) -> Dict:
+        """Compacte vorm voor opslag: alleen gevulde histogramvakken"""
+        return {
+            "n": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "ewma": self.ewma,
+            "hist": sorted([index, count] for index, count in self.bins.items())
+        }
+        
+    @classmethod
+    def from_dict(cls, data: Dict, bin_width: float = 1.0, bin_count: int = 100,
+                  alpha: float = 0.3) -> 'RunningStats':
+        """Maak statistieken aan uit de opgeslagen vorm"""
+        stats = cls(bin_width, bin_count, alpha)
+        stats.count = data.get("n", 0)
+        stats.mean = data.get("mean", 0.0)
+        stats.m2 = data.get("m2", 0.0)
+        stats.ewma = data.get("ewma", 0.0)
+        for index, count in data.get("hist", []):
+            index = min(index, bin_count - 1)
+            stats.bins[index] = stats.bins.get(index, 0) + count
+        return stats
\ No newline at end of file
@@ -4,16 +4,39 @@
 Gebruikersmanager voor de Kinder Typecursus
 """
 
-import json
-import os
-from typing import Dict, List, Optional
+import sys
+import threading
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, date
 
+from .key_stats import KeyStats
+from .leaderboard import Leaderboards
+from .stats import RunningStats
+from .user_store import open_user_store
+from ..utils.persistence import get_scheduler
+
 class User:
     """Klasse voor een gebruiker van de typecursus"""
     
+    # Geen __dict__ per gebruiker: scheelt veel geheugen bij grote klassenlijsten
+    __slots__ = (
+        "name", "age", "created_date", "last_login",
+        "current_level", "current_lesson", "total_points", "lessons_completed",
+        "typing_speed", "accuracy", "total_words_typed", "total_errors",
+        "stars_earned", "badges", "games_unlocked", "lesson_results",
+        "_speed_stats", "_accuracy_stats", "_key_stats", "observer"
+    )
+    
+    # Gedeeld door alle gebruikers (geen slot per gebruiker): een les afronden op de
+    # Tk-thread en to_dict op de opslagthread lopen zo nooit door elkaar
+    lock = threading.RLock()
+    
+    # Histogrammen: snelheid in vakken van 1 WPM tot 150, nauwkeurigheid per procent
+    SPEED_BINS = (1.0, 150)
+    ACCURACY_BINS = (1.0, 101)
+    
     def __init__(self, name: str, age: int = 10):
-        self.name = name
+        self.name = sys.intern(name)
         self.age = age
         self.created_date = datetime.now().isoformat()
         self.last_login = datetime.now().isoformat()
@@ -38,26 +61,66 @@ class User:
         # Lesresultaten
         self.lesson_results = {}
         
+        # Verdeling van snelheid en nauwkeurigheid over alle lessen, pas bij eerste gebruik
+        self._speed_stats: Optional[RunningStats] = None
+        self._accuracy_stats: Optional[RunningStats] = None
+        
+        # Fouten en reactietijd per toets en lettercombinatie, voor adaptieve oefeningen (lui)
+        self._key_stats: Optional[KeyStats] = None
+        
+        # Krijgt user_changed(user) na elke wijziging van de ranglijstwaarden (de UserManager)
+        self.observer = None
+        
+    @property
+    def speed_stats(self) -> RunningStats:
+        """Verdeling van de snelheid (aangemaakt bij eerste gebruik)"""
+        if self._speed_stats is None:
+            self._speed_stats = RunningStats(*self.SPEED_BINS)
+        return self._speed_stats
+        
+    @property
+    def accuracy_stats(self) -> RunningStats:
+        """Verdeling van de nauwkeurigheid (aangemaakt bij eerste gebruik)"""
+        if self._accuracy_stats is None:
+            self._accuracy_stats = RunningStats(*self.ACCURACY_BINS)
+        return self._accuracy_stats
+        
+    @property
+    def key_stats(self) -> KeyStats:
+        """Toetsstatistieken (aangemaakt bij eerste gebruik)"""
+        if self._key_stats is None:
+            self._key_stats = KeyStats()
+        return self._key_stats
+        
     def to_dict(self) -> Dict:
-        """Converteer gebruiker naar dictionary voor opslag"""
-        return {
-            "name": self.name,
-            "age": self.age,
-            "created_date": self.created_date,
-            "last_login": self.last_login,
-            "current_level": self.current_level,
-            "current_lesson": self.current_lesson,
-            "total_points": self.total_points,
-            "lessons_completed": self.lessons_completed,
-            "typing_speed": self.typing_speed,
-            "accuracy": self.accuracy,
-            "total_words_typed": self.total_words_typed,
-            "total_errors": self.total_errors,
-            "stars_earned": self.stars_earned,
-            "badges": self.badges,
-            "games_unlocked": self.games_unlocked,
-            "lesson_results": self.lesson_results
-        }
+        """Converteer gebruiker naar dictionary voor opslag (mag vanaf de opslagthread)"""
+        with self.lock:
+            data = {
+                "name": self.name,
+                "age": self.age,
+                "created_date": self.created_date,
+                "last_login": self.last_login,
+                "current_level": self.current_level,
+                "current_lesson": self.current_lesson,
+                "total_points": self.total_points,
+                "lessons_completed": self.lessons_completed,
+                "typing_speed": self.typing_speed,
+                "accuracy": self.accuracy,
+                "total_words_typed": self.total_words_typed,
+                "total_errors": self.total_errors,
+                "stars_earned": self.stars_earned,
+                # Kopieën: het serialiseren gebeurt pas na het vrijgeven van de lock
+                "badges": list(self.badges),
+                "games_unlocked": list(self.games_unlocked),
+                "lesson_results": dict(self.lesson_results)
+            }
+            # Lege statistieken niet opslaan (ook niet aanmaken)
+            if self._speed_stats is not None and self._speed_stats.count:
+                data["speed_stats"] = self._speed_stats.to_dict()
+                data["accuracy_stats"] = self.accuracy_stats.to_dict()
+            if self._key_stats is not None and self._key_stats.keys:
+                data["key_stats"] = self._key_stats.to_dict()
+            return data
         
     @classmethod
     def from_dict(cls, data: Dict) -> 'User':
@@ -74,9 +137,24 @@ class User:
         user.total_words_typed = data.get("total_words_typed", 0)
         user.total_errors = data.get("total_errors", 0)
         user.stars_earned = data.get("stars_earned", 0)
-        user.badges = data.get("badges", [])
-        user.games_unlocked = data.get("games_unlocked", [])
-        user.lesson_results = data.get("lesson_results", {})
+        user.badges = [sys.intern(b) for b in data.get("badges", [])]
+        user.games_unlocked = [sys.intern(g) for g in data.get("games_unlocked", [])]
+        # Les-ID's en resultaatsleutels komen bij elke gebruiker terug: deel ze
+        user.lesson_results = {
+            sys.intern(lesson_id): {sys.intern(k): v for k, v in result.items()}
+            for lesson_id, result in data.get("lesson_results", {}).items()
+        }
+        
+        if "speed_stats" in data:
+            user._speed_stats = RunningStats.from_dict(data["speed_stats"], *cls.SPEED_BINS)
+            user._accuracy_stats = RunningStats.from_dict(data["accuracy_stats"], *cls.ACCURACY_BINS)
+        else:
+            # Oudere gegevens: eenmalig opbouwen uit de lesresultaten (zonder resultaten blijft het leeg)
+            for result in user.lesson_results.values():
+                user.speed_stats.add(result.get("speed", 0))
+                user.accuracy_stats.add(result.get("accuracy", 0))
+        if "key_stats" in data:
+            user._key_stats = KeyStats.from_dict(data["key_stats"])
         return user
         
     def update_login(self):
@@ -85,28 +163,36 @@ class User:
         
     def complete_lesson(self, lesson_id: str, score: int, accuracy: float, speed: float):
         """Markeer een les als voltooid"""
-        self.lesson_results[lesson_id] = {
-            "completed_date": datetime.now().isoformat(),
-            "score": score,
-            "accuracy": accuracy,
-            "speed": speed
-        }
-        
-        self.lessons_completed += 1
-        self.total_points += score
-        
-        # Update statistieken
-        if self.lessons_completed > 0:
-            self.typing_speed = (self.typing_speed + speed) / 2
-            self.accuracy = (self.accuracy + accuracy) / 2
+        with self.lock:
+            self.lesson_results[sys.intern(lesson_id)] = {
+                "completed_date": datetime.now().isoformat(),
+                "score": score,
+                "accuracy": accuracy,
+                "speed": speed
+            }
+            
+            self.lessons_completed += 1
+            self.total_points += score
             
-        # Check voor level up
-        if self.lessons_completed % 5 == 0:
-            self.current_level += 1
+            # Update statistieken (lopend gemiddelde over alle lessen)
+            self.speed_stats.add(speed)
+            self.accuracy_stats.add(accuracy)
+            self.typing_speed = self.speed_stats.mean
+            self.accuracy = self.accuracy_stats.mean
+            
+            # Check voor level up
+            if self.lessons_completed % 5 == 0:
+                self.current_level += 1
+                
+        if self.observer is not None:
+            self.observer.user_changed(self)
             
     def add_stars(self, count: int):
         """Voeg sterren toe"""
-        self.stars_earned += count
+        with self.lock:
+            self.stars_earned += count
+        if self.observer is not None:
+            self.observer.user_changed(self)
         
     def unlock_badge(self, badge_name: str):
         """Ontgrendel een badge"""
@@ -121,70 +207,215 @@ class User:
 class UserManager:
     """Manager voor alle gebruikers van de typecursus"""
     
-    def __init__(self):
+    def __init__(self, users_file: str = "users.json", store=None, scheduler=None,
+                 backend: str = "sqlite"):
         """Initialiseer de gebruikersmanager"""
-        self.users_file = "users.json"
+        self.users_file = users_file
+        self.scheduler = scheduler or get_scheduler()
+        # Lichte index van alle namen; volledige User-objecten worden pas bij gebruik geladen
+        self.user_index: Dict[str, Dict] = {}
         self.users: Dict[str, User] = {}
         self.current_user: Optional[User] = None
+        # Ranglijsten worden pas bij de eerste opvraging uit de index opgebouwd
+        self._leaderboards: Optional[Leaderboards] = None
+        
+        # Elke gebruiker is een eigen record; een oud users.json wordt eenmalig gemigreerd
+        if store is None:
+            store = open_user_store(users_file, backend)
+        self.store = store
         
         self.load_users()
         
     def load_users(self):
-        """Laad alle gebruikers uit bestand"""
+        """Laad de naamindex van alle gebruikers uit de opslag"""
         try:
-            if os.path.exists(self.users_file):
-                with open(self.users_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for user_data in data.values():
-                        user = User.from_dict(user_data)
-                        self.users[user.name] = user
+            self.user_index = self.store.load_index()
+            self.users = {}
+            self._leaderboards = None
         except Exception as e:
             print(f"Fout bij laden gebruikers: {e}")
             
-    def save_all_users(self):
-        """Sla alle gebruikers op in bestand"""
+    def _hydrate(self, name: str) -> Optional[User]:
+        """Laad een volledige gebruiker uit de opslag"""
         try:
-            data = {name: user.to_dict() for name, user in self.users.items()}
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            data = self.store.load_user(name)
         except Exception as e:
-            print(f"Fout bij opslaan gebruikers: {e}")
+            print(f"Fout bij laden gebruiker: {e}")
+            return None
+        if data is None:
+            return None
+        user = User.from_dict(data)
+        self._adopt(user)
+        return user
+        
+    def _adopt(self, user: User):
+        """Neem een geladen of nieuwe gebruiker op in het geheugen"""
+        user.observer = self
+        self.users[user.name] = user
+        
+    def _update_index(self, user: User):
+        """Werk de samenvatting van een gebruiker in de index en de ranglijsten bij"""
+        summary = {
+            "age": user.age,
+            "current_level": user.current_level,
+            "total_points": user.total_points,
+            "typing_speed": user.typing_speed,
+            "accuracy": user.accuracy,
+            "stars_earned": user.stars_earned
+        }
+        self.user_index[user.name] = summary
+        if self._leaderboards is not None:
+            self._leaderboards.update(user.name, user.age, summary)
+            
+    def user_changed(self, user: User):
+        """Wordt door User aangeroepen na een voltooide les of nieuwe sterren"""
+        self._update_index(user)
+        
+    def save_user(self, user: User, on_saved: Optional[Callable[[bool], None]] = None,
+                  delay: Optional[float] = None):
+        """Sla één gebruiker op de achtergrond op zonder de rest te herschrijven"""
+        # Op deze thread alleen de index; momentopname, serialiseren en schrijven
+        # gebeuren op de opslagthread (samengevoegde opslagen maken er maar één)
+        self._update_index(user)
+        
+        def write():
+            try:
+                self.store.save_user(user.to_dict())
+            except Exception:
+                if on_saved is not None:
+                    on_saved(False)
+                raise
+            if on_saved is not None:
+                on_saved(True)
+                
+        self.scheduler.mark_dirty(("user", user.name), write, delay)
+        
+    def import_user(self, data: Dict) -> User:
+        """Neem een volledige gebruiker van een andere machine over en sla hem op"""
+        user = User.from_dict(data)
+        self._adopt(user)
+        if self.current_user is not None and self.current_user.name == user.name:
+            self.current_user = user
+        self.save_user(user)
+        return user
+        
+    def apply_remote_change(self, name: str, summary: Optional[Dict]):
+        """Verwerk een wijziging die op een andere machine is opgeslagen (None = verwijderd)"""
+        if summary is None:
+            self.user_index.pop(name, None)
+            self.users.pop(name, None)
+            if self._leaderboards is not None:
+                self._leaderboards.remove(name)
+            return
+            
+        self.user_index[name] = summary
+        if self._leaderboards is not None:
+            self._leaderboards.update(name, summary.get("age", 10), summary)
+        # Een eerder geladen kopie is verouderd; de eigen huidige gebruiker blijft staan
+        if self.current_user is None or self.current_user.name != name:
+            self.users.pop(name, None)
+            
+    def save_all_users(self):
+        """Sla alle geladen gebruikers op"""
+        # Niet-geladen gebruikers zijn ongewijzigd en hoeven niet herschreven te worden
+        for user in list(self.users.values()):
+            self.save_user(user)
+            
+    def flush(self):
+        """Wacht tot alle openstaande opslagtaken geschreven zijn"""
+        self.scheduler.flush()
             
     def create_user(self, name: str, age: int) -> User:
         """Maak een nieuwe gebruiker aan"""
-        if name in self.users:
+        if name in self.user_index:
             raise ValueError(f"Gebruiker '{name}' bestaat al")
             
         user = User(name, age)
-        self.users[name] = user
-        self.save_all_users()
+        self._adopt(user)
+        self.save_user(user)
         return user
         
     def get_user(self, name: str) -> Optional[User]:
         """Haal een gebruiker op bij naam"""
-        return self.users.get(name)
+        user = self.users.get(name)
+        if user is None and name in self.user_index:
+            user = self._hydrate(name)
+        return user
+        
+    def has_user(self, name: str) -> bool:
+        """Controleer of een gebruiker bestaat zonder hem te laden"""
+        return name in self.user_index
+        
+    def get_user_names(self) -> List[str]:
+        """Haal de namen van alle gebruikers op uit de index"""
+        return list(self.user_index)
         
     def delete_user(self, name: str) -> bool:
         """Verwijder een gebruiker"""
-        if name in self.users:
-            del self.users[name]
-            self.save_all_users()
+        if name in self.user_index:
+            del self.user_index[name]
+            self.users.pop(name, None)
+            if self._leaderboards is not None:
+                self._leaderboards.remove(name)
+            if self.current_user is not None and self.current_user.name == name:
+                self.current_user = None
+            # Zelfde sleutel als save_user: een nog openstaande opslag vervalt
+            self.scheduler.mark_dirty(("user", name), lambda: self.store.delete_user(name))
             return True
         return False
         
     def get_all_users(self) -> List[User]:
-        """Haal alle gebruikers op"""
-        return list(self.users.values())
+        """Haal alle gebruikers op (laadt alle nog niet geladen gebruikers)"""
+        missing = [name for name in self.user_index if name not in self.users]
+        if missing:
+            try:
+                for user_data in self.store.load_all().values():
+                    if user_data["name"] not in self.users:
+                        self._adopt(User.from_dict(user_data))
+            except Exception as e:
+                print(f"Fout bij laden gebruikers: {e}")
+        return [self.users[name] for name in self.user_index if name in self.users]
+        
+    @property
+    def leaderboards(self) -> Leaderboards:
+        """Ranglijsten van alle gebruikers (bij eerste gebruik opgebouwd uit de index)"""
+        if self._leaderboards is None:
+            self._leaderboards = Leaderboards()
+            self._leaderboards.load(self.user_index)
+        return self._leaderboards
+        
+    def get_leaderboard(self, metric: str = "total_points", count: int = 10,
+                        age: Optional[int] = None) -> List[Dict]:
+        """Top count van een ranglijst, eventueel alleen voor één leeftijd"""
+        return [
+            {"rank": position, "name": name, "value": value}
+            for position, (name, value) in enumerate(self.leaderboards.top(metric, count, age), 1)
+        ]
         
-    def set_current_user(self, user: User):
+    def get_rank(self, name: str, metric: str = "total_points",
+                 age: Optional[int] = None) -> Optional[int]:
+        """Plaats van een gebruiker op een ranglijst (vanaf 1)"""
+        return self.leaderboards.rank(metric, name, age)
+        
+    def set_current_user(self, user: Optional[User]):
         """Stel de huidige gebruiker in"""
+        # Bewaar de voortgang van de vorige gebruiker bij wisselen of uitloggen
+        if self.current_user is not None and self.current_user is not user:
+            self.save_user(self.current_user)
+            
         self.current_user = user
-        user.update_login()
-        
+        if user is not None:
+            user.update_login()
+            
     def get_current_user(self) -> Optional[User]:
         """Haal de huidige gebruiker op"""
         return self.current_user
         
+    def save_current_user(self):
+        """Sla alleen de huidige gebruiker op"""
+        if self.current_user is not None:
+            self.save_user(self.current_user)
+            
     def get_user_stats(self, user: User) -> Dict:
         """Haal statistieken van een gebruiker op"""
         return {
@@ -194,8 +425,14 @@ class UserManager:
             "lessons_completed": user.lessons_completed,
             "total_points": user.total_points,
             "typing_speed": round(user.typing_speed, 1),
+            "speed_median": round(user.speed_stats.median, 1),
+            "speed_p90": round(user.speed_stats.percentile(90), 1),
+            "speed_stddev": round(user.speed_stats.stddev, 1),
+            "speed_recent": round(user.speed_stats.ewma, 1),
             "accuracy": round(user.accuracy, 1),
+            "accuracy_median": round(user.accuracy_stats.median, 1),
             "stars_earned": user.stars_earned,
+            "weak_keys": [target for target, _ in user.key_stats.weak_targets(5)],
             "badges_count": len(user.badges),
             "games_unlocked": len(user.games_unlocked)
         }
\ No newline at end of file
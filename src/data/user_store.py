@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Opslag voor gebruikers van de Kinder Typecursus
+
+Elke gebruiker is een eigen record, zodat het wijzigen van één leerling
+alleen dat ene record herschrijft. Er zijn twee varianten: een
+SQLite-database (standaard) en een map met één bestand per gebruiker
+plus een manifest, te kiezen met storage.users_backend in de configuratie.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from ..utils.persistence import atomic_write_bytes, atomic_write_json
+
+# Samenvatting naast de volledige gegevens: genoeg voor de naamindex en de ranglijsten
+SUMMARY_DEFAULTS = {
+    "age": 10,
+    "current_level": 1,
+    "total_points": 0,
+    "typing_speed": 0,
+    "accuracy": 0,
+    "stars_earned": 0
+}
+
+def summarize(user_data: Dict) -> Dict:
+    """Samenvatting van een gebruikersdictionary voor de index"""
+    return {column: user_data.get(column, default) for column, default in SUMMARY_DEFAULTS.items()}
+
+def open_user_store(users_file: str = "users.json", backend: str = "sqlite"):
+    """Open de opslag naast users_file: 'sqlite' (users.db) of 'shards' (map users/)"""
+    base = os.path.splitext(users_file)[0]
+    if backend == "shards":
+        return ShardedUserStore(base, legacy_file=users_file)
+    if backend != "sqlite":
+        raise ValueError(f"Onbekende gebruikersopslag '{backend}'")
+    return SQLiteUserStore(base + ".db", legacy_file=users_file)
+
+class SQLiteUserStore:
+    """Gebruikersopslag met één record per gebruiker in SQLite"""
+    
+    SCHEMA_VERSION = 1
+    
+    SUMMARY_COLUMNS = tuple(SUMMARY_DEFAULTS)
+    
+    def __init__(self, db_file: str = "users.db", legacy_file: str = "users.json"):
+        """Open (of maak) de database en migreer een oud users.json"""
+        self.db_file = db_file
+        self.legacy_file = legacy_file
+        
+        # Schrijven gebeurt op de opslagthread, lezen op de UI-thread
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.create_schema()
+        self.migrate_legacy_file()
+        
+    def create_schema(self):
+        """Maak de tabellen aan als ze nog niet bestaan"""
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " name TEXT PRIMARY KEY,"
+                " age INTEGER NOT NULL,"
+                " current_level INTEGER NOT NULL,"
+                " total_points INTEGER NOT NULL,"
+                " typing_speed REAL NOT NULL DEFAULT 0,"
+                " accuracy REAL NOT NULL DEFAULT 0,"
+                " stars_earned INTEGER NOT NULL DEFAULT 0,"
+                " data TEXT NOT NULL)"
+            )
+            self.connection.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+            
+    def migrate_legacy_file(self):
+        """Importeer gebruikers uit het oude users.json (eenmalig)"""
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+            
+        count = self.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        if count:
+            return
+            
+        try:
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.save_users(data.values())
+            # Hernoem het oude bestand zodat verwijderde gebruikers niet terugkomen
+            os.replace(self.legacy_file, self.legacy_file + ".migrated")
+        except Exception as e:
+            print(f"Fout bij migreren gebruikers: {e}")
+            
+    @staticmethod
+    def _row(user_data: Dict) -> tuple:
+        """Zet een gebruikersdictionary om naar een databaserij"""
+        return (
+            user_data["name"],
+            *summarize(user_data).values(),
+            json.dumps(user_data, ensure_ascii=False, separators=(',', ':'))
+        )
+        
+    def load_index(self) -> Dict[str, Dict]:
+        """Laad alleen de samenvatting (leeftijd, niveau, punten, ranglijstwaarden) van elke gebruiker"""
+        columns = self.SUMMARY_COLUMNS
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT name, {', '.join(columns)} FROM users"
+            ).fetchall()
+        return {row[0]: dict(zip(columns, row[1:])) for row in rows}
+        
+    def load_user(self, name: str) -> Optional[Dict]:
+        """Laad de volledige gegevens van één gebruiker"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT data FROM users WHERE name = ?", (name,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+        
+    def load_all(self) -> Dict[str, Dict]:
+        """Laad alle gebruikers als dictionaries"""
+        with self.lock:
+            rows = self.connection.execute("SELECT name, data FROM users").fetchall()
+        return {name: json.loads(data) for name, data in rows}
+        
+    def save_user(self, user_data: Dict):
+        """Sla één gebruiker op; alleen dit record wordt geschreven"""
+        self.save_users([user_data])
+        
+    def save_users(self, users_data: Iterable[Dict]):
+        """Sla meerdere gebruikers op in één transactie"""
+        rows: List[tuple] = [self._row(data) for data in users_data]
+        if not rows:
+            return
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO users (name, age, current_level, total_points,"
+                " typing_speed, accuracy, stars_earned, data)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            
+    def delete_user(self, name: str):
+        """Verwijder het record van een gebruiker"""
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM users WHERE name = ?", (name,))
+            
+    def close(self):
+        """Sluit de database"""
+        with self.lock:
+            self.connection.close()
+
+
+class ShardedUserStore:
+    """Gebruikersopslag met één JSON-bestand per gebruiker en een manifest met samenvattingen"""
+    
+    MANIFEST = "manifest.json"
+    JOURNAL = "manifest.log"
+    # Na zoveel regels in het logboek wordt het manifest in één keer herschreven
+    COMPACT_AFTER = 1000
+    WORKERS = 8
+    
+    def __init__(self, directory: str = "users", legacy_file: str = "users.json",
+                 workers: int = WORKERS):
+        """Open (of maak) de map en lees alleen het manifest"""
+        self.directory = directory
+        self.legacy_file = legacy_file
+        self.workers = workers
+        self.manifest_file = os.path.join(directory, self.MANIFEST)
+        self.journal_file = os.path.join(directory, self.JOURNAL)
+        
+        # Beschermt het manifest en het logboek; shards worden atomair vervangen
+        self.lock = threading.RLock()
+        self.manifest: Dict[str, Dict] = {}
+        self.journal_entries = 0
+        
+        os.makedirs(os.path.join(directory, "shards"), exist_ok=True)
+        self.read_manifest()
+        self.migrate_legacy_file()
+        
+    def shard_path(self, name: str) -> str:
+        """Bestand van één gebruiker; de hash voorkomt problemen met tekens en hoofdletters in namen"""
+        digest = hashlib.sha1(name.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, "shards", digest[:2], digest + ".json")
+        
+    def read_manifest(self):
+        """Lees het manifest en speel de wijzigingen uit het logboek erop af"""
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f).get("users", {})
+                
+        self.journal_entries = 0
+        if not os.path.exists(self.journal_file):
+            return
+        torn = False
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Half geschreven laatste regel na een crash
+                    torn = True
+                    break
+                if entry["summary"] is None:
+                    self.manifest.pop(entry["name"], None)
+                else:
+                    self.manifest[entry["name"]] = entry["summary"]
+                self.journal_entries += 1
+        # Opruimen, zodat nieuwe regels niet achter de kapotte regel terechtkomen
+        if torn:
+            self.compact()
+            
+    def migrate_legacy_file(self):
+        """Importeer gebruikers uit het oude users.json (eenmalig)"""
+        if not self.legacy_file or not os.path.exists(self.legacy_file) or self.manifest:
+            return
+            
+        try:
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.save_users(data.values())
+            self.compact()
+            # Hernoem het oude bestand zodat verwijderde gebruikers niet terugkomen
+            os.replace(self.legacy_file, self.legacy_file + ".migrated")
+        except Exception as e:
+            print(f"Fout bij migreren gebruikers: {e}")
+            
+    def append_journal(self, entries: List[Dict]):
+        """Voeg wijzigingen van het manifest toe aan het logboek"""
+        if not entries:
+            return
+        lines = b"".join(
+            json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n"
+            for entry in entries
+        )
+        with open(self.journal_file, 'ab') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_entries += len(entries)
+        if self.journal_entries > max(self.COMPACT_AFTER, len(self.manifest)):
+            self.compact()
+            
+    def compact(self):
+        """Schrijf het volledige manifest en begin een leeg logboek"""
+        with self.lock:
+            atomic_write_json(self.manifest_file, {"version": 1, "users": self.manifest}, indent=None)
+            # Na een crash hier wordt het oude logboek opnieuw afgespeeld; dat geeft hetzelfde manifest
+            with open(self.journal_file, 'wb'):
+                pass
+            self.journal_entries = 0
+            
+    def load_index(self) -> Dict[str, Dict]:
+        """Samenvatting van elke gebruiker, rechtstreeks uit het manifest"""
+        with self.lock:
+            return dict(self.manifest)
+            
+    def load_user(self, name: str) -> Optional[Dict]:
+        """Laad de volledige gegevens van één gebruiker uit zijn eigen bestand"""
+        try:
+            with open(self.shard_path(name), 'rb') as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return None
+            
+    def load_users(self, names: Iterable[str]) -> Dict[str, Dict]:
+        """Laad veel gebruikers tegelijk met een threadpool"""
+        names = list(names)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="gebruikers") as pool:
+            loaded = pool.map(self.load_user, names)
+        return {name: data for name, data in zip(names, loaded) if data is not None}
+        
+    def load_all(self) -> Dict[str, Dict]:
+        """Laad alle gebruikers als dictionaries"""
+        return self.load_users(self.load_index())
+        
+    def save_user(self, user_data: Dict):
+        """Sla één gebruiker op: één klein bestand plus zo nodig één regel in het logboek"""
+        self.save_users([user_data])
+        
+    def save_users(self, users_data: Iterable[Dict]):
+        """Sla meerdere gebruikers op met één toevoeging aan het logboek"""
+        with self.lock:
+            entries = []
+            for data in users_data:
+                path = self.shard_path(data["name"])
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                atomic_write_bytes(
+                    path, json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                )
+                summary = summarize(data)
+                if self.manifest.get(data["name"]) != summary:
+                    self.manifest[data["name"]] = summary
+                    entries.append({"name": data["name"], "summary": summary})
+            self.append_journal(entries)
+            
+    def delete_user(self, name: str):
+        """Verwijder het bestand van een gebruiker en haal hem uit het manifest"""
+        with self.lock:
+            try:
+                os.remove(self.shard_path(name))
+            except FileNotFoundError:
+                pass
+            if self.manifest.pop(name, None) is not None:
+                self.append_journal([{"name": name, "summary": None}])
+                
+    def close(self):
+        """Schrijf het manifest bij, zodat de volgende start geen logboek hoeft af te spelen"""
+        with self.lock:
+            if self.journal_entries:
+                self.compact()
\ No newline at end of file
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Woordcorpus op schijf voor de Kinder Typecursus
+
+Een grote woordenlijst wordt één keer voorbewerkt tot een binair bestand:
+alle woorden als één UTF-8-blok, een tabel met per woord (positie, lengte
+in bytes, lengte in tekens, moeilijkheidsgraad) en de lettergroepen van
+WordIndex. Het bestand wordt met mmap geopend; er worden geen Python-
+strings aangemaakt behalve voor woorden die echt getrokken worden. Dat
+houdt geheugen en opstarttijd laag, vooral op Android.
+
+Voorbewerken: python -m src.data.word_corpus woorden.txt woorden.corpus
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Tuple
+
+from .word_index import WordIndex
+from ..utils.persistence import atomic_write_bytes
+
+MAGIC = b"TCW1"
+VERSION = 1
+# magie, versie, langste woord (tekens), aantal woorden, aantal groepen, grootte UTF-8-blok
+HEADER = struct.Struct('<4sHHIII')
+# positie in het blok, lengte in bytes, lengte in tekens, moeilijkheidsgraad
+ENTRY = struct.Struct('<IHBB')
+MAX_LENGTH = 255
+
+def _align(size: int) -> int:
+    """Rond af op 8 bytes, zodat elke tabel direct als array gelezen kan worden"""
+    return (size + 7) & ~7
+
+def word_difficulty(word: str) -> int:
+    """Moeilijkheidsgraad van een los woord: langer of met accenten is moeilijker"""
+    difficulty = 1 if len(word) <= 4 else 2 if len(word) <= 7 else 3
+    if not word.isascii():
+        difficulty += 1
+    return difficulty
+
+def build_corpus(words: Iterable[str], path: str) -> int:
+    """Voorbewerking: schrijf een corpusbestand en geef het aantal woorden terug"""
+    entries = sorted({(len(word), WordIndex.mask(word), word)
+                      for word in (word.strip() for word in words)
+                      if word and len(word) <= MAX_LENGTH})
+    
+    blob = bytearray()
+    table = bytearray(ENTRY.size * len(entries))
+    masks = array('Q')
+    begins = array('I')
+    group_lengths: List[int] = []
+    previous: Optional[Tuple[int, int]] = None
+    for position, (length, mask, word) in enumerate(entries):
+        data = word.encode('utf-8')
+        ENTRY.pack_into(table, position * ENTRY.size, len(blob), len(data), length,
+                        word_difficulty(word))
+        blob += data
+        if (length, mask) != previous:
+            masks.append(mask)
+            begins.append(position)
+            group_lengths.append(length)
+            previous = (length, mask)
+    begins.append(len(entries))
+    # Groepen van lengte L staan van length_groups[L] tot length_groups[L + 1]
+    length_groups = array('I', (bisect_left(group_lengths, length)
+                                for length in range(MAX_LENGTH + 2)))
+    
+    if sys.byteorder != "little":
+        for numbers in (masks, begins, length_groups):
+            numbers.byteswap()
+    longest = entries[-1][0] if entries else 0
+    sections = [
+        HEADER.pack(MAGIC, VERSION, longest, len(entries), len(masks), len(blob)),
+        masks.tobytes(), bytes(table), begins.tobytes(), length_groups.tobytes(), bytes(blob)
+    ]
+    atomic_write_bytes(path, b"".join(
+        section + b"\0" * (_align(len(section)) - len(section)) for section in sections
+    ))
+    return len(entries)
+
+class WordCorpus(WordIndex):
+    """WordIndex op een met mmap geopend corpusbestand; woorden worden pas bij trekken gedecodeerd"""
+    
+    def __init__(self, path: str):
+        """Open het corpus; leest alleen de kop, de rest komt bij gebruik van schijf"""
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_length, self.word_count, group_count, blob_size = \
+            HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.mmap.close()
+            raise ValueError(f"Geen geldig woordcorpus: {path}")
+            
+        offset = _align(HEADER.size)
+        self.masks = self._numbers(offset, group_count, 'Q')
+        offset = _align(offset + group_count * 8)
+        self.entries_offset = offset
+        offset = _align(offset + self.word_count * ENTRY.size)
+        self.begins = self._numbers(offset, group_count + 1, 'I')
+        offset = _align(offset + (group_count + 1) * 4)
+        self.length_groups = self._numbers(offset, MAX_LENGTH + 2, 'I')
+        self.blob_offset = _align(offset + (MAX_LENGTH + 2) * 4)
+        
+    def _numbers(self, offset: int, count: int, code: str):
+        """Tabel met getallen rechtstreeks op de mmap (kopie alleen op big-endian machines)"""
+        view = memoryview(self.mmap)[offset:offset + count * array(code).itemsize].cast(code)
+        if sys.byteorder == "little":
+            return view
+        numbers = array(code, view)
+        view.release()
+        numbers.byteswap()
+        return numbers
+        
+    def __len__(self) -> int:
+        return self.word_count
+        
+    def entry(self, position: int) -> Tuple[int, int, int, int]:
+        """(positie in blok, lengte in bytes, lengte in tekens, moeilijkheidsgraad) van een woord"""
+        return ENTRY.unpack_from(self.mmap, self.entries_offset + position * ENTRY.size)
+        
+    def word(self, position: int) -> str:
+        """Decodeer één woord uit het blok"""
+        start, size, _, _ = self.entry(position)
+        start += self.blob_offset
+        return self.mmap[start:start + size].decode('utf-8')
+        
+    def difficulty(self, position: int) -> int:
+        """Moeilijkheidsgraad van een woord"""
+        return self.entry(position)[3]
+        
+    def words_between(self, begin: int, end: int) -> List[str]:
+        """Decodeer de woorden van positie begin tot end"""
+        return [self.word(position) for position in range(begin, end)]
+        
+    def ranges(self, letters: Iterable[str], min_length: int = 1,
+               max_length: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Stukken (begin, einde) met alleen deze letters, rechtstreeks op de tabellen in de mmap"""
+        allowed = self.mask("".join(letters)) & ~self.OTHER_BIT
+        allowed_count = bin(allowed).count("1")
+        forbidden = ~allowed
+        masks, begins, length_groups = self.masks, self.begins, self.length_groups
+        longest = self.max_length if max_length is None else min(max_length, self.max_length)
+        result = []
+        for length in range(max(min_length, 0), longest + 1):
+            first, last = length_groups[length], length_groups[length + 1]
+            if first == last:
+                continue
+            if (1 << allowed_count) <= last - first:
+                # Maskers staan per lengte gesorteerd: deelverzamelingen binair opzoeken
+                subset = allowed
+                while subset:
+                    group = bisect_left(masks, subset, first, last)
+                    if group < last and masks[group] == subset:
+                        result.append((begins[group], begins[group + 1]))
+                    subset = (subset - 1) & allowed
+            else:
+                for group in range(first, last):
+                    if not masks[group] & forbidden:
+                        result.append((begins[group], begins[group + 1]))
+        return result
+        
+    def close(self):
+        """Geef de mmap vrij"""
+        for numbers in (self.masks, self.begins, self.length_groups):
+            if isinstance(numbers, memoryview):
+                numbers.release()
+        self.mmap.close()
+
+def main():
+    """Voorbewerking vanaf de opdrachtregel: woordenlijst (één woord per regel) naar corpus"""
+    if len(sys.argv) != 3:
+        print("Gebruik: python -m src.data.word_corpus woorden.txt woorden.corpus")
+        sys.exit(1)
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        count = build_corpus(f, sys.argv[2])
+    print(f"{count} woorden geschreven naar {sys.argv[2]}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
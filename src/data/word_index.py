@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Woordindex voor de Kinder Typecursus
+
+Elk woord krijgt één keer een bitmasker van de letters die erin
+voorkomen. De woorden staan op (lengte, masker) gesorteerd in één lijst,
+zodat alle woorden met dezelfde lengte en dezelfde letters een
+aaneengesloten stuk vormen. "Alle woorden met alleen deze letters" is dan
+een test per groep (masker & verboden letters == 0) in plaats van per
+woord; bij weinig toegestane letters worden zelfs alleen de deelmaskers
+van de toegestane letters opgezocht.
+"""
+
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+class WordIndex:
+    """Woordenlijst met per woord een letterverzameling als bitmasker, gegroepeerd op lengte"""
+    
+    # Vaste bits voor de letters van het Nederlands; de rest deelt één bit
+    ALPHABET = "abcdefghijklmnopqrstuvwxyz" "áàâäéèêëíìîïóòôöúùûüç" "'-"
+    OTHER_BIT = 1 << len(ALPHABET)
+    BITS = {letter: 1 << bit for bit, letter in enumerate(ALPHABET)}
+    
+    def __init__(self, words: Iterable[str]):
+        """Bouw de index (eenmalig; daarna is elke opvraging zonder woordscan)"""
+        entries = sorted({(len(word), self.mask(word), word)
+                          for word in (word.strip() for word in words) if word})
+        self.words: List[str] = [word for _, _, word in entries]
+        # Per lengte: masker -> (begin, einde) in self.words
+        self.groups: Dict[int, Dict[int, Tuple[int, int]]] = {}
+        for position, (length, mask, _) in enumerate(entries):
+            group = self.groups.setdefault(length, {})
+            begin = group[mask][0] if mask in group else position
+            group[mask] = (begin, position + 1)
+            
+    def __len__(self) -> int:
+        return len(self.words)
+        
+    def word(self, position: int) -> str:
+        """Woord op een positie in de gesorteerde lijst"""
+        return self.words[position]
+        
+    def words_between(self, begin: int, end: int) -> List[str]:
+        """Woorden van positie begin tot end"""
+        return self.words[begin:end]
+        
+    @classmethod
+    def mask(cls, text: str) -> int:
+        """Bitmasker van de letters in een tekst (hoofdletters tellen als kleine letters)"""
+        bits = cls.BITS
+        mask = 0
+        for letter in set(text.lower()):
+            mask |= bits.get(letter, cls.OTHER_BIT)
+        return mask
+        
+    def ranges(self, letters: Iterable[str], min_length: int = 1,
+               max_length: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Stukken (begin, einde) van self.words met alleen deze letters en een passende lengte"""
+        allowed = self.mask("".join(letters)) & ~self.OTHER_BIT
+        allowed_count = bin(allowed).count("1")
+        result = []
+        for length in sorted(self.groups):
+            if length < min_length or (max_length is not None and length > max_length):
+                continue
+            group = self.groups[length]
+            if (1 << allowed_count) <= len(group):
+                # Weinig letters: alle deelverzamelingen opzoeken is goedkoper dan elke groep testen
+                subset = allowed
+                while subset:
+                    found = group.get(subset)
+                    if found is not None:
+                        result.append(found)
+                    subset = (subset - 1) & allowed
+            else:
+                forbidden = ~allowed
+                result.extend(found for mask, found in group.items() if not mask & forbidden)
+        return result
+        
+    def matching(self, letters: Iterable[str], min_length: int = 1,
+                 max_length: Optional[int] = None) -> List[str]:
+        """Alle woorden die alleen uit deze letters bestaan"""
+        result = []
+        for begin, end in self.ranges(letters, min_length, max_length):
+            result.extend(self.words_between(begin, end))
+        return result
+        
+    def count(self, letters: Iterable[str], min_length: int = 1,
+              max_length: Optional[int] = None) -> int:
+        """Aantal woorden dat alleen uit deze letters bestaat"""
+        return sum(end - begin for begin, end in self.ranges(letters, min_length, max_length))
+        
+    def sample(self, letters: Iterable[str], count: int, min_length: int = 1,
+               max_length: Optional[int] = None, rng: random.Random = None) -> List[str]:
+        """Trek count verschillende passende woorden zonder de hele lijst op te bouwen"""
+        rng = rng or random
+        ranges = self.ranges(letters, min_length, max_length)
+        ends = list(accumulate(end - begin for begin, end in ranges))
+        total = ends[-1] if ends else 0
+        result = []
+        for number in rng.sample(range(total), min(count, total)):
+            which = bisect_right(ends, number)
+            begin, end = ranges[which]
+            result.append(self.word(end - (ends[which] - number)))
+        return result
+        
+    @staticmethod
+    def letters_in(texts: Iterable[str]) -> Set[str]:
+        """Alle kleine letters die in de teksten voorkomen"""
+        return {letter for text in texts for letter in text.lower() if letter.isalpha()}
\ No newline at end of file
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Automatisch opslaan voor de Kinder Typecursus
+
+Na een les werkt de Tk-thread alleen de naamindex bij; de momentopname
+van de leerling (onder User.lock), serialiseren en schrijven gebeuren op
+de opslagthread. Die meldt de uitkomst via een wachtrij die de Tk-thread
+met root.after leegmaakt, zodat callbacks nooit vanaf een andere thread
+Tk aanraken.
+"""
+
+import queue
+from typing import Callable, Dict, Optional
+
+from ..utils.startup import resolve
+
+class Autosaver:
+    """Slaat leerlingen op de achtergrond op en meldt het resultaat op de Tk-thread"""
+    
+    # Hoe vaak de Tk-thread kijkt of er opslagen klaar zijn (alleen zolang er iets loopt)
+    POLL_MS = 50
+    
+    def __init__(self, root, user_manager, on_saved: Optional[Callable[[str, bool], None]] = None):
+        """Initialiseer; user_manager mag een Deferred zijn"""
+        self.root = root
+        self._user_manager = user_manager
+        self.on_saved = on_saved
+        self.results: "queue.SimpleQueue" = queue.SimpleQueue()
+        # Per leerling het volgnummer van de laatst ingeplande opslag
+        self.pending: Dict[str, int] = {}
+        self.sequence = 0
+        self.polling = False
+        
+    def save(self, user):
+        """Plan het opslaan van een leerling direct in (op deze thread alleen de index bijwerken)"""
+        name = user.name
+        self.sequence += 1
+        number = self.pending[name] = self.sequence
+        resolve(self._user_manager).save_user(
+            user,
+            on_saved=lambda ok: self.results.put((name, number, ok)),
+            delay=0
+        )
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.POLL_MS, self.poll)
+            
+    def poll(self):
+        """Verwerk de gemelde resultaten op de Tk-thread"""
+        while True:
+            try:
+                name, number, ok = self.results.get_nowait()
+            except queue.Empty:
+                break
+            # Een oudere opslag die nog liep telt niet; samengevoegde melden zich nooit
+            if self.pending.get(name) != number:
+                continue
+            del self.pending[name]
+            if self.on_saved is not None:
+                self.on_saved(name, ok)
+                
+        if self.pending:
+            self.root.after(self.POLL_MS, self.poll)
+        else:
+            self.polling = False
\ No newline at end of file
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dashboard voor de Kinder Typecursus
+"""
+
+import tkinter as tk
+from typing import Callable, Dict, Optional, Tuple
+
+class Dashboard:
+    """Overzicht met de voortgang van de leerling en een tegel per les"""
+    
+    # Aantal lestegels naast elkaar
+    COLUMNS = 4
+    
+    def __init__(self, parent, user_manager, lesson_manager, config, theme,
+                 on_start_lesson: Callable, on_show_profile: Callable,
+                 on_show_settings: Callable, on_logout: Callable):
+        self.parent = parent
+        self.user_manager = user_manager
+        self.lesson_manager = lesson_manager
+        self.config = config
+        self.theme = theme
+        self.on_start_lesson = on_start_lesson
+        self.on_show_profile = on_show_profile
+        self.on_show_settings = on_show_settings
+        self.on_logout = on_logout
+        
+        # Tegels worden één keer gebouwd; bij terugkeer wijzigen alleen tekst en kleur
+        self.tiles: Dict[str, tk.Button] = {}
+        self.tile_states: Dict[str, Tuple] = {}
+        self.tiles_revision: Optional[int] = None
+        
+        self.setup_ui()
+        self.refresh()
+        
+    def setup_ui(self):
+        """Stel de gebruikersinterface in"""
+        background = self.theme.color("background")
+        
+        # Hoofdframe
+        self.frame = tk.Frame(self.parent, bg=background)
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Begroeting en voortgang
+        self.welcome_label = tk.Label(
+            self.frame,
+            text="",
+            font=self.theme.font("title"),
+            fg=self.theme.color("primary"),
+            bg=background
+        )
+        self.welcome_label.pack(pady=(10, 5))
+        
+        self.stats_label = tk.Label(
+            self.frame,
+            text="",
+            font=self.theme.font("body"),
+            fg=self.theme.color("secondary"),
+            bg=background
+        )
+        self.stats_label.pack(pady=(0, 10))
+        
+        # Knoppen
+        button_frame = tk.Frame(self.frame, bg=background)
+        button_frame.pack(pady=5)
+        
+        for text, command in (("Mijn Profiel", self.on_show_profile),
+                              ("Instellingen", self.on_show_settings),
+                              ("Uitloggen", self.on_logout)):
+            button = tk.Button(
+                button_frame,
+                text=text,
+                font=self.theme.font("button"),
+                bg=self.theme.color("accent"),
+                fg="white",
+                command=command
+            )
+            button.pack(side=tk.LEFT, padx=10)
+            
+        # Scrollbaar overzicht van alle lessen
+        list_frame = tk.Frame(self.frame, bg=background)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        
+        self.canvas = tk.Canvas(list_frame, bg=background, highlightthickness=0)
+        scrollbar = tk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.tile_frame = tk.Frame(self.canvas, bg=background)
+        self.canvas.create_window((0, 0), window=self.tile_frame, anchor=tk.NW)
+        self.tile_frame.bind(
+            "<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox(tk.ALL))
+        )
+        
+    def build_tiles(self):
+        """Bouw de lestegels opnieuw op (alleen als de lessenlijst gewijzigd is)"""
+        for child in self.tile_frame.winfo_children():
+            child.destroy()
+        self.tiles = {}
+        self.tile_states = {}
+        
+        background = self.theme.color("background")
+        row = 0
+        for level in self.lesson_manager.get_levels():
+            heading = tk.Label(
+                self.tile_frame,
+                text=f"Niveau {level}",
+                font=self.theme.font("heading"),
+                bg=background
+            )
+            heading.grid(row=row, column=0, columnspan=self.COLUMNS, sticky=tk.W, pady=(10, 5))
+            row += 1
+            
+            lessons = self.lesson_manager.get_lessons_in_order(level)
+            for index, lesson in enumerate(lessons):
+                lesson_id = lesson.lesson_id
+                tile = tk.Button(
+                    self.tile_frame,
+                    text=lesson.title,
+                    font=self.theme.font("button"),
+                    width=18,
+                    height=2,
+                    command=lambda lesson_id=lesson_id: self.on_start_lesson(lesson_id)
+                )
+                tile.grid(row=row + index // self.COLUMNS, column=index % self.COLUMNS,
+                          padx=5, pady=5)
+                self.tiles[lesson_id] = tile
+            # Volgend niveau begint op een nieuwe regel
+            row += (len(lessons) + self.COLUMNS - 1) // self.COLUMNS
+            
+        self.tiles_revision = self.lesson_manager.revision
+        
+    def tile_state(self, lesson, user) -> Tuple:
+        """Zichtbare toestand van één tegel: (beschikbaar, voltooid, score)"""
+        result = user.lesson_results.get(lesson.lesson_id) if user else None
+        unlocked = user is not None and lesson.level <= user.current_level
+        return (unlocked, result is not None, result["score"] if result else 0)
+        
+    def refresh(self):
+        """Werk het dashboard bij voor de huidige leerling"""
+        user = self.user_manager.get_current_user()
+        if self.tiles_revision != self.lesson_manager.revision:
+            self.build_tiles()
+            
+        if user:
+            self.welcome_label.configure(text=f"Hallo {user.name}!")
+            self.stats_label.configure(
+                text=f"Niveau {user.current_level}   "
+                     f"Punten: {user.total_points}   "
+                     f"Sterren: {user.stars_earned}   "
+                     f"Lessen voltooid: {user.lessons_completed}"
+            )
+            
+        # Alleen tegels waarvan de toestand veranderd is opnieuw configureren
+        for lesson_id, tile in self.tiles.items():
+            lesson = self.lesson_manager.get_lesson(lesson_id)
+            state = self.tile_state(lesson, user)
+            if self.tile_states.get(lesson_id) == state:
+                continue
+            self.tile_states[lesson_id] = state
+            unlocked, completed, score = state
+            if completed:
+                tile.configure(text=f"{lesson.title}\n✓ {score} punten", state=tk.NORMAL,
+                               bg=self.theme.color("success"), fg="white")
+            elif unlocked:
+                tile.configure(text=lesson.title, state=tk.NORMAL,
+                               bg=self.theme.color("secondary"), fg="white")
+            else:
+                tile.configure(text=f"{lesson.title}\n🔒", state=tk.DISABLED,
+                               bg=self.theme.color("disabled"), fg=self.theme.color("disabled_text"))
+                               
+    def destroy(self):
+        """Verwijder het scherm"""
+        self.frame.destroy()
\ No newline at end of file
@@ -1 +1,210 @@
 #!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lesscherm voor de Kinder Typecursus
+"""
+
+import tkinter as tk
+from typing import Callable
+
+from ..utils.keylog import KeystrokeRecorder, keylog_path
+from ..utils.scoring import ScoringEngine
+
+class LessonScreen:
+    """Lesscherm waarin de leerling de items van een les typt"""
+    
+    def __init__(self, parent, lesson, user_manager, config, theme,
+                 on_complete: Callable, on_back: Callable, sound=None):
+        self.parent = parent
+        self.lesson = lesson
+        self.user_manager = user_manager
+        self.config = config
+        self.theme = theme
+        self.on_complete = on_complete
+        self.on_back = on_back
+        self.sound = sound
+        
+        # Aanslagen vastleggen voor reactietijd- en foutanalyse per toets
+        self.recorder = KeystrokeRecorder()
+        
+        self.setup_ui()
+        self.refresh(lesson)
+        
+    def refresh(self, lesson=None):
+        """Begin (opnieuw) aan een les zonder de widgets opnieuw te bouwen"""
+        if lesson is not None:
+            self.lesson = lesson
+        # Lege items kunnen nooit af; die slaan we over
+        self.items = [text for text in self.lesson.texts if text]
+        self.item_index = 0
+        self.engine = ScoringEngine(
+            reward_points=self.config.get("game_settings.reward_points", 10)
+        )
+        
+        # Aanslagen van een afgebroken les eerst wegschrijven naar het oude logboek
+        self.recorder.flush()
+        current_user = self.user_manager.get_current_user()
+        self.recorder.path = keylog_path(current_user.name) if current_user else None
+        # Elk blok aanslagen werkt ook de toetsstatistieken van de leerling bij
+        self.recorder.on_flush = current_user.key_stats.add_chunk if current_user else None
+        
+        self.title_label.configure(text=self.lesson.title)
+        self.instructions_label.configure(text=self.lesson.instructions)
+        self.stats_label.configure(text="")
+        self.show_item()
+        if not self.items:
+            # Een les zonder items kan niet worden afgerond: terug naar het dashboard
+            self.frame.after_idle(self.on_back)
+            
+    def setup_ui(self):
+        """Stel de gebruikersinterface in"""
+        background = self.theme.color("background")
+        
+        # Hoofdframe
+        self.frame = tk.Frame(self.parent, bg=background)
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Titel en instructies
+        self.title_label = tk.Label(
+            self.frame,
+            text="",
+            font=self.theme.font("title"),
+            fg=self.theme.color("primary"),
+            bg=background
+        )
+        self.title_label.pack(pady=(30, 10))
+        
+        self.instructions_label = tk.Label(
+            self.frame,
+            text="",
+            font=self.theme.font("body"),
+            bg=background
+        )
+        self.instructions_label.pack(pady=(0, 30))
+        
+        # Te typen tekst; elke letter krijgt een eigen kleur via tags
+        self.target_text = tk.Text(
+            self.frame,
+            height=1,
+            width=40,
+            font=self.theme.font("target"),
+            relief=tk.FLAT,
+            bg="white",
+            cursor="arrow"
+        )
+        self.target_text.tag_configure("center", justify=tk.CENTER)
+        self.target_text.tag_configure("correct", foreground=self.theme.color("success"))
+        self.target_text.tag_configure("error", foreground="white",
+                                       background=self.theme.color("error"))
+        self.target_text.tag_configure("cursor", underline=True)
+        self.target_text.pack(pady=20)
+        
+        # Toetsaanslagen gaan rechtstreeks naar de score-engine
+        self.target_text.bind('<Key>', self.on_key)
+        
+        # Voortgang
+        self.stats_label = tk.Label(
+            self.frame,
+            text="",
+            font=self.theme.font("body"),
+            fg=self.theme.color("secondary"),
+            bg=background
+        )
+        self.stats_label.pack(pady=10)
+        
+        self.progress_label = tk.Label(
+            self.frame,
+            text="",
+            font=self.theme.font("body"),
+            bg=background
+        )
+        self.progress_label.pack(pady=5)
+        
+        # Knoppen
+        back_button = tk.Button(
+            self.frame,
+            text="← Terug",
+            font=self.theme.font("button"),
+            bg=self.theme.color("accent"),
+            fg="white",
+            command=self.on_back
+        )
+        back_button.pack(pady=30)
+        
+    def show_item(self):
+        """Toon het huidige item"""
+        item = self.items[self.item_index] if self.items else ""
+        self.engine.start_item(item)
+        self.recorder.pause()
+        
+        self.target_text.configure(state=tk.NORMAL)
+        self.target_text.delete("1.0", tk.END)
+        self.target_text.insert("1.0", item, "center")
+        self.target_text.configure(state=tk.DISABLED)
+        self.move_cursor()
+        self.target_text.focus_set()
+        
+        self.progress_label.configure(
+            text=f"Item {self.item_index + 1} van {len(self.items)}"
+        )
+        
+    def move_cursor(self):
+        """Onderstreep de letter die nu getypt moet worden"""
+        position = self.engine.position
+        # Alleen rond de cursor bijwerken, niet de hele regel
+        self.target_text.tag_remove("cursor", f"1.{max(position - 1, 0)}", f"1.{position + 2}")
+        self.target_text.tag_add("cursor", f"1.{position}")
+        
+    def on_key(self, event):
+        """Verwerk één toetsaanslag"""
+        if event.keysym == "BackSpace":
+            position = self.engine.position - 1
+            if self.engine.backspace():
+                self.recorder.record("", False, backspace=True)
+                self.target_text.tag_remove("correct", f"1.{position}")
+                self.target_text.tag_remove("error", f"1.{position}")
+        elif event.char and event.char.isprintable():
+            position = self.engine.position
+            if position >= len(self.engine.target):
+                return "break"
+            correct = self.engine.key(event.char)
+            if self.sound:
+                self.sound.play("click" if correct else "error")
+            self.recorder.record(self.engine.target[position], correct)
+            self.target_text.tag_add("correct" if correct else "error", f"1.{position}")
+        else:
+            return None
+            
+        self.move_cursor()
+        self.update_stats()
+        
+        if self.engine.item_complete:
+            self.next_item()
+        return "break"
+        
+    def update_stats(self):
+        """Toon de lopende snelheid en nauwkeurigheid"""
+        self.stats_label.configure(
+            text=f"Snelheid: {self.engine.speed:.0f} WPM   "
+                 f"Nauwkeurigheid: {self.engine.accuracy:.0f}%"
+        )
+        
+    def next_item(self):
+        """Ga naar het volgende item of rond de les af"""
+        self.engine.finish_item()
+        self.item_index += 1
+        if self.item_index < len(self.items):
+            self.show_item()
+        else:
+            self.recorder.flush()
+            result = self.engine.result()
+            self.on_complete(
+                self.lesson.lesson_id,
+                result["score"],
+                result["accuracy"],
+                result["speed"]
+            )
+            
+    def destroy(self):
+        """Verwijder het scherm"""
+        self.frame.destroy()
\ No newline at end of file
@@ -8,57 +8,68 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Callable
 
+from ..utils.startup import resolve
+
 class LoginScreen:
     """Loginscherm voor de typecursus"""
     
-    def __init__(self, parent, user_manager, on_login_success: Callable):
+    def __init__(self, parent, user_manager, theme, on_login_success: Callable):
         self.parent = parent
-        self.user_manager = user_manager
+        # Mag een Deferred zijn: het scherm staat er al terwijl de gebruikers laden
+        self._user_manager = user_manager
+        self.theme = theme
         self.on_login_success = on_login_success
         
         self.setup_ui()
         
+    @property
+    def user_manager(self):
+        """Gebruikersmanager (wacht zo nodig tot hij geladen is)"""
+        return resolve(self._user_manager)
+        
     def setup_ui(self):
         """Stel de gebruikersinterface in"""
+        background = self.theme.color("background")
+        
         # Hoofdframe
-        self.frame = tk.Frame(self.parent, bg="#F5F5F5")
+        self.frame = tk.Frame(self.parent, bg=background)
         self.frame.pack(fill=tk.BOTH, expand=True)
         
         # Titel
         title_label = tk.Label(
             self.frame,
             text="Welkom bij de Kinder Typecursus!",
-            font=("Comic Sans MS", 28, "bold"),
-            fg="#4CAF50",
-            bg="#F5F5F5"
+            font=self.theme.font("display"),
+            fg=self.theme.color("primary"),
+            bg=background
         )
         title_label.pack(pady=(50, 30))
         
         subtitle_label = tk.Label(
             self.frame,
             text="Leer typen met plezier! 🎉",
-            font=("Comic Sans MS", 18),
-            fg="#2196F3",
-            bg="#F5F5F5"
+            font=self.theme.font("subtitle"),
+            fg=self.theme.color("secondary"),
+            bg=background
         )
         subtitle_label.pack(pady=(0, 50))
         
         # Login frame
-        login_frame = tk.Frame(self.frame, bg="#F5F5F5")
+        login_frame = tk.Frame(self.frame, bg=background)
         login_frame.pack(pady=20)
         
         # Gebruikersnaam
         username_label = tk.Label(
             login_frame,
             text="Jouw naam:",
-            font=("Comic Sans MS", 16, "bold"),
-            bg="#F5F5F5"
+            font=self.theme.font("label"),
+            bg=background
         )
         username_label.pack(pady=10)
         
         self.username_entry = tk.Entry(
             login_frame,
-            font=("Comic Sans MS", 16),
+            font=self.theme.font("entry"),
             width=20
         )
         self.username_entry.pack(pady=5)
@@ -68,8 +79,8 @@ class LoginScreen:
         age_label = tk.Label(
             login_frame,
             text="Jouw leeftijd:",
-            font=("Comic Sans MS", 16, "bold"),
-            bg="#F5F5F5"
+            font=self.theme.font("label"),
+            bg=background
         )
         age_label.pack(pady=10)
         
@@ -79,20 +90,20 @@ class LoginScreen:
             from_=8,
             to=12,
             textvariable=self.age_var,
-            font=("Comic Sans MS", 16),
+            font=self.theme.font("entry"),
             width=10
         )
         age_spinbox.pack(pady=5)
         
         # Knoppen
-        button_frame = tk.Frame(login_frame, bg="#F5F5F5")
+        button_frame = tk.Frame(login_frame, bg=background)
         button_frame.pack(pady=30)
         
         login_button = tk.Button(
             button_frame,
             text="Start Typen! 🚀",
-            font=("Comic Sans MS", 16, "bold"),
-            bg="#4CAF50",
+            font=self.theme.font("large_button"),
+            bg=self.theme.color("primary"),
             fg="white",
             command=self.login_or_create_user,
             width=15,
@@ -103,6 +114,16 @@ class LoginScreen:
         # Bind Enter toets
         self.username_entry.bind('<Return>', lambda e: self.login_or_create_user())
         
+    def refresh(self):
+        """Maak de velden leeg voor de volgende leerling"""
+        self.username_entry.delete(0, tk.END)
+        self.age_var.set("10")
+        self.username_entry.focus()
+        
+    def destroy(self):
+        """Verwijder het scherm"""
+        self.frame.destroy()
+        
     def login_or_create_user(self):
         """Log in of maak een nieuwe gebruiker aan"""
         username = self.username_entry.get().strip()
@@ -6,26 +6,41 @@ Hoofdvenster voor de Kinder Typecursus
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Optional
+from typing import Callable, Dict, Optional
 
+from ..utils.startup import resolve
+from .autosave import Autosaver
 from .login_screen import LoginScreen
-from .dashboard import Dashboard
-from .lesson_screen import LessonScreen
-from .profile_screen import ProfileScreen
-from .settings_screen import SettingsScreen
+from .theme import Theme
 
 class MainWindow:
     """Hoofdvenster van de typecursus applicatie"""
     
-    def __init__(self, root, user_manager, lesson_manager, config):
-        """Initialiseer het hoofdvenster"""
+    # Pas geïmporteerd wanneer ze nodig zijn (of vooraf op de achtergrond)
+    SCREEN_MODULES = (
+        "src.gui.dashboard",
+        "src.gui.lesson_screen",
+        "src.gui.profile_screen",
+        "src.gui.settings_screen"
+    )
+    
+    def __init__(self, root, user_manager, lesson_manager, config, sound=None):
+        """Initialiseer het hoofdvenster; de managers mogen nog op de achtergrond laden"""
         self.root = root
-        self.user_manager = user_manager
-        self.lesson_manager = lesson_manager
+        self._user_manager = user_manager
+        self._lesson_manager = lesson_manager
         self.config = config
+        self.sound = sound
+        
+        # Lettertypen, kleuren en stijlen één keer opgelost en door alle schermen gedeeld
+        self.theme = Theme(root, config)
         
-        # Huidige scherm
+        # Huidige scherm; elk scherm wordt één keer gebouwd en daarna hergebruikt
         self.current_screen = None
+        self.screens: Dict[str, object] = {}
+        
+        # Voortgang na elke les direct bewaren zonder de Tk-thread te laten wachten
+        self.autosaver = Autosaver(root, user_manager, self.on_autosaved)
         
         # Stel de interface in
         self.setup_interface()
@@ -33,97 +48,139 @@ class MainWindow:
         # Toon het loginscherm
         self.show_login_screen()
         
+    @property
+    def user_manager(self):
+        """Gebruikersmanager (wacht zo nodig tot hij op de achtergrond geladen is)"""
+        return resolve(self._user_manager)
+        
+    @property
+    def lesson_manager(self):
+        """Lesmanager (wacht zo nodig tot hij op de achtergrond geladen is)"""
+        return resolve(self._lesson_manager)
+        
     def setup_interface(self):
         """Stel de basis interface in"""
         # Configureer het hoofdvenster
-        self.root.configure(bg=self.config.get("colors.background", "#F5F5F5"))
+        self.root.configure(bg=self.theme.color("background"))
+        
+        # Statusregel onderaan (eerst ingepakt zodat hij altijd ruimte houdt)
+        self.status_label = tk.Label(
+            self.root,
+            text="",
+            font=self.theme.font("body"),
+            fg=self.theme.color("secondary"),
+            bg=self.theme.color("background")
+        )
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_clear_id = None
         
         # Maak een hoofdframe
-        self.main_frame = tk.Frame(self.root, bg=self.config.get("colors.background", "#F5F5F5"))
+        self.main_frame = tk.Frame(self.root, bg=self.theme.color("background"))
         self.main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-        # Stel lettertypen in
-        self.setup_fonts()
-        
-    def setup_fonts(self):
-        """Stel de lettertypen in"""
-        fonts = self.config.get_fonts()
-        
-        # Configureer standaard lettertypen
-        default_font = fonts.get("body", ("Comic Sans MS", 14))
-        self.root.option_add("*Font", default_font)
-        
-        # Configureer specifieke lettertypen
-        style = ttk.Style()
-        style.configure("Title.TLabel", font=fonts.get("title", ("Comic Sans MS", 24, "bold")))
-        style.configure("Heading.TLabel", font=fonts.get("heading", ("Comic Sans MS", 18, "bold")))
-        style.configure("Body.TLabel", font=fonts.get("body", ("Comic Sans MS", 14)))
-        style.configure("Button.TButton", font=fonts.get("button", ("Comic Sans MS", 12, "bold")))
-        
+    def apply_theme(self):
+        """Werk het thema bij; bij nieuwe kleuren worden de bewaarde schermen opnieuw gebouwd"""
+        # Gewijzigde lettertypen passen zich vanzelf aan, kleuren niet
+        if self.theme.refresh():
+            self.destroy_screens()
+            self.root.configure(bg=self.theme.color("background"))
+            self.main_frame.configure(bg=self.theme.color("background"))
+            self.status_label.configure(bg=self.theme.color("background"))
+            
     def clear_current_screen(self):
-        """Verwijder het huidige scherm"""
+        """Verberg het huidige scherm (het blijft bewaard voor hergebruik)"""
         if self.current_screen:
-            self.current_screen.destroy()
+            self.current_screen.frame.pack_forget()
             self.current_screen = None
             
+    def destroy_screens(self):
+        """Verwijder alle bewaarde schermen (bijv. na het wisselen van thema)"""
+        self.clear_current_screen()
+        for screen in self.screens.values():
+            screen.destroy()
+        self.screens = {}
+        
+    def show_screen(self, name: str, create: Callable, *args):
+        """Toon een scherm: de eerste keer bouwen, daarna alleen verversen met args"""
+        self.apply_theme()
+        screen = self.screens.get(name)
+        if screen is not None and screen is self.current_screen:
+            screen.refresh(*args)
+            return screen
+            
+        self.clear_current_screen()
+        if screen is None:
+            # Nieuw gebouwde schermen pakken hun frame zelf in
+            screen = create()
+            self.screens[name] = screen
+        else:
+            # Eerst bijwerken, dan pas tonen: zo is er maar één nieuw frame
+            screen.refresh(*args)
+            screen.frame.pack(fill=tk.BOTH, expand=True)
+        self.current_screen = screen
+        return screen
+        
     def show_login_screen(self):
         """Toon het loginscherm"""
-        self.clear_current_screen()
-        self.current_screen = LoginScreen(
+        self.show_screen("login", lambda: LoginScreen(
             self.main_frame, 
-            self.user_manager, 
+            self._user_manager, 
+            self.theme,
             self.on_login_success
-        )
+        ))
         
     def show_dashboard(self):
         """Toon het dashboard"""
-        self.clear_current_screen()
-        self.current_screen = Dashboard(
+        from .dashboard import Dashboard
+        self.show_screen("dashboard", lambda: Dashboard(
             self.main_frame,
             self.user_manager,
             self.lesson_manager,
             self.config,
+            self.theme,
             self.on_start_lesson,
             self.on_show_profile,
             self.on_show_settings,
             self.on_logout
-        )
+        ))
         
     def show_lesson_screen(self, lesson_id: str):
         """Toon het lesscherm"""
-        self.clear_current_screen()
+        from .lesson_screen import LessonScreen
         lesson = self.lesson_manager.get_lesson(lesson_id)
         if lesson:
-            self.current_screen = LessonScreen(
+            self.show_screen("lesson", lambda: LessonScreen(
                 self.main_frame,
                 lesson,
                 self.user_manager,
                 self.config,
+                self.theme,
                 self.on_lesson_completed,
-                self.on_return_to_dashboard
-            )
+                self.on_return_to_dashboard,
+                self.sound
+            ), lesson)
         else:
             messagebox.showerror("Fout", "Les niet gevonden!")
             self.show_dashboard()
             
     def show_profile_screen(self):
         """Toon het profielscherm"""
-        self.clear_current_screen()
-        self.current_screen = ProfileScreen(
+        from .profile_screen import ProfileScreen
+        self.show_screen("profile", lambda: ProfileScreen(
             self.main_frame,
             self.user_manager,
             self.config,
             self.on_return_to_dashboard
-        )
+        ))
         
     def show_settings_screen(self):
         """Toon het instellingenscherm"""
-        self.clear_current_screen()
-        self.current_screen = SettingsScreen(
+        from .settings_screen import SettingsScreen
+        self.show_screen("settings", lambda: SettingsScreen(
             self.main_frame,
             self.config,
             self.on_return_to_dashboard
-        )
+        ))
         
     def on_login_success(self, user):
         """Callback voor succesvolle login"""
@@ -139,19 +196,42 @@ class MainWindow:
         current_user = self.user_manager.get_current_user()
         if current_user:
             current_user.complete_lesson(lesson_id, score, accuracy, speed)
+            self.autosaver.save(current_user)
             
             # Toon resultaat
             self.show_lesson_result(lesson_id, score, accuracy, speed)
             
+    def on_autosaved(self, name: str, ok: bool):
+        """Callback van de autosaver (op de Tk-thread)"""
+        if ok:
+            self.show_status(f"Voortgang van {name} opgeslagen", "secondary")
+        else:
+            # Bij afsluiten wordt de huidige leerling nog een keer opgeslagen
+            self.show_status(f"Opslaan van de voortgang van {name} is mislukt", "error")
+            
+    def show_status(self, text: str, color: str, duration_ms: int = 4000):
+        """Toon kort een melding op de statusregel"""
+        if self.status_clear_id is not None:
+            self.root.after_cancel(self.status_clear_id)
+        self.status_label.configure(text=text, fg=self.theme.color(color))
+        self.status_clear_id = self.root.after(duration_ms, self.clear_status)
+        
+    def clear_status(self):
+        """Maak de statusregel leeg"""
+        self.status_clear_id = None
+        self.status_label.configure(text="")
+        
     def show_lesson_result(self, lesson_id: str, score: int, accuracy: float, speed: float):
         """Toon het resultaat van een voltooide les"""
         lesson = self.lesson_manager.get_lesson(lesson_id)
+        if self.sound:
+            self.sound.play("complete")
         
         # Maak resultaatvenster
         result_window = tk.Toplevel(self.root)
         result_window.title("Les Voltooid!")
         result_window.geometry("400x300")
-        result_window.configure(bg=self.config.get("colors.background", "#F5F5F5"))
+        result_window.configure(bg=self.theme.color("background"))
         
         # Centreren
         result_window.transient(self.root)
@@ -161,53 +241,53 @@ class MainWindow:
         title_label = tk.Label(
             result_window,
             text="Gefeliciteerd!",
-            font=self.config.get_fonts().get("title", ("Comic Sans MS", 24, "bold")),
-            fg=self.config.get("colors.primary", "#4CAF50"),
-            bg=self.config.get("colors.background", "#F5F5F5")
+            font=self.theme.font("title"),
+            fg=self.theme.color("primary"),
+            bg=self.theme.color("background")
         )
         title_label.pack(pady=(20, 10))
         
         lesson_label = tk.Label(
             result_window,
             text=f"Les: {lesson.title if lesson else 'Onbekend'}",
-            font=self.config.get_fonts().get("heading", ("Comic Sans MS", 18, "bold")),
-            bg=self.config.get("colors.background", "#F5F5F5")
+            font=self.theme.font("heading"),
+            bg=self.theme.color("background")
         )
         lesson_label.pack(pady=5)
         
         score_label = tk.Label(
             result_window,
             text=f"Score: {score} punten",
-            font=self.config.get_fonts().get("body", ("Comic Sans MS", 14)),
-            bg=self.config.get("colors.background", "#F5F5F5")
+            font=self.theme.font("body"),
+            bg=self.theme.color("background")
         )
         score_label.pack(pady=5)
         
         accuracy_label = tk.Label(
             result_window,
             text=f"Nauwkeurigheid: {accuracy:.1f}%",
-            font=self.config.get_fonts().get("body", ("Comic Sans MS", 14)),
-            bg=self.config.get("colors.background", "#F5F5F5")
+            font=self.theme.font("body"),
+            bg=self.theme.color("background")
         )
         accuracy_label.pack(pady=5)
         
         speed_label = tk.Label(
             result_window,
             text=f"Snelheid: {speed:.1f} WPM",
-            font=self.config.get_fonts().get("body", ("Comic Sans MS", 14)),
-            bg=self.config.get("colors.background", "#F5F5F5")
+            font=self.theme.font("body"),
+            bg=self.theme.color("background")
         )
         speed_label.pack(pady=5)
         
         # Knoppen
-        button_frame = tk.Frame(result_window, bg=self.config.get("colors.background", "#F5F5F5"))
+        button_frame = tk.Frame(result_window, bg=self.theme.color("background"))
         button_frame.pack(pady=20)
         
         continue_button = tk.Button(
             button_frame,
             text="Doorgaan",
-            font=self.config.get_fonts().get("button", ("Comic Sans MS", 12, "bold")),
-            bg=self.config.get("colors.primary", "#4CAF50"),
+            font=self.theme.font("button"),
+            bg=self.theme.color("primary"),
             fg="white",
             command=lambda: [result_window.destroy(), self.show_dashboard()]
         )
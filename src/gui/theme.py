@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Thema voor de Kinder Typecursus
+
+Lost de kleuren en lettertypen uit de configuratie één keer op naar
+gedeelde tkinter.font.Font-objecten en ttk-stijlen. Alle schermen
+gebruiken dezelfde objecten; wijzigt een lettertype, dan past Tk alle
+widgets die het gebruiken vanzelf aan.
+"""
+
+import tkinter.font as tkfont
+from tkinter import ttk
+from typing import Dict, Optional, Sequence, Tuple
+
+class Theme:
+    """Gedeelde lettertypen, kleuren en ttk-stijlen voor alle schermen"""
+    
+    DEFAULT_FONTS: Dict[str, Tuple] = {
+        "title": ("Comic Sans MS", 24, "bold"),
+        "heading": ("Comic Sans MS", 18, "bold"),
+        "body": ("Comic Sans MS", 14),
+        "button": ("Comic Sans MS", 12, "bold"),
+        # Niet in de configuratie, wel op de schermen nodig
+        "display": ("Comic Sans MS", 28, "bold"),
+        "subtitle": ("Comic Sans MS", 18),
+        "label": ("Comic Sans MS", 16, "bold"),
+        "entry": ("Comic Sans MS", 16),
+        "large_button": ("Comic Sans MS", 16, "bold"),
+        "target": ("Courier New", 32, "bold")
+    }
+    
+    DEFAULT_COLORS: Dict[str, str] = {
+        "primary": "#4CAF50",
+        "secondary": "#2196F3",
+        "accent": "#FF9800",
+        "success": "#4CAF50",
+        "error": "#F44336",
+        "warning": "#FF9800",
+        "background": "#F5F5F5",
+        "text": "#212121",
+        "disabled": "#E0E0E0",
+        "disabled_text": "#9E9E9E"
+    }
+    
+    def __init__(self, root, config):
+        """Initialiseer het thema en los het direct op"""
+        self.root = root
+        self.config = config
+        self.fonts: Dict[str, tkfont.Font] = {}
+        self.font_specs: Dict[str, Tuple] = {}
+        self.colors: Dict[str, str] = {}
+        # Verhoogd bij elke kleurwijziging; schermen met oude kleuren moeten opnieuw gebouwd worden
+        self.revision = 0
+        self._config_revision: Optional[int] = None
+        self.refresh()
+        
+    @staticmethod
+    def parse_font(spec: Sequence) -> Tuple[str, int, str, str]:
+        """Zet ("Familie", grootte, "bold italic") om naar (familie, grootte, gewicht, stijl)"""
+        family = spec[0]
+        size = int(spec[1]) if len(spec) > 1 else 12
+        options = " ".join(str(option) for option in spec[2:]).split()
+        weight = "bold" if "bold" in options else "normal"
+        slant = "italic" if "italic" in options else "roman"
+        return family, size, weight, slant
+        
+    def refresh(self) -> bool:
+        """Los het thema opnieuw op als de configuratie gewijzigd is; True als de kleuren veranderden"""
+        if self._config_revision == self.config.revision:
+            return False
+        self._config_revision = self.config.revision
+        
+        specs = dict(self.DEFAULT_FONTS)
+        specs.update(self.config.get_fonts())
+        fonts_changed = False
+        for name, spec in specs.items():
+            spec = tuple(spec)
+            if self.font_specs.get(name) == spec:
+                continue
+            family, size, weight, slant = self.parse_font(spec)
+            font = self.fonts.get(name)
+            if font is None:
+                self.fonts[name] = tkfont.Font(root=self.root, family=family, size=size,
+                                               weight=weight, slant=slant)
+            else:
+                # Bestaande widgets met dit lettertype passen zich vanzelf aan
+                font.configure(family=family, size=size, weight=weight, slant=slant)
+            self.font_specs[name] = spec
+            fonts_changed = True
+            
+        if fonts_changed:
+            self.configure_styles()
+            
+        colors = dict(self.DEFAULT_COLORS)
+        colors.update(self.config.get_theme_colors())
+        if colors == self.colors:
+            return False
+        self.colors = colors
+        self.revision += 1
+        return True
+        
+    def configure_styles(self):
+        """Koppel de gedeelde lettertypen aan de ttk-stijlen en de standaardfont"""
+        self.root.option_add("*Font", self.fonts["body"])
+        style = ttk.Style(self.root)
+        style.configure("Title.TLabel", font=self.fonts["title"])
+        style.configure("Heading.TLabel", font=self.fonts["heading"])
+        style.configure("Body.TLabel", font=self.fonts["body"])
+        style.configure("Button.TButton", font=self.fonts["button"])
+        
+    def font(self, name: str) -> tkfont.Font:
+        """Gedeeld lettertype bij naam (onbekende namen krijgen de tekstfont)"""
+        return self.fonts.get(name) or self.fonts["body"]
+        
+    def color(self, name: str) -> str:
+        """Kleur bij naam uit het actieve thema"""
+        return self.colors.get(name) or self.DEFAULT_COLORS.get(name, "#000000")
\ No newline at end of file
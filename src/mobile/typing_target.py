@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Te typen tekst voor het Kivy-lesscherm
+
+Een gewoon Label rastert zijn hele tekst opnieuw bij elke wijziging van
+tekst of kleur. Hier wordt elk item één keer naar een textuur gerenderd
+(met de x-positie van elke letter) en bewaard in een LRU-cache. Per
+aanslag verandert alleen de markering onder één letter en de cursor:
+een paar rechthoeken op het canvas, zonder nieuwe textuur.
+"""
+
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, InstructionGroup, Rectangle
+from kivy.uix.widget import Widget
+
+class TextureCache:
+    """Gerenderde items per (tekst, grootte, lettertype), de minst recent gebruikte vallen eruit"""
+    
+    def __init__(self, capacity: int = 128):
+        """Initialiseer een lege cache"""
+        self.capacity = capacity
+        self.entries: "OrderedDict[Tuple, Tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def get(self, text: str, font_size: float, font_name: str) -> Tuple[object, array]:
+        """Textuur en letterposities (len(text) + 1 grenzen in pixels) van een item"""
+        key = (text, font_size, font_name)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+            
+        self.misses += 1
+        label = CoreLabel(text=text, font_size=font_size, font_name=font_name)
+        label.refresh()
+        # Voorvoegsels meten houdt rekening met kerning; gebeurt maar één keer per item
+        offsets = array('f', [0.0])
+        offsets.extend(label.get_extents(text[:end])[0] for end in range(1, len(text) + 1))
+        entry = (label.texture, offsets)
+        self.entries[key] = entry
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return entry
+        
+    def clear(self):
+        """Vergeet alle texturen (nodig nadat Android de GL-context heeft weggegooid)"""
+        self.entries.clear()
+
+# Gedeeld door alle lesschermen: items komen in volgende sessies terug
+TEXTURE_CACHE = TextureCache()
+
+class TypingTarget(Widget):
+    """Te typen item als één vaste textuur met per letter een markering eronder"""
+    
+    CORRECT = (0.3, 0.8, 0.3, 0.5)
+    ERROR = (0.9, 0.3, 0.3, 0.8)
+    CURSOR = (1, 1, 1, 1)
+    CURSOR_HEIGHT = 3
+    
+    def __init__(self, font_size: float = 32, font_name: str = "Roboto",
+                 cache: Optional[TextureCache] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.font_size = font_size
+        self.font_name = font_name
+        self.cache = cache or TEXTURE_CACHE
+        self.text = ""
+        self.texture = None
+        self.offsets = array('f', [0.0])
+        self.origin = (0.0, 0.0)
+        self.cursor = 0
+        # Per letterpositie de kleur en rechthoek van de markering
+        self.marks: Dict[int, Tuple[Color, Rectangle]] = {}
+        
+        # Markeringen onder de tekst, cursor erboven
+        self.mark_group = InstructionGroup()
+        self.canvas.before.add(self.mark_group)
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self.text_rect = Rectangle(size=(0, 0))
+        with self.canvas.after:
+            Color(*self.CURSOR)
+            self.cursor_rect = Rectangle(size=(0, 0))
+            
+        self.bind(pos=self.update_layout, size=self.update_layout)
+        
+    def set_text(self, text: str):
+        """Toon een nieuw item (uit de cache als het eerder getoond is)"""
+        self.text = text
+        if text:
+            self.texture, self.offsets = self.cache.get(text, self.font_size, self.font_name)
+        else:
+            self.texture, self.offsets = None, array('f', [0.0])
+        self.text_rect.texture = self.texture
+        self.clear_marks()
+        self.cursor = 0
+        self.update_layout()
+        
+    def refresh_texture(self):
+        """Render het huidige item opnieuw, met behoud van markeringen en cursor"""
+        if self.text:
+            self.texture, self.offsets = self.cache.get(self.text, self.font_size, self.font_name)
+            self.text_rect.texture = self.texture
+            self.update_layout()
+            
+    def char_box(self, position: int) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """Positie en grootte van het vak rond één letter"""
+        x, y = self.origin
+        height = self.texture.height if self.texture is not None else 0
+        if position < len(self.text):
+            left, right = self.offsets[position], self.offsets[position + 1]
+        else:
+            # Achter het laatste teken: een halve regelhoogte breed
+            left = self.offsets[-1]
+            right = left + height / 2
+        return (x + left, y), (right - left, height)
+        
+    def mark(self, position: int, correct: bool):
+        """Markeer één letter als goed of fout getypt"""
+        rgba = self.CORRECT if correct else self.ERROR
+        entry = self.marks.get(position)
+        if entry is not None:
+            entry[0].rgba = rgba
+            return
+        pos, size = self.char_box(position)
+        color = Color(*rgba)
+        rect = Rectangle(pos=pos, size=size)
+        self.mark_group.add(color)
+        self.mark_group.add(rect)
+        self.marks[position] = (color, rect)
+        
+    def unmark(self, position: int):
+        """Haal de markering van één letter weg (na backspace)"""
+        entry = self.marks.pop(position, None)
+        if entry is not None:
+            self.mark_group.remove(entry[0])
+            self.mark_group.remove(entry[1])
+            
+    def clear_marks(self):
+        """Haal alle markeringen weg"""
+        self.mark_group.clear()
+        self.marks = {}
+        
+    def set_cursor(self, position: int):
+        """Onderstreep de letter die nu getypt moet worden"""
+        self.cursor = position
+        (x, y), (width, _) = self.char_box(position)
+        self.cursor_rect.pos = (x, y)
+        self.cursor_rect.size = (width, self.CURSOR_HEIGHT if self.text else 0)
+        
+    def update_layout(self, *args):
+        """Centreer de tekst en verplaats de markeringen mee (alleen bij wijzigen van grootte of positie)"""
+        width, height = self.texture.size if self.texture is not None else (0, 0)
+        self.origin = (self.center_x - width / 2, self.center_y - height / 2)
+        self.text_rect.pos = self.origin
+        self.text_rect.size = (width, height)
+        for position, (_, rect) in self.marks.items():
+            rect.pos, rect.size = self.char_box(position)
+        self.set_cursor(self.cursor)
\ No newline at end of file
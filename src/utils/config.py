@@ -6,14 +6,22 @@ Configuratiebestand voor de Kinder Typecursus
 
 import json
 import os
+import threading
+from contextlib import contextmanager
 from typing import Dict, Any
 
+from .persistence import atomic_write_bytes, get_scheduler
+
+# Markering voor sleutels die niet in de configuratie staan
+_MISSING = object()
+
 class Config:
     """Configuratieklasse voor de typecursus"""
     
-    def __init__(self):
+    def __init__(self, config_file: str = "config.json", scheduler=None):
         """Initialiseer de configuratie"""
-        self.config_file = "config.json"
+        self.config_file = config_file
+        self.scheduler = scheduler or get_scheduler()
         self.default_config = {
             "theme": "dieren",
             "sound_enabled": True,
@@ -44,10 +52,24 @@ class Config:
             "lessons": {
                 "letters_per_lesson": 5,
                 "words_per_lesson": 10,
-                "sentences_per_lesson": 3
+                "sentences_per_lesson": 3,
+                "word_list": ""  # woordenlijst (.txt, één woord per regel, of voorbewerkt .corpus)
+            },
+            "storage": {
+                "users_backend": "sqlite"  # 'sqlite' of 'shards' (één bestand per leerling)
             }
         }
         
+        # Cache van opgeloste sleutelpaden, gewist bij elke wijziging
+        self._cache: Dict[str, Any] = {}
+        # Verhoogd bij elke wijziging, zodat afgeleide caches (zoals het thema) weten wanneer ze verlopen
+        self.revision = 0
+        
+        # Samenvoegen van schrijfacties via de gedeelde opslagplanner
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._batch_depth = 0
+        
         self.config = self.load_config()
         
     def load_config(self) -> Dict[str, Any]:
@@ -70,39 +92,77 @@ class Config:
             if config is None:
                 config = self.config
                 
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            with self._lock:
+                text = json.dumps(config, indent=2, ensure_ascii=False)
+            atomic_write_bytes(self.config_file, text.encode('utf-8'))
         except Exception as e:
             print(f"Fout bij opslaan configuratie: {e}")
             
     def get(self, key: str, default: Any = None) -> Any:
         """Haal een configuratiewaarde op"""
-        keys = key.split('.')
-        value = self.config
-        
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING and key not in self._cache:
+            value = self.config
+            try:
+                for k in key.split('.'):
+                    value = value[k]
+            except (KeyError, TypeError):
+                value = _MISSING
+            self._cache[key] = value
             
+        return default if value is _MISSING else value
+        
     def set(self, key: str, value: Any):
         """Stel een configuratiewaarde in"""
         keys = key.split('.')
-        config = self.config
         
-        # Navigeer naar de juiste locatie
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
+        with self._lock:
+            config = self.config
+            
+            # Navigeer naar de juiste locatie
+            for k in keys[:-1]:
+                if k not in config:
+                    config[k] = {}
+                config = config[k]
+                
+            # Stel de waarde in
+            config[keys[-1]] = value
+            self._cache.clear()
+            self.revision += 1
             
-        # Stel de waarde in
-        config[keys[-1]] = value
+            # Sla de configuratie (samengevoegd) op
+            self._dirty = True
+            if self._batch_depth == 0:
+                self._schedule_flush()
+                
+    @contextmanager
+    def batch(self):
+        """Voeg alle wijzigingen binnen dit blok samen tot één schrijfactie"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._dirty:
+                    self._schedule_flush(delay=0)
+                    
+    def _schedule_flush(self, delay: float = None):
+        """Plan een schrijfactie op de achtergrond; latere wijzigingen schuiven hem op"""
+        self.scheduler.mark_dirty(("config", self.config_file), self._write_pending, delay)
         
-        # Sla de configuratie op
+    def _write_pending(self):
+        """Schrijf de configuratie weg als er iets gewijzigd is"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
         self.save_config()
+            
+    def flush(self):
+        """Schrijf openstaande wijzigingen direct weg"""
+        self._write_pending()
         
     def get_theme_colors(self) -> Dict[str, str]:
         """Haal de kleuren voor het huidige thema op"""
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Toetsaanslaglogboek voor de Kinder Typecursus
+
+Elke aanslag wordt als vast record van 8 bytes in een vooraf gereserveerde
+ringbuffer geschreven: verwachte toets (Unicode-codepunt), tijd sinds de
+vorige aanslag in milliseconden en vlaggen (correct, backspace). Bij het
+afronden van een les gaat de buffer als één blok naar een binair logboek
+per leerling. De lezer telt per toets en per lettercombinatie de
+gemiddelde reactietijd en het foutpercentage.
+"""
+
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .persistence import get_scheduler
+
+RECORD = struct.Struct('<IHBx')
+MAGIC = b"TKL1"
+
+FLAG_CORRECT = 1
+FLAG_BACKSPACE = 2
+
+# Langere pauzes worden afgekapt; ze zeggen niets over de toets zelf
+MAX_DELTA_MS = 0xFFFF
+
+_append_lock = threading.Lock()
+
+def keylog_path(user_name: str, directory: str = "keylogs") -> str:
+    """Bestandsnaam van het logboek van een leerling"""
+    safe = "".join(c if c.isalnum() else f"_{ord(c):x}" for c in user_name)
+    return os.path.join(directory, f"{safe}.tkl")
+
+def append_log(path: str, data: bytes):
+    """Voeg records toe aan een logboek (maakt het bestand zo nodig aan)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _append_lock:
+        new_file = not os.path.exists(path)
+        with open(path, 'ab') as f:
+            if new_file:
+                f.write(MAGIC)
+            f.write(data)
+
+class KeystrokeRecorder:
+    """Ringbuffer met vaste grootte voor toetsaanslagen"""
+    
+    def __init__(self, path: Optional[str] = None, capacity: int = 4096, scheduler=None):
+        """Reserveer de buffer vooraf; opnemen doet daarna geen allocaties"""
+        self.path = path
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * RECORD.size)
+        # Plaats van het oudste record en aantal records in de ring
+        self.start = 0
+        self.count = 0
+        self.last_time: Optional[float] = None
+        self.scheduler = scheduler or get_scheduler()
+        # Krijgt elk weggeschreven blok, bijvoorbeeld om lopende statistieken bij te werken
+        self.on_flush: Optional[Callable[[bytes], None]] = None
+        self._chunk = 0
+        
+    def record(self, expected: str, correct: bool, backspace: bool = False,
+               timestamp: Optional[float] = None):
+        """Neem één aanslag op"""
+        now = time.perf_counter() if timestamp is None else timestamp
+        if self.last_time is None:
+            delta = 0
+        else:
+            delta = int((now - self.last_time) * 1000)
+            if delta > MAX_DELTA_MS:
+                delta = MAX_DELTA_MS
+        self.last_time = now
+        
+        flags = (FLAG_CORRECT if correct else 0) | (FLAG_BACKSPACE if backspace else 0)
+        index = self.start + self.count
+        if index >= self.capacity:
+            index -= self.capacity
+        RECORD.pack_into(self.buffer, index * RECORD.size,
+                         ord(expected) if expected else 0, delta, flags)
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            # Geen bestemming bekend: het oudste record is net overschreven
+            self.start = index + 1 if index + 1 < self.capacity else 0
+        if self.count == self.capacity and self.path:
+            # Buffer vol: alvast wegschrijven en opnieuw beginnen
+            self.flush()
+            
+    def pause(self):
+        """Volgende aanslag telt niet als vervolg op de vorige (bijv. nieuw item)"""
+        self.last_time = None
+        
+    def flush(self, path: Optional[str] = None):
+        """Schrijf de opgenomen aanslagen op de achtergrond naar het logboek"""
+        path = path or self.path
+        if not self.count or not path:
+            return
+        begin = self.start * RECORD.size
+        end = begin + self.count * RECORD.size
+        with memoryview(self.buffer) as view:
+            if end <= len(self.buffer):
+                data = bytes(view[begin:end])
+            else:
+                # De ring is rond: eerst het oudste deel achteraan, dan het begin
+                data = b"".join((view[begin:], view[:end - len(self.buffer)]))
+        self.start = 0
+        self.count = 0
+        if self.on_flush is not None:
+            self.on_flush(data)
+        self._chunk += 1
+        # Elk blok een eigen sleutel: blokken mogen elkaar niet vervangen
+        self.scheduler.mark_dirty(("keylog", path, id(self), self._chunk),
+                                  lambda: append_log(path, data), delay=0)
+
+def iter_records(data: bytes) -> Iterator[Tuple[int, int, int]]:
+    """Loop over (codepunt, delta_ms, vlaggen) in een blok bytes"""
+    if data[:len(MAGIC)] == MAGIC:
+        data = data[len(MAGIC):]
+    usable = len(data) - len(data) % RECORD.size
+    return RECORD.iter_unpack(memoryview(data)[:usable])
+
+def read_log(path: str) -> bytes:
+    """Lees een volledig logboek"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _summarize(table: Dict) -> Dict[str, Dict]:
+    """Zet tellers om naar gemiddelde reactietijd en foutpercentage"""
+    summary = {}
+    for key, (count, errors, latency_total, latency_count) in table.items():
+        summary[key] = {
+            "count": count,
+            "errors": errors,
+            "error_rate": round(100.0 * errors / count, 1) if count else 0.0,
+            "mean_latency_ms": round(latency_total / latency_count, 1) if latency_count else 0.0
+        }
+    return summary
+
+def accumulate(data: bytes, keys: Dict[int, list], bigrams: Dict[Tuple[int, int], list]):
+    """Tel één blok op bij tellers [aantal, fouten, reactietijd, getimede aanslagen] per codepunt en paar"""
+    # Bewust één lus: zonder numpy is groeperen via Counter of sorteren gemeten trager
+    previous = 0
+    for code, delta, flags in iter_records(data):
+        if flags & FLAG_BACKSPACE:
+            previous = 0
+            continue
+        correct = flags & FLAG_CORRECT
+        # Delta 0 betekent: eerste aanslag na een pauze, geen bruikbare reactietijd
+        timed = 1 if delta else 0
+        if not delta:
+            previous = 0
+        
+        entry = keys.get(code)
+        if entry is None:
+            entry = keys[code] = [0, 0, 0, 0]
+        entry[0] += 1
+        entry[1] += 0 if correct else 1
+        entry[2] += delta
+        entry[3] += timed
+        
+        if previous:
+            pair = bigrams.get((previous, code))
+            if pair is None:
+                pair = bigrams[(previous, code)] = [0, 0, 0, 0]
+            pair[0] += 1
+            pair[1] += 0 if correct else 1
+            pair[2] += delta
+            pair[3] += timed
+        previous = code if correct else 0
+
+def aggregate(chunks: Iterable[bytes]) -> Dict[str, Dict[str, Dict]]:
+    """Tel per toets en per lettercombinatie aanslagen, fouten en reactietijd"""
+    keys: Dict[int, list] = {}
+    bigrams: Dict[Tuple[int, int], list] = {}
+    for data in chunks:
+        accumulate(data, keys, bigrams)
+        
+    return {
+        "keys": _summarize({chr(code): entry for code, entry in keys.items() if code}),
+        "bigrams": _summarize({
+            chr(first) + chr(second): entry for (first, second), entry in bigrams.items()
+        })
+    }
+
+def aggregate_log(path: str) -> Dict[str, Dict[str, Dict]]:
+    """Statistieken per toets en lettercombinatie uit het logboek van een leerling"""
+    if not os.path.exists(path):
+        return {"keys": {}, "bigrams": {}}
+    return aggregate([read_log(path)])
\ No newline at end of file
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Opslagplanner voor de Kinder Typecursus
+
+Alle managers melden hier dat hun gegevens gewijzigd zijn. Een
+achtergrondthread voegt snelle meldingen samen en schrijft ze weg, zodat
+de Tk-hoofdlus nooit op de schijf hoeft te wachten.
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+def atomic_write_bytes(path: str, data: bytes):
+    """Schrijf bytes via een tijdelijk bestand en vervang het doel in één keer"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = 2):
+    """Schrijf JSON via een tijdelijk bestand en vervang het doel in één keer"""
+    text = json.dumps(data, indent=indent, ensure_ascii=False)
+    atomic_write_bytes(path, text.encode('utf-8'))
+
+class PersistenceScheduler:
+    """Achtergrondthread die opslagtaken samenvoegt en uitvoert"""
+    
+    # Standaard wachttijd (seconden) waarin meldingen voor dezelfde sleutel samenvallen
+    DEBOUNCE = 0.5
+    # Langste uitstel na de eerste melding, zodat blijvende wijzigingen toch geschreven worden
+    MAX_DELAY = 2.0
+    
+    def __init__(self, debounce: float = DEBOUNCE):
+        """Initialiseer de planner; de thread start bij de eerste melding"""
+        self.debounce = debounce
+        self._pending: Dict[Hashable, Tuple[float, float, Callable[[], None]]] = {}
+        self._running = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        
+    def mark_dirty(self, key: Hashable, job: Callable[[], None], delay: Optional[float] = None):
+        """Meld gewijzigde gegevens; een eerdere taak met dezelfde sleutel vervalt"""
+        if delay is None:
+            delay = self.debounce
+        with self._condition:
+            if self._stopped:
+                # Na afsluiten direct (synchroon) uitvoeren
+                self._run(job)
+                return
+            now = time.monotonic()
+            first = self._pending[key][1] if key in self._pending else now
+            when = min(now + delay, first + max(self.MAX_DELAY, delay))
+            self._pending[key] = (when, first, job)
+            self._ensure_thread()
+            self._condition.notify()
+            
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Voer alle openstaande taken nu uit en wacht tot ze klaar zijn"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._pending = {key: (0.0, first, job) for key, (_, first, job) in self._pending.items()}
+            self._condition.notify_all()
+            while self._pending or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                if self._thread is None or not self._thread.is_alive():
+                    # Geen thread (meer): voer de taken in deze thread uit
+                    pending, self._pending = self._pending, {}
+                    for _, _, job in pending.values():
+                        self._run(job)
+                    break
+                self._condition.wait(remaining)
+        return True
+        
+    def shutdown(self, timeout: Optional[float] = 10.0):
+        """Schrijf alles weg en stop de thread (aanroepen bij afsluiten)"""
+        self.flush(timeout)
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            
+    def _ensure_thread(self):
+        """Start de achtergrondthread als die nog niet draait"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._worker, name="persistence", daemon=True
+            )
+            self._thread.start()
+            
+    def _worker(self):
+        """Hoofdlus van de achtergrondthread"""
+        with self._condition:
+            while not self._stopped:
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+                    
+                now = time.monotonic()
+                due = [key for key, (when, _, _) in self._pending.items() if when <= now]
+                if not due:
+                    next_due = min(when for when, _, _ in self._pending.values())
+                    self._condition.wait(next_due - now)
+                    continue
+                    
+                jobs = [self._pending.pop(key)[2] for key in due]
+                self._running += 1
+                self._condition.release()
+                try:
+                    for job in jobs:
+                        self._run(job)
+                finally:
+                    self._condition.acquire()
+                    self._running -= 1
+                    self._condition.notify_all()
+                    
+    @staticmethod
+    def _run(job: Callable[[], None]):
+        """Voer één taak uit; fouten mogen de thread niet stoppen"""
+        try:
+            job()
+        except Exception as e:
+            print(f"Fout bij opslaan op de achtergrond: {e}")
+
+_scheduler: Optional[PersistenceScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> PersistenceScheduler:
+    """Haal de gedeelde opslagplanner op (wordt bij afsluiten altijd leeggemaakt)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PersistenceScheduler()
+            atexit.register(_scheduler.shutdown)
+        return _scheduler
\ No newline at end of file
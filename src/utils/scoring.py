@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Score-engine voor de Kinder Typecursus
+
+Verwerkt toetsaanslagen één voor één en houdt snelheid, nauwkeurigheid,
+foutposities en score bij. Elke aanslag (ook backspace) kost constante
+tijd; de getypte tekst wordt nooit opnieuw doorlopen. De engine weet
+niets van Tk of Kivy, zodat beide lesschermen hem kunnen gebruiken.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+class ScoringEngine:
+    """Houdt de voortgang van één les bij, toetsaanslag voor toetsaanslag"""
+    
+    # Gangbare definitie: één woord is vijf tekens
+    CHARS_PER_WORD = 5
+    
+    def __init__(self, reward_points: int = 10, clock: Callable[[], float] = time.monotonic):
+        """Initialiseer de engine; reward_points is de bonus per foutloos item"""
+        self.reward_points = reward_points
+        self.clock = clock
+        
+        # Huidig item
+        self.target = ""
+        self.typed: List[bool] = []       # per getypte positie: correct of niet
+        self.error_positions: Set[int] = set()
+        self.item_correct_chars = 0
+        self.item_had_error = False
+        
+        # Hele les
+        self.completed_correct_chars = 0
+        self.keystrokes = 0
+        self.error_keystrokes = 0
+        self.items_completed = 0
+        self.perfect_items = 0
+        self.start_time: Optional[float] = None
+        self.last_time: Optional[float] = None
+        
+    def start_item(self, target: str):
+        """Begin aan een nieuw item (letter, woord of zin)"""
+        self.target = target
+        self.typed = []
+        self.error_positions = set()
+        self.item_correct_chars = 0
+        self.item_had_error = False
+        
+    def _tick(self, timestamp: Optional[float]) -> float:
+        """Registreer het tijdstip van een aanslag"""
+        now = self.clock() if timestamp is None else timestamp
+        if self.start_time is None:
+            self.start_time = now
+        self.last_time = now
+        return now
+        
+    def key(self, char: str, timestamp: Optional[float] = None) -> bool:
+        """Verwerk een getypt teken; geeft terug of het correct was"""
+        self._tick(timestamp)
+        position = len(self.typed)
+        correct = position < len(self.target) and self.target[position] == char
+        
+        self.keystrokes += 1
+        self.typed.append(correct)
+        if correct:
+            self.item_correct_chars += 1
+        else:
+            self.error_keystrokes += 1
+            self.error_positions.add(position)
+            self.item_had_error = True
+        return correct
+        
+    def backspace(self, timestamp: Optional[float] = None) -> bool:
+        """Verwijder het laatst getypte teken; False als er niets te wissen was"""
+        self._tick(timestamp)
+        if not self.typed:
+            return False
+        position = len(self.typed) - 1
+        if self.typed.pop():
+            self.item_correct_chars -= 1
+        else:
+            self.error_positions.discard(position)
+        return True
+        
+    @property
+    def position(self) -> int:
+        """Positie van de cursor in het huidige item"""
+        return len(self.typed)
+        
+    @property
+    def item_complete(self) -> bool:
+        """Of het huidige item volledig en zonder openstaande fouten getypt is"""
+        return len(self.typed) == len(self.target) and not self.error_positions
+        
+    def finish_item(self) -> bool:
+        """Sluit het huidige item af; geeft terug of het foutloos was"""
+        self.completed_correct_chars += self.item_correct_chars
+        self.items_completed += 1
+        perfect = self.item_complete and not self.item_had_error
+        if perfect:
+            self.perfect_items += 1
+        self.start_item("")
+        return perfect
+        
+    @property
+    def correct_chars(self) -> int:
+        """Aantal correct getypte tekens in de hele les"""
+        return self.completed_correct_chars + self.item_correct_chars
+        
+    @property
+    def accuracy(self) -> float:
+        """Percentage aanslagen dat in één keer goed was"""
+        if not self.keystrokes:
+            return 100.0
+        return 100.0 * (self.keystrokes - self.error_keystrokes) / self.keystrokes
+        
+    @property
+    def elapsed(self) -> float:
+        """Verstreken tijd in seconden sinds de eerste aanslag"""
+        if self.start_time is None:
+            return 0.0
+        return self.last_time - self.start_time
+        
+    @property
+    def speed(self) -> float:
+        """Snelheid in woorden per minuut"""
+        minutes = self.elapsed / 60.0
+        if minutes <= 0:
+            return 0.0
+        return (self.correct_chars / self.CHARS_PER_WORD) / minutes
+        
+    @property
+    def score(self) -> int:
+        """Punten: correcte tekens gewogen met nauwkeurigheid plus bonus per foutloos item"""
+        return int(round(self.correct_chars * self.accuracy / 100.0)) + \
+            self.perfect_items * self.reward_points
+            
+    def result(self) -> Dict:
+        """Eindresultaat zoals MainWindow.on_lesson_completed het verwacht"""
+        return {
+            "score": self.score,
+            "accuracy": round(self.accuracy, 1),
+            "speed": round(self.speed, 1)
+        }
\ No newline at end of file
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geluidseffecten voor de Kinder Typecursus
+
+Alle effecten worden één keer gedecodeerd naar pygame.mixer.Sound en
+spelen af op een vaste pool van gereserveerde kanalen. Afspelen per
+toetsaanslag doet daardoor geen bestandstoegang en maakt geen nieuwe
+objecten aan. Ontbreekt een geluidsbestand, dan wordt een korte toon
+gegenereerd zodat er altijd feedback is.
+"""
+
+import math
+import os
+import time
+from array import array
+from typing import Dict, List, Tuple
+
+class SoundManager:
+    """Vooraf geladen geluidseffecten met een vaste kanaalpool"""
+    
+    # Effectnaam: (bestandsnaam, toonhoogte Hz, duur ms) voor de gegenereerde vervanging
+    EFFECTS: Dict[str, Tuple[str, int, int]] = {
+        "click": ("click.wav", 1800, 12),
+        "error": ("error.wav", 220, 120),
+        "complete": ("complete.wav", 880, 250),
+        "star": ("star.wav", 1320, 180)
+    }
+    
+    # Kleine mixerbuffer: 256 samples op 44,1 kHz is ongeveer 6 ms vertraging
+    FREQUENCY = 44100
+    BUFFER = 256
+    CHANNELS = 4
+    
+    def __init__(self, config=None, sound_dir: str = os.path.join("assets", "sounds"),
+                 channels: int = CHANNELS):
+        """Initialiseer de manager; pygame wordt pas in load() geïmporteerd"""
+        self.config = config
+        self.sound_dir = sound_dir
+        self.channel_count = channels
+        self.pygame = None
+        self.sounds: Dict[str, object] = {}
+        self.channels: List[object] = []
+        self.next_channel = 0
+        self.ready = False
+        self.enabled = config.get("sound_enabled", True) if config is not None else True
+        
+    def load(self) -> 'SoundManager':
+        """Start de mixer en decodeer alle effecten (geschikt voor een achtergrondthread)"""
+        try:
+            import pygame
+            pygame.mixer.pre_init(self.FREQUENCY, -16, 2, self.BUFFER)
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+                
+            # De pool komt bovenop de bestaande kanalen en is alleen voor effecten
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), self.channel_count))
+            pygame.mixer.set_reserved(self.channel_count)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+            
+            for name, (filename, pitch, duration) in self.EFFECTS.items():
+                path = os.path.join(self.sound_dir, filename)
+                if os.path.exists(path):
+                    self.sounds[name] = pygame.mixer.Sound(path)
+                else:
+                    self.sounds[name] = self._tone(pygame, pitch, duration)
+                    
+            self.pygame = pygame
+            self.ready = True
+        except Exception as e:
+            print(f"Fout bij laden geluiden: {e}")
+        return self
+        
+    @staticmethod
+    def _tone(pygame, pitch: int, duration: int):
+        """Genereer een korte, uitdovende sinustoon in het formaat van de mixer"""
+        frequency, _, channels = pygame.mixer.get_init()
+        count = frequency * duration // 1000
+        samples = array('h')
+        for i in range(count):
+            envelope = 1.0 - i / count
+            value = int(8000 * envelope * math.sin(2 * math.pi * pitch * i / frequency))
+            samples.extend([value] * channels)
+        return pygame.mixer.Sound(buffer=samples.tobytes())
+        
+    def refresh_settings(self):
+        """Lees sound_enabled opnieuw in (na wijzigen van de instellingen)"""
+        if self.config is not None:
+            self.enabled = self.config.get("sound_enabled", True)
+            
+    def play(self, name: str):
+        """Speel een effect af; kost geen bestandstoegang en geen allocaties"""
+        if not self.enabled or not self.ready:
+            return
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        # Vaste kanalen om de beurt; het oudste geluid wordt zo nodig afgebroken
+        channel = self.channels[self.next_channel]
+        self.next_channel = (self.next_channel + 1) % self.channel_count
+        channel.play(sound)
+        
+    def measure_latency(self, name: str = "click", repeats: int = 200) -> Dict:
+        """Meet de tijd van play() en schat de uitvoervertraging van de mixerbuffer"""
+        if not self.ready:
+            return {}
+        enabled, self.enabled = self.enabled, True
+        timings = []
+        try:
+            for _ in range(repeats):
+                start = time.perf_counter()
+                self.play(name)
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            self.enabled = enabled
+            self.pygame.mixer.stop()
+            
+        timings.sort()
+        frequency = self.pygame.mixer.get_init()[0]
+        return {
+            "effect": name,
+            "repeats": repeats,
+            "play_median_ms": round(timings[len(timings) // 2], 4),
+            "play_p99_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 4),
+            "buffer_samples": self.BUFFER,
+            "buffer_ms": round(1000.0 * self.BUFFER / frequency, 2),
+            # Geschatte vertraging van aanslag tot geluid: aanroep plus één buffer
+            "estimated_latency_ms": round(timings[len(timings) // 2] + 1000.0 * self.BUFFER / frequency, 2)
+        }
+        
+    def quit(self):
+        """Stop de mixer (bij afsluiten)"""
+        if self.pygame is not None:
+            self.ready = False
+            self.pygame.mixer.quit()
\ No newline at end of file
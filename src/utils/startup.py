@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Opstarthulpmiddelen voor de Kinder Typecursus
+
+Zware onderdelen (geluid, managers, schermmodules) worden op een
+achtergrondthread geladen terwijl het loginscherm al zichtbaar is.
+StartupProfiler houdt een tijdlijn van de koude start bij, zichtbaar
+met main.py --startup-profile.
+"""
+
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+# Zo vroeg mogelijk vastgelegd: main.py importeert deze module als eerste
+PROCESS_START = time.perf_counter()
+
+class StartupProfiler:
+    """Tijdlijn van de opstart in milliseconden sinds het begin van het proces"""
+    
+    def __init__(self, enabled: bool = False, start: Optional[float] = None):
+        """Initialiseer de profiler; enabled bepaalt alleen of er gerapporteerd wordt"""
+        self.enabled = enabled
+        self.start = PROCESS_START if start is None else start
+        # (begin, einde, thread, omschrijving); een moment heeft begin == einde
+        self.events: List[Tuple[float, float, str, str]] = []
+        self.lock = threading.Lock()
+        
+    def _add(self, begin: float, end: float, label: str):
+        """Leg een gebeurtenis vast (mag vanaf elke thread)"""
+        with self.lock:
+            self.events.append((begin, end, threading.current_thread().name, label))
+            
+    def elapsed_ms(self) -> float:
+        """Milliseconden sinds het begin van het proces"""
+        return (time.perf_counter() - self.start) * 1000
+        
+    def mark(self, label: str):
+        """Leg een moment vast, bijvoorbeeld het eerste frame"""
+        now = time.perf_counter()
+        self._add(now, now, label)
+        
+    @contextmanager
+    def phase(self, label: str):
+        """Meet de duur van een blok code"""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(begin, time.perf_counter(), label)
+            
+    def report(self) -> str:
+        """Tijdlijn als tekst, gesorteerd op begintijd"""
+        lines = [f"{'start ms':>10}{'duur ms':>10}  {'thread':<24}onderdeel"]
+        with self.lock:
+            events = sorted(self.events)
+        for begin, end, thread, label in events:
+            duration = f"{(end - begin) * 1000:.1f}" if end > begin else "-"
+            lines.append(
+                f"{(begin - self.start) * 1000:>10.1f}{duration:>10}  {thread:<24}{label}"
+            )
+        return "\n".join(lines)
+        
+    def print_report(self, file=None):
+        """Toon de tijdlijn (standaard op stderr)"""
+        print("Opstarttijdlijn:", file=file or sys.stderr)
+        print(self.report(), file=file or sys.stderr)
+
+class Deferred:
+    """Resultaat van een functie die op een achtergrondthread wordt uitgevoerd"""
+    
+    def __init__(self, factory: Callable[[], Any], name: str,
+                 profiler: Optional[StartupProfiler] = None):
+        """Start de functie direct; de functie mag Tk niet aanraken"""
+        self.name = name
+        self.profiler = profiler
+        self._factory = factory
+        self._value: Any = None
+        self._error: Optional[BaseException] = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"opstart-{name}", daemon=True)
+        self._thread.start()
+        
+    def _run(self):
+        """Voer de functie uit en bewaar de uitkomst of de fout"""
+        try:
+            if self.profiler is None:
+                self._value = self._factory()
+            else:
+                with self.profiler.phase(self.name):
+                    self._value = self._factory()
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._done.set()
+            
+    @property
+    def ready(self) -> bool:
+        """Of de functie klaar is (met of zonder fout)"""
+        return self._done.is_set()
+        
+    def result(self) -> Any:
+        """Haal het resultaat op en wacht zo nodig; een fout wordt hier opnieuw opgegooid"""
+        if not self._done.is_set():
+            if self.profiler is None:
+                self._done.wait()
+            else:
+                with self.profiler.phase(f"wachten op {self.name}"):
+                    self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+def resolve(value: Any) -> Any:
+    """Geef het resultaat van een Deferred, of de waarde zelf"""
+    return value.result() if isinstance(value, Deferred) else value
+
+def prefetch_modules(names: Iterable[str], profiler: Optional[StartupProfiler] = None,
+                     package: Optional[str] = None) -> Deferred:
+    """Importeer modules op de achtergrond zodat latere schermwissels niet hoeven te wachten"""
+    names = list(names)
+    
+    def load():
+        for name in names:
+            try:
+                importlib.import_module(name, package)
+            except Exception as e:
+                # Het scherm meldt de fout zelf wanneer het echt nodig is
+                print(f"Fout bij vooraf laden van {name}: {e}")
+                
+    return Deferred(load, "schermmodules", profiler)
\ No newline at end of file
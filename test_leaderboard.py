@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests voor de ranglijsten van de Kinder Typecursus
+"""
+
+import random
+
+import pytest
+
+from src.data.leaderboard import Leaderboards, RankedIndex
+
+def check_index(index, reference):
+    """Vergelijk een RankedIndex met een gesorteerde lijst"""
+    assert len(index) == len(reference)
+    assert list(index) == reference
+    for position, key in enumerate(reference):
+        assert index[position] == key
+        assert index.index(key) == position
+
+def test_insert_and_remove_against_sorted_list():
+    """Willekeurig invoegen en verwijderen geeft dezelfde volgorde en rangen als een gesorteerde lijst"""
+    rng = random.Random(1234)
+    index = RankedIndex(random.Random(1))
+    reference = []
+    for _ in range(2000):
+        if reference and rng.random() < 0.4:
+            key = rng.choice(reference)
+            index.remove(key)
+            reference.remove(key)
+        else:
+            key = (rng.randint(0, 50), rng.randint(0, 10 ** 6))
+            index.insert(key)
+            reference.append(key)
+            reference.sort()
+        if len(reference) % 97 == 0:
+            check_index(index, reference)
+    check_index(index, reference)
+
+def test_from_sorted():
+    """Een index uit gesorteerde sleutels is gelijk aan de lijst en blijft daarna bij te werken"""
+    reference = sorted(random.Random(5).sample(range(10 ** 6), 1000))
+    index = RankedIndex.from_sorted(reference, random.Random(1))
+    check_index(index, reference)
+    
+    index.insert(-1)
+    index.remove(reference[500])
+    reference = [-1] + reference[:500] + reference[501:]
+    check_index(index, reference)
+
+def test_missing_keys():
+    """Ontbrekende sleutels en posities geven een fout"""
+    index = RankedIndex.from_sorted([1, 2, 3])
+    with pytest.raises(KeyError):
+        index.remove(4)
+    with pytest.raises(KeyError):
+        index.index(0)
+    with pytest.raises(IndexError):
+        index[3]
+    assert len(RankedIndex()) == 0
+
+def test_leaderboards_against_brute_force():
+    """Top N en rang per meetwaarde en leeftijd vergeleken met sorteren van alle leerlingen"""
+    rng = random.Random(42)
+    boards = Leaderboards(random.Random(1))
+    pupils = {}
+    summaries = {
+        f"leerling{i}": {"age": rng.randint(8, 12), "total_points": rng.randint(0, 100),
+                         "typing_speed": 0, "accuracy": 0, "stars_earned": 0}
+        for i in range(200)
+    }
+    boards.load(summaries)
+    pupils.update(summaries)
+    
+    for _ in range(300):
+        name = f"leerling{rng.randint(0, 249)}"
+        if name in pupils and rng.random() < 0.2:
+            boards.remove(name)
+            del pupils[name]
+            continue
+        values = {"age": rng.randint(8, 12), "total_points": rng.randint(0, 100),
+                  "typing_speed": 0, "accuracy": 0, "stars_earned": 0}
+        boards.update(name, values["age"], values)
+        pupils[name] = values
+        
+    for age in (None, 8, 10, 12):
+        ranked = sorted(
+            ((-values["total_points"], name) for name, values in pupils.items()
+             if age is None or values["age"] == age)
+        )
+        expected_top = [(name, -points) for points, name in ranked[:10]]
+        assert boards.top("total_points", 10, age) == expected_top
+        assert boards.size("total_points", age) == len(ranked)
+        for position, (_, name) in enumerate(ranked):
+            assert boards.rank("total_points", name, age) == position + 1
+            
+    assert boards.rank("total_points", "onbekend") is None
+    with pytest.raises(ValueError):
+        boards.top("onbekend")
\ No newline at end of file
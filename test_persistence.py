@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests voor de opslagplanner van de Kinder Typecursus
+"""
+
+import json
+import os
+import threading
+import time
+
+from src.data.user_manager import UserManager
+from src.utils.persistence import PersistenceScheduler, atomic_write_json
+
+class FlakyStore:
+    """Gebruikersopslag in het geheugen die kan weigeren te schrijven"""
+    
+    def __init__(self):
+        self.saved = {}
+        self.fail = False
+        
+    def load_index(self):
+        return {}
+        
+    def save_user(self, data):
+        if self.fail:
+            raise OSError("schijf vol")
+        self.saved[data["name"]] = data
+
+def test_coalesced_writes_land_exactly_once():
+    """Snelle meldingen voor dezelfde sleutel geven één schrijfactie, met de laatste taak"""
+    scheduler = PersistenceScheduler(debounce=0.2)
+    runs = []
+    for number in range(20):
+        scheduler.mark_dirty("gebruiker", lambda number=number: runs.append(number))
+    assert scheduler.flush(timeout=5)
+    assert runs == [19]
+    
+    # Na het wegschrijven telt een nieuwe melding weer als eigen schrijfactie
+    scheduler.mark_dirty("gebruiker", lambda: runs.append(20), delay=0)
+    assert scheduler.flush(timeout=5)
+    assert runs == [19, 20]
+    scheduler.shutdown()
+
+def test_different_keys_are_not_coalesced():
+    """Elke sleutel wordt apart geschreven"""
+    scheduler = PersistenceScheduler(debounce=0.05)
+    runs = []
+    for key in ("anna", "bram", "cas"):
+        scheduler.mark_dirty(("user", key), lambda key=key: runs.append(key))
+    assert scheduler.flush(timeout=5)
+    assert sorted(runs) == ["anna", "bram", "cas"]
+    scheduler.shutdown()
+
+def test_debounce_delays_the_write():
+    """Een taak wacht zijn wachttijd af, daarna voert de thread hem uit zonder flush"""
+    scheduler = PersistenceScheduler()
+    done = threading.Event()
+    scheduler.mark_dirty("les", done.set, delay=0.3)
+    time.sleep(0.05)
+    assert not done.is_set()
+    assert done.wait(5)
+    scheduler.shutdown()
+
+def test_max_delay_bounds_a_stream_of_changes():
+    """Blijvende meldingen schuiven het schrijven hooguit MAX_DELAY na de eerste op"""
+    scheduler = PersistenceScheduler(debounce=0.2)
+    scheduler.MAX_DELAY = 0.3
+    runs = []
+    start = time.monotonic()
+    while time.monotonic() - start < 1.0:
+        scheduler.mark_dirty("config", lambda: runs.append(time.monotonic()))
+        time.sleep(0.02)
+    # Zonder bovengrens zou er nog niets geschreven zijn
+    assert runs
+    assert runs[0] - start < 0.9
+    scheduler.shutdown()
+
+def test_shutdown_flushes_pending_writes():
+    """Afsluiten schrijft ook taken weg waarvan de wachttijd nog niet om is"""
+    scheduler = PersistenceScheduler()
+    runs = []
+    scheduler.mark_dirty("a", lambda: runs.append("a"), delay=60)
+    scheduler.mark_dirty("b", lambda: runs.append("b"), delay=60)
+    scheduler.shutdown(timeout=5)
+    assert sorted(runs) == ["a", "b"]
+    
+    # Na afsluiten wordt een melding direct in de aanroepende thread uitgevoerd
+    scheduler.mark_dirty("c", lambda: runs.append("c"))
+    assert runs[-1] == "c"
+
+def test_failing_job_does_not_stop_the_thread(capsys):
+    """Een mislukte taak wordt gemeld; volgende taken worden gewoon uitgevoerd"""
+    scheduler = PersistenceScheduler(debounce=0)
+    runs = []
+    
+    def fail():
+        raise OSError("schijf vol")
+        
+    scheduler.mark_dirty("kapot", fail)
+    assert scheduler.flush(timeout=5)
+    scheduler.mark_dirty("heel", lambda: runs.append("heel"))
+    assert scheduler.flush(timeout=5)
+    assert runs == ["heel"]
+    assert "schijf vol" in capsys.readouterr().out
+    scheduler.shutdown()
+
+def test_save_user_reports_failure_and_success(capsys):
+    """De terugmelding van save_user krijgt False als de opslag faalt en True als het lukt"""
+    scheduler = PersistenceScheduler(debounce=0)
+    store = FlakyStore()
+    manager = UserManager(store=store, scheduler=scheduler)
+    user = manager.create_user("Anna", 9)
+    results = []
+    
+    store.fail = True
+    manager.save_user(user, on_saved=results.append)
+    assert scheduler.flush(timeout=5)
+    store.fail = False
+    user.add_stars(3)
+    manager.save_user(user, on_saved=results.append)
+    assert scheduler.flush(timeout=5)
+    
+    assert results == [False, True]
+    assert store.saved["Anna"]["stars_earned"] == 3
+    assert "schijf vol" in capsys.readouterr().out
+    scheduler.shutdown()
+
+def test_flush_without_thread_runs_in_caller():
+    """flush werkt ook als de thread nooit gestart of al gestopt is"""
+    scheduler = PersistenceScheduler()
+    runs = []
+    scheduler._pending["x"] = (time.monotonic() + 60, time.monotonic(), lambda: runs.append("x"))
+    assert scheduler.flush(timeout=5)
+    assert runs == ["x"]
+
+def test_atomic_write_json_leaves_no_temp_files(tmp_path):
+    """Atomair schrijven vervangt het doel en laat geen tijdelijke bestanden achter"""
+    path = tmp_path / "gegevens.json"
+    atomic_write_json(str(path), {"versie": 1})
+    atomic_write_json(str(path), {"versie": 2, "naam": "Zoë"})
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {"versie": 2, "naam": "Zoë"}
+    assert os.listdir(tmp_path) == ["gegevens.json"]
\ No newline at end of file
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests voor de score-engine van de Kinder Typecursus
+"""
+
+import random
+
+import pytest
+
+from src.utils.scoring import ScoringEngine
+
+def type_sequence(engine, keys, start=0.0):
+    """Typ een reeks toetsen, één per seconde; '\\b' is backspace"""
+    for offset, key in enumerate(keys):
+        timestamp = start + offset
+        if key == "\b":
+            engine.backspace(timestamp)
+        else:
+            engine.key(key, timestamp)
+
+def test_correction_with_backspace():
+    """Een fout die met backspace hersteld wordt telt mee voor de nauwkeurigheid, niet voor de tekens"""
+    engine = ScoringEngine(reward_points=10)
+    engine.start_item("kat")
+    type_sequence(engine, ["k", "x", "\b", "a", "t"])
+    
+    # 4 aanslagen (backspace telt niet), waarvan 1 fout
+    assert engine.keystrokes == 4
+    assert engine.error_keystrokes == 1
+    assert engine.accuracy == pytest.approx(75.0)
+    assert engine.item_complete
+    # 3 correcte tekens in 4 seconden: (3 / 5) / (4 / 60) = 9 WPM
+    assert engine.speed == pytest.approx(9.0)
+    
+    # Niet foutloos, dus geen bonus: round(3 * 0.75) = 2
+    assert engine.finish_item() is False
+    assert engine.score == 2
+    assert engine.result() == {"score": 2, "accuracy": 75.0, "speed": 9.0}
+
+def test_backspace_over_correct_character():
+    """Een goede letter wissen en opnieuw typen is geen fout, maar telt de letter niet dubbel"""
+    engine = ScoringEngine(reward_points=10)
+    engine.start_item("ab")
+    type_sequence(engine, ["a", "b", "\b", "b"])
+    
+    assert engine.accuracy == pytest.approx(100.0)
+    assert engine.correct_chars == 2
+    assert engine.finish_item() is True
+    # 2 tekens plus de bonus voor een foutloos item
+    assert engine.score == 12
+    # 2 tekens in 3 seconden: (2 / 5) / (3 / 60) = 8 WPM
+    assert engine.speed == pytest.approx(8.0)
+
+def test_open_error_blocks_completion():
+    """Een item met een nog niet herstelde fout is niet af, ook al is het even lang"""
+    engine = ScoringEngine()
+    engine.start_item("ab")
+    type_sequence(engine, ["a", "x"])
+    assert engine.position == 2
+    assert not engine.item_complete
+    
+    engine.backspace(2.0)
+    assert engine.error_positions == set()
+    engine.key("b", 3.0)
+    assert engine.item_complete
+
+def test_backspace_on_empty_item():
+    """Backspace zonder getypte tekens doet niets aan de tellers"""
+    engine = ScoringEngine()
+    engine.start_item("a")
+    assert engine.backspace(0.0) is False
+    assert engine.keystrokes == 0
+    assert engine.position == 0
+
+def test_multiple_items():
+    """Correcte tekens en foutloze items tellen op over de hele les"""
+    engine = ScoringEngine(reward_points=5)
+    engine.start_item("ab")
+    type_sequence(engine, ["a", "b"], start=0.0)
+    engine.finish_item()
+    engine.start_item("cd")
+    type_sequence(engine, ["c", "x", "\b", "d"], start=2.0)
+    engine.finish_item()
+    
+    assert engine.correct_chars == 4
+    assert engine.items_completed == 2
+    assert engine.perfect_items == 1
+    # 5 aanslagen (backspace telt niet), 1 fout
+    assert engine.accuracy == pytest.approx(80.0)
+    # round(4 * 0,8) = 3, plus één bonus
+    assert engine.score == 8
+    # 4 tekens in 5 seconden: (4 / 5) / (5 / 60) = 9,6 WPM
+    assert engine.speed == pytest.approx(9.6)
+
+def test_against_reference():
+    """Willekeurige reeksen met backspaces vergeleken met herberekening uit de volledige invoer"""
+    rng = random.Random(1234)
+    for _ in range(200):
+        target = "".join(rng.choice("abc") for _ in range(rng.randint(1, 8)))
+        engine = ScoringEngine()
+        engine.start_item(target)
+        typed = ""
+        keystrokes = errors = 0
+        for _ in range(rng.randint(0, 30)):
+            if typed and rng.random() < 0.3:
+                assert engine.backspace()
+                typed = typed[:-1]
+            else:
+                char = rng.choice("abcx")
+                expected = len(typed) < len(target) and target[len(typed)] == char
+                assert engine.key(char) == expected
+                keystrokes += 1
+                errors += not expected
+                typed += char
+                
+            matches = [i < len(target) and target[i] == char for i, char in enumerate(typed)]
+            assert engine.position == len(typed)
+            assert engine.item_correct_chars == sum(matches)
+            assert engine.error_positions == {i for i, match in enumerate(matches) if not match}
+            assert engine.item_complete == (typed == target)
+            assert engine.keystrokes == keystrokes
+            assert engine.error_keystrokes == errors
\ No newline at end of file
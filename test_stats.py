@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests voor de lopende statistieken van de Kinder Typecursus
+"""
+
+import random
+import statistics
+
+import pytest
+
+from src.data.stats import RunningStats
+
+def test_mean_and_variance_match_statistics():
+    """Welford geeft hetzelfde gemiddelde en dezelfde variantie als statistics"""
+    rng = random.Random(1234)
+    values = [rng.gauss(25, 8) for _ in range(5000)]
+    stats = RunningStats(1.0, 150)
+    for value in values:
+        stats.add(value)
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert stats.variance == pytest.approx(statistics.variance(values), rel=1e-9)
+    assert stats.stddev == pytest.approx(statistics.stdev(values), rel=1e-9)
+
+def test_variance_of_few_values():
+    """Zonder of met één waarde is de variantie 0"""
+    stats = RunningStats()
+    assert stats.variance == 0.0
+    stats.add(12.0)
+    assert stats.variance == 0.0
+    assert stats.mean == 12.0
+
+def test_ewma_matches_recurrence():
+    """De EWMA begint bij de eerste waarde en volgt daarna alpha * x + (1 - alpha) * vorige"""
+    rng = random.Random(7)
+    stats = RunningStats(alpha=0.25)
+    expected = None
+    for _ in range(200):
+        value = rng.uniform(0, 60)
+        stats.add(value)
+        expected = value if expected is None else 0.25 * value + 0.75 * expected
+        assert stats.ewma == pytest.approx(expected, rel=1e-12)
+
+@pytest.mark.parametrize("bin_width, bin_count, low, high", [
+    (1.0, 150, 0, 120),
+    (1.0, 101, 40, 100),
+    (2.5, 40, 0, 95),
+])
+def test_percentiles_within_bin_width(bin_width, bin_count, low, high):
+    """Mediaan en p90 uit het histogram liggen binnen één vakbreedte van de exacte waarde"""
+    rng = random.Random(bin_count)
+    for size in (50, 500, 5000):
+        values = [rng.uniform(low, high) for _ in range(size)]
+        stats = RunningStats(bin_width, bin_count)
+        for value in values:
+            stats.add(value)
+        assert abs(stats.median - statistics.median(values)) <= bin_width
+        p90 = statistics.quantiles(values, n=10, method='inclusive')[8]
+        assert abs(stats.percentile(90) - p90) <= bin_width
+
+def test_values_above_range_fall_in_last_bin():
+    """Uitschieters tellen mee in het laatste vak; het histogram groeit niet"""
+    stats = RunningStats(1.0, 10)
+    for value in (3, 250, 1000, -4):
+        stats.add(value)
+    assert sorted(stats.bins) == [0, 3, 9]
+    assert stats.bins[9] == 2
+    assert stats.percentile(100) <= 10.0
+    assert RunningStats().percentile(50) == 0.0
+
+def test_round_trip():
+    """to_dict en from_dict geven dezelfde statistieken terug"""
+    rng = random.Random(3)
+    stats = RunningStats(1.0, 101)
+    for _ in range(300):
+        stats.add(rng.uniform(50, 100))
+    copy = RunningStats.from_dict(stats.to_dict(), 1.0, 101)
+    assert (copy.count, copy.mean, copy.m2, copy.ewma, copy.bins) == \
+        (stats.count, stats.mean, stats.m2, stats.ewma, stats.bins)
+    assert copy.percentile(90) == stats.percentile(90)
+    
+    # Oudere opslag met meer vakken: de rest valt in het laatste vak
+    smaller = RunningStats.from_dict(stats.to_dict(), 1.0, 60)
+    assert sum(smaller.bins.values()) == stats.count
+    assert max(smaller.bins) == 59
\ No newline at end of file
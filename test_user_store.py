@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests voor de gebruikersopslag van de Kinder Typecursus
+"""
+
+import json
+import os
+
+import pytest
+
+from src.data.user_store import ShardedUserStore, SQLiteUserStore, open_user_store, summarize
+
+def make_user(name: str, points: int = 0, age: int = 10) -> dict:
+    """Een gebruikersdictionary zoals User.to_dict die maakt (ingekort)"""
+    return {
+        "name": name,
+        "age": age,
+        "current_level": 1 + points // 100,
+        "total_points": points,
+        "typing_speed": points / 10.0,
+        "accuracy": 90.0,
+        "stars_earned": points // 50,
+        "lesson_results": {"L1": {"score": points}}
+    }
+
+def write_legacy(path, users):
+    """Schrijf een oud users.json met alle gebruikers in één bestand"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({user["name"]: user for user in users}, f)
+
+def test_sqlite_round_trip(tmp_path):
+    """Opgeslagen gebruikers komen volledig terug, ook na opnieuw openen"""
+    db_file = str(tmp_path / "users.db")
+    store = SQLiteUserStore(db_file, legacy_file="")
+    users = [make_user("Anna", 120, 9), make_user("Bram", 40), make_user("Zoë", 300, 11)]
+    store.save_users(users)
+    store.save_user(make_user("Bram", 75))
+    store.close()
+    
+    store = SQLiteUserStore(db_file, legacy_file="")
+    expected = {user["name"]: user for user in users}
+    expected["Bram"] = make_user("Bram", 75)
+    assert store.load_all() == expected
+    assert store.load_user("Zoë") == expected["Zoë"]
+    assert store.load_user("Onbekend") is None
+    assert store.load_index() == {name: summarize(user) for name, user in expected.items()}
+    store.close()
+
+def test_sqlite_delete(tmp_path):
+    """Verwijderen haalt alleen dat ene record weg"""
+    store = SQLiteUserStore(str(tmp_path / "users.db"), legacy_file="")
+    store.save_users([make_user("Anna"), make_user("Bram")])
+    store.delete_user("Anna")
+    store.delete_user("Onbekend")
+    assert list(store.load_index()) == ["Bram"]
+    assert store.load_user("Anna") is None
+    store.close()
+
+def test_sqlite_schema_has_leaderboard_columns(tmp_path):
+    """De ranglijstkolommen staan in het eerste schema"""
+    store = SQLiteUserStore(str(tmp_path / "users.db"), legacy_file="")
+    columns = {row[1] for row in store.connection.execute("PRAGMA table_info(users)")}
+    assert set(SQLiteUserStore.SUMMARY_COLUMNS) <= columns
+    assert store.connection.execute("PRAGMA user_version").fetchone()[0] == SQLiteUserStore.SCHEMA_VERSION
+    store.close()
+
+def test_sqlite_migrates_legacy_file_once(tmp_path):
+    """Een oud users.json wordt eenmalig overgenomen en hernoemd naar .migrated"""
+    legacy_file = str(tmp_path / "users.json")
+    users = [make_user("Anna", 10), make_user("Bram", 20)]
+    write_legacy(legacy_file, users)
+    
+    store = open_user_store(legacy_file, "sqlite")
+    assert store.load_all() == {user["name"]: user for user in users}
+    assert not os.path.exists(legacy_file)
+    assert os.path.exists(legacy_file + ".migrated")
+    
+    # Een verwijderde gebruiker komt bij de volgende start niet terug
+    store.delete_user("Anna")
+    store.close()
+    store = open_user_store(legacy_file, "sqlite")
+    assert list(store.load_index()) == ["Bram"]
+    store.close()
+
+def test_sqlite_keeps_legacy_file_when_database_has_users(tmp_path):
+    """Een bestaande database wordt niet overschreven door een oud users.json"""
+    legacy_file = str(tmp_path / "users.json")
+    store = open_user_store(legacy_file, "sqlite")
+    store.save_user(make_user("Anna", 500))
+    store.close()
+    
+    write_legacy(legacy_file, [make_user("Anna", 1), make_user("Bram")])
+    store = open_user_store(legacy_file, "sqlite")
+    assert store.load_index() == {"Anna": summarize(make_user("Anna", 500))}
+    assert os.path.exists(legacy_file)
+    store.close()
+
+def test_sharded_round_trip(tmp_path):
+    """Elke gebruiker een eigen bestand; het manifest geeft de index zonder de bestanden te lezen"""
+    directory = str(tmp_path / "users")
+    store = ShardedUserStore(directory, legacy_file="")
+    users = [make_user(f"leerling{i}", i * 7) for i in range(40)] + [make_user("Zoë/../x", 3)]
+    store.save_users(users)
+    store.save_user(make_user("leerling3", 999))
+    store.delete_user("leerling5")
+    store.close()
+    
+    expected = {user["name"]: user for user in users}
+    expected["leerling3"] = make_user("leerling3", 999)
+    del expected["leerling5"]
+    store = ShardedUserStore(directory, legacy_file="")
+    assert store.load_index() == {name: summarize(user) for name, user in expected.items()}
+    assert store.load_all() == expected
+    assert store.load_user("leerling5") is None
+    store.close()
+
+def test_sharded_replays_journal_without_compaction(tmp_path):
+    """Zonder close (bijvoorbeeld na een crash) wordt het manifest uit het logboek herbouwd"""
+    directory = str(tmp_path / "users")
+    store = ShardedUserStore(directory, legacy_file="")
+    store.save_users([make_user("Anna", 10), make_user("Bram", 20)])
+    store.save_user(make_user("Anna", 30))
+    store.delete_user("Bram")
+    
+    reopened = ShardedUserStore(directory, legacy_file="")
+    assert reopened.load_index() == {"Anna": summarize(make_user("Anna", 30))}
+
+def test_sharded_drops_torn_journal_line_and_compacts(tmp_path):
+    """Een half geschreven laatste regel valt weg; het logboek wordt daarna opnieuw begonnen"""
+    directory = str(tmp_path / "users")
+    store = ShardedUserStore(directory, legacy_file="")
+    store.save_users([make_user("Anna", 10), make_user("Bram", 20)])
+    with open(store.journal_file, 'ab') as f:
+        f.write(b'{"name":"Cas","summ')
+        
+    store = ShardedUserStore(directory, legacy_file="")
+    expected = {"Anna": summarize(make_user("Anna", 10)), "Bram": summarize(make_user("Bram", 20))}
+    assert store.load_index() == expected
+    assert os.path.getsize(store.journal_file) == 0
+    with open(store.manifest_file, 'r', encoding='utf-8') as f:
+        assert json.load(f)["users"] == expected
+        
+    # Nieuwe regels komen niet meer achter de kapotte regel terecht
+    store.save_user(make_user("Cas", 5))
+    store = ShardedUserStore(directory, legacy_file="")
+    assert sorted(store.load_index()) == ["Anna", "Bram", "Cas"]
+
+def test_sharded_compacts_long_journal(tmp_path):
+    """Na COMPACT_AFTER regels wordt het manifest in één keer herschreven"""
+    directory = str(tmp_path / "users")
+    store = ShardedUserStore(directory, legacy_file="")
+    store.COMPACT_AFTER = 10
+    for points in range(25):
+        store.save_user(make_user("Anna", points))
+    assert store.journal_entries <= 10
+    
+    store = ShardedUserStore(directory, legacy_file="")
+    assert store.load_index() == {"Anna": summarize(make_user("Anna", 24))}
+
+def test_sharded_migrates_legacy_file(tmp_path):
+    """Een oud users.json wordt verdeeld over losse bestanden en hernoemd naar .migrated"""
+    legacy_file = str(tmp_path / "users.json")
+    users = [make_user("Anna", 10), make_user("Bram", 20)]
+    write_legacy(legacy_file, users)
+    
+    store = open_user_store(legacy_file, "shards")
+    assert store.load_all() == {user["name"]: user for user in users}
+    assert not os.path.exists(legacy_file)
+    assert os.path.exists(legacy_file + ".migrated")
+    assert store.journal_entries == 0
+    
+    store.delete_user("Anna")
+    store.close()
+    store = open_user_store(legacy_file, "shards")
+    assert list(store.load_index()) == ["Bram"]
+
+def test_unknown_backend(tmp_path):
+    """Een onbekende opslagvariant geeft een duidelijke fout"""
+    with pytest.raises(ValueError):
+        open_user_store(str(tmp_path / "users.json"), "csv")
\ No newline at end of file
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests voor het woordcorpus op schijf van de Kinder Typecursus
+"""
+
+import os
+import random
+
+import pytest
+
+from src.data.word_corpus import MAX_LENGTH, WordCorpus, build_corpus, word_difficulty
+from src.data.word_index import WordIndex
+
+def random_words(rng, count):
+    """Woorden van wisselende lengte, ook met accenten en een paar erg lange"""
+    letters = "aeiknrstéëo"
+    words = ["".join(rng.choice(letters) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+    return words + ["a" * MAX_LENGTH, "b" * (MAX_LENGTH + 1), "", "  "]
+
+def test_round_trip(tmp_path):
+    """build_corpus gevolgd door openen met mmap geeft dezelfde woorden en groepen als WordIndex"""
+    words = random_words(random.Random(1234), 3000)
+    path = os.path.join(tmp_path, "woorden.corpus")
+    count = build_corpus(words, path)
+    
+    # Te lange woorden vallen weg, verder hetzelfde als de index in het geheugen
+    index = WordIndex(word for word in words if len(word.strip()) <= MAX_LENGTH)
+    corpus = WordCorpus(path)
+    try:
+        assert count == len(corpus) == len(index)
+        assert corpus.max_length == MAX_LENGTH
+        # Offsettabel: elk woord op dezelfde positie, met de juiste lengtes en moeilijkheid
+        for position in range(len(index)):
+            word = index.word(position)
+            start, size, length, difficulty = corpus.entry(position)
+            assert corpus.word(position) == word
+            assert size == len(word.encode('utf-8'))
+            assert length == len(word)
+            assert difficulty == word_difficulty(word)
+        assert corpus.words_between(10, 20) == index.words_between(10, 20)
+        
+        for letters in ("a", "aek", "aeiknrst", "aeiknrstéëo", "xyz"):
+            for min_length, max_length in ((1, None), (2, 5), (MAX_LENGTH, None)):
+                # Beide delen dezelfde woordvolgorde, dus dezelfde stukken
+                assert sorted(corpus.ranges(letters, min_length, max_length)) == \
+                    sorted(index.ranges(letters, min_length, max_length))
+                assert sorted(corpus.matching(letters, min_length, max_length)) == \
+                    sorted(index.matching(letters, min_length, max_length))
+                assert corpus.count(letters, min_length, max_length) == \
+                    index.count(letters, min_length, max_length)
+    finally:
+        corpus.close()
+
+def test_matching_against_set_filter(tmp_path):
+    """Letterqueries op het corpus vergeleken met elk woord met verzamelingen testen"""
+    words = random_words(random.Random(99), 2000)
+    path = os.path.join(tmp_path, "woorden.corpus")
+    build_corpus(words, path)
+    corpus = WordCorpus(path)
+    try:
+        for letters in ("ae", "aeint", "aeiknrstéëo"):
+            expected = sorted({
+                word.strip() for word in words
+                if word.strip() and len(word.strip()) <= MAX_LENGTH and set(word.strip()) <= set(letters)
+            })
+            assert sorted(corpus.matching(letters)) == expected
+            sample = corpus.sample(letters, 15, rng=random.Random(3))
+            assert len(set(sample)) == len(sample) == min(15, len(expected))
+            assert set(sample) <= set(expected)
+    finally:
+        corpus.close()
+
+def test_empty_corpus(tmp_path):
+    """Een corpus zonder woorden kan geopend en doorzocht worden"""
+    path = os.path.join(tmp_path, "leeg.corpus")
+    assert build_corpus([], path) == 0
+    corpus = WordCorpus(path)
+    try:
+        assert len(corpus) == 0
+        assert corpus.matching("abc") == []
+    finally:
+        corpus.close()
+
+def test_invalid_file(tmp_path):
+    """Een bestand zonder de juiste kop wordt geweigerd"""
+    path = os.path.join(tmp_path, "geen.corpus")
+    with open(path, 'wb') as f:
+        f.write(b"\0" * 64)
+    with pytest.raises(ValueError):
+        WordCorpus(path)
\ No newline at end of file
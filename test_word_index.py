@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests voor de woordindex van de Kinder Typecursus
+"""
+
+import random
+
+from src.data.word_index import WordIndex
+
+LETTERS = "aeiknrstëé"
+
+def random_words(rng, count):
+    """Woorden uit een klein alfabet, met af en toe een hoofdletter, cijfer of streepje"""
+    extra = "AE1-"
+    return [
+        "".join(rng.choice(LETTERS + extra if rng.random() < 0.2 else LETTERS)
+                for _ in range(rng.randint(1, 9)))
+        for _ in range(count)
+    ]
+
+def reference(words, letters, min_length=1, max_length=None):
+    """Alle passende woorden door elk woord met verzamelingen te testen"""
+    allowed = set(letters.lower()) & set(WordIndex.ALPHABET)
+    return sorted({
+        word for word in words
+        if set(word.lower()) <= allowed and len(word) >= min_length
+        and (max_length is None or len(word) <= max_length)
+    })
+
+def test_matching_against_set_filter():
+    """Zowel de deelmaskermethode (weinig letters) als de groepsscan (veel letters) klopt"""
+    rng = random.Random(1234)
+    words = random_words(rng, 5000)
+    index = WordIndex(words)
+    for letters in ("a", "ak", "aeit", "aeiknrs", LETTERS, LETTERS + "-1", "xyz", ""):
+        for min_length, max_length in ((1, None), (3, 6), (5, 5)):
+            expected = reference(words, letters, min_length, max_length)
+            assert sorted(index.matching(letters, min_length, max_length)) == expected
+            assert index.count(letters, min_length, max_length) == len(expected)
+
+def test_uppercase_letters_count_as_lowercase():
+    """Hoofdletters in woorden en in de toegestane letters tellen als kleine letters"""
+    index = WordIndex(["Kat", "kat", "tak", "kast"])
+    assert sorted(index.matching("AKT")) == ["Kat", "kat", "tak"]
+
+def test_sample():
+    """Een steekproef bestaat uit verschillende passende woorden en is nooit groter dan mogelijk"""
+    rng = random.Random(7)
+    words = random_words(rng, 2000)
+    index = WordIndex(words)
+    expected = set(reference(words, "aeint", 2, 5))
+    sample = index.sample("aeint", 20, 2, 5, rng=random.Random(1))
+    assert len(sample) == min(20, len(expected))
+    assert len(set(sample)) == len(sample)
+    assert set(sample) <= expected
+    assert sorted(index.sample("aeint", 10 ** 6, 2, 5, rng=random.Random(1))) == sorted(expected)
+    assert index.sample("xyz", 5) == []
+
+def test_duplicates_and_whitespace():
+    """Dubbele woorden komen één keer in de index; lege regels en witruimte vallen weg"""
+    index = WordIndex(["kat\n", "kat", "  ", "", " tak "])
+    assert len(index) == 2
+    assert sorted(index.matching("akt")) == ["kat", "tak"]
\ No newline at end of file